@@ -36,6 +36,8 @@ ARGO probe that parses http response.
 
 %install
 %{py3_install "--record=INSTALLED_FILES" }
+install -D -m 0644 %{name}.conf %{buildroot}%{_prefix}/lib/tmpfiles.d/%{name}.conf
+install -d -m 0755 %{buildroot}%{_localstatedir}/run/%{name}
 
 
 %clean
@@ -46,6 +48,8 @@ rm -rf $RPM_BUILD_ROOT
 %defattr(-,root,root)
 %dir %{python3_sitelib}/%{underscore %{name}}/
 %{python3_sitelib}/%{underscore %{name}}/*.py
+%{_prefix}/lib/tmpfiles.d/%{name}.conf
+%dir %attr(0755,root,root) %{_localstatedir}/run/%{name}
 
 
 %changelog
@@ -0,0 +1,272 @@
+import asyncio
+import codecs
+import http.client
+import ssl as ssl_module
+from urllib.parse import urljoin, urlsplit
+
+from argo_probe_http_parser.base import (
+    CHUNK_SIZE, BaseHttpParse, declared_encoding
+)
+from argo_probe_http_parser.evaluate import Evaluation
+from argo_probe_http_parser.httpclient import MAX_REDIRECTS
+
+
+class ConcurrencyLimit:
+    def __init__(self, total=None, per_host=None):
+        self.total = total
+        self.per_host = per_host
+        self._total = None
+        self._hosts = {}
+
+    def _semaphores(self, host):
+        semaphores = []
+        if self.per_host:
+            if host not in self._hosts:
+                self._hosts[host] = asyncio.Semaphore(self.per_host)
+
+            semaphores.append(self._hosts[host])
+
+        if self.total:
+            if self._total is None:
+                self._total = asyncio.Semaphore(self.total)
+
+            semaphores.append(self._total)
+
+        return semaphores
+
+    def acquire(self, host):
+        return _Slot(self._semaphores(host))
+
+
+class _Slot:
+    def __init__(self, semaphores):
+        self._semaphores = semaphores
+        self._acquired = []
+
+    async def __aenter__(self):
+        try:
+            for semaphore in self._semaphores:
+                await semaphore.acquire()
+                self._acquired.append(semaphore)
+
+        except BaseException:
+            self._release()
+            raise
+
+        return self
+
+    async def __aexit__(self, *exc):
+        self._release()
+
+    def _release(self):
+        while self._acquired:
+            self._acquired.pop().release()
+
+
+class AsyncHttpParse(BaseHttpParse):
+    def __init__(self, hostname, port, uri, ssl=False, limit=None):
+        super().__init__(hostname=hostname, port=port, uri=uri, ssl=ssl)
+        self.limit = limit
+
+    @staticmethod
+    async def _request(url, timeout):
+        parts = urlsplit(url)
+        context = ssl_module.create_default_context() \
+            if parts.scheme == 'https' else None
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=context),
+            timeout
+        )
+        try:
+            path = url[len('{}://{}'.format(parts.scheme, parts.netloc)):]
+            writer.write((
+                'GET {} HTTP/1.1\r\n'
+                'Host: {}\r\n'
+                'Accept-Encoding: identity\r\n'
+                'Connection: close\r\n\r\n'
+            ).format(path or '/', parts.netloc).encode('latin-1'))
+            head = await asyncio.wait_for(
+                reader.readuntil(b'\r\n\r\n'), timeout
+            )
+
+        except BaseException:
+            writer.close()
+            raise
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            status = int(lines[0].split(None, 2)[1])
+
+        except (IndexError, ValueError):
+            writer.close()
+            raise http.client.BadStatusLine(lines[0])
+
+        headers = {}
+        for line in lines[1:]:
+            key, sep, value = line.partition(':')
+            if sep:
+                headers[key.strip().lower()] = value.strip()
+
+        return reader, writer, status, headers
+
+    async def _get(self, url, timeout):
+        for _ in range(MAX_REDIRECTS + 1):
+            reader, writer, status, headers = await self._request(
+                url, timeout
+            )
+            location = headers.get('location')
+            if status in (301, 302, 303, 307, 308) and location:
+                writer.close()
+                url = urljoin(url, location)
+                continue
+
+            return reader, writer, headers
+
+        raise http.client.HTTPException(
+            f'Exceeded {MAX_REDIRECTS} redirects'
+        )
+
+    @staticmethod
+    async def _iter_body(reader, headers, chunk_size, timeout):
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+                remaining = int(line.split(b';')[0].strip(), 16)
+                if remaining == 0:
+                    break
+
+                while remaining:
+                    data = await asyncio.wait_for(
+                        reader.readexactly(min(remaining, chunk_size)),
+                        timeout
+                    )
+                    remaining -= len(data)
+                    yield data
+
+                await asyncio.wait_for(reader.readexactly(2), timeout)
+
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining > 0:
+                data = await asyncio.wait_for(
+                    reader.readexactly(min(remaining, chunk_size)), timeout
+                )
+                remaining -= len(data)
+                yield data
+
+        else:
+            while True:
+                data = await asyncio.wait_for(reader.read(chunk_size), timeout)
+                if not data:
+                    break
+
+                yield data
+
+    async def _fetch_and_evaluate(
+            self, url, searches, case_sensitive, finish_line, timeout,
+            chunk_size, encoding, match_bytes, collect=False, max_lines=None
+    ):
+        reader, writer, headers = await self._get(url, timeout)
+        try:
+            declared = declared_encoding(headers.get('content-type'))
+            searches, encoding, match_bytes = self._prepare(
+                searches=searches,
+                case_sensitive=case_sensitive,
+                encoding=encoding,
+                match_bytes=match_bytes,
+                declared=declared
+            )
+
+            decoder = None
+            if not match_bytes:
+                decoder = codecs.getincrementaldecoder(
+                    encoding or declared or 'utf-8'
+                )(errors='replace')
+
+            evaluation = Evaluation(
+                searches, case_sensitive=case_sensitive, early_exit=True,
+                finish_line=finish_line, collect=collect, max_lines=max_lines
+            )
+            body = self._iter_body(reader, headers, chunk_size, timeout)
+            try:
+                async for chunk in body:
+                    if decoder:
+                        chunk = decoder.decode(chunk)
+
+                    evaluation.feed(chunk)
+                    if evaluation.complete:
+                        break
+
+                else:
+                    if decoder:
+                        evaluation.feed(decoder.decode(b'', final=True))
+
+            finally:
+                await body.aclose()
+
+            evaluation.close()
+            return evaluation, encoding
+
+        finally:
+            writer.close()
+
+    async def check(
+            self, ok_search, warn_search, crit_search, ok_msg, warn_msg,
+            crit_msg, unknown_msg, timeout, case_sensitive,
+            chunk_size=CHUNK_SIZE, encoding=None, match_bytes=False,
+            msg_lines=None, msg_bytes=None
+    ):
+        url = self._build_url()
+        slot = self.limit.acquire(urlsplit(url).netloc) if self.limit \
+            else _Slot([])
+
+        try:
+            async with slot:
+                evaluation, encoding = await self._fetch_and_evaluate(
+                    url=url,
+                    searches=[crit_search, warn_search, ok_search],
+                    case_sensitive=case_sensitive,
+                    finish_line=not crit_msg,
+                    timeout=timeout,
+                    chunk_size=chunk_size,
+                    encoding=encoding,
+                    match_bytes=match_bytes,
+                    collect=not crit_msg or not warn_msg,
+                    max_lines=msg_lines
+                )
+
+            self._set_status(
+                url=url,
+                evaluation=evaluation,
+                ok_search=ok_search,
+                warn_search=warn_search,
+                crit_search=crit_search,
+                ok_msg=ok_msg,
+                warn_msg=warn_msg,
+                crit_msg=crit_msg,
+                unknown_msg=unknown_msg,
+                case_sensitive=case_sensitive,
+                encoding=encoding,
+                msg_lines=msg_lines,
+                msg_bytes=msg_bytes
+            )
+
+        except asyncio.TimeoutError:
+            self.nagios.set_critical(f'Connection to {url} timed out')
+
+        except (
+                OSError, asyncio.IncompleteReadError, http.client.HTTPException
+        ) as e:
+            self.nagios.set_critical(str(e))
+
+        except Exception as e:
+            self.nagios.set_unknown(str(e))
+
+        return self.nagios
+
+    def check_rules(self, *args, **kwargs):
+        raise NotImplementedError(
+            'AsyncHttpParse does not check rule sets; use HttpParse or '
+            'StdlibHttpParse'
+        )
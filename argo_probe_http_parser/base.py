@@ -0,0 +1,982 @@
+import codecs
+import zlib
+
+try:
+    import brotli
+    brotli.Decompressor().process(b'', output_buffer_limit=1)
+
+except (ImportError, AttributeError, TypeError):
+    brotli = None
+
+from argo_probe_http_parser.decision import (
+    compile_match_rules, decision_rules
+)
+from argo_probe_http_parser.defaults import (
+    CHUNK_SIZE, MAX_DECOMPRESSED, REGEX_TIMEOUT
+)
+from argo_probe_http_parser.evaluate import (
+    CRITICAL, LEVELS, OK, WARNING, Evaluation
+)
+from argo_probe_http_parser.jsonrules import JsonEvaluation, json_levels
+from argo_probe_http_parser.matcher import fold
+from argo_probe_http_parser.nagios import NagiosResponse
+from argo_probe_http_parser.regex import RegexEvaluation, search_patterns
+from argo_probe_http_parser.rules import rule_searches
+from argo_probe_http_parser.timing import PhaseTimer
+
+CODINGS = ('gzip', 'x-gzip', 'deflate') + (('br',) if brotli else ())
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+ASCII_FOLDING = ('\u0130', '\u212a')
+
+
+def _is_ascii(text):
+    return all(ord(char) < 128 for char in text)
+
+
+def _encodes(text, encoding):
+    try:
+        text.encode(encoding)
+
+    except UnicodeEncodeError:
+        return False
+
+    return True
+
+
+def declared_encoding(content_type):
+    if not content_type:
+        return None
+
+    mime_type, *params = content_type.split(';')
+    for param in params:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            return value.strip().strip('\'"')
+
+    mime_type = mime_type.strip().lower()
+    if mime_type.startswith('text/'):
+        return 'ISO-8859-1'
+
+    if mime_type == 'application/json':
+        return 'utf-8'
+
+    return None
+
+
+def decode_chunks(chunks, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+
+    yield decoder.decode(b'', final=True)
+
+
+def slices(data, size=CHUNK_SIZE):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def content_codings(content_encoding):
+    return [
+        coding for coding in (
+            coding.strip().lower()
+            for coding in (content_encoding or '').split(',')
+        ) if coding and coding != 'identity'
+    ]
+
+
+def _wbits(data, gzip):
+    if gzip:
+        return 16 + zlib.MAX_WBITS
+
+    if data[0] & 0x0f == 8 and int.from_bytes(data[:2], 'big') % 31 == 0:
+        return zlib.MAX_WBITS
+
+    return -zlib.MAX_WBITS
+
+
+def _inflate(chunks, gzip, chunk_size):
+    decompressor = None
+    members = 0
+    head = b''
+    for data in chunks:
+        while data:
+            if decompressor is None:
+                if members and not b'\x1f\x8b'.startswith(data[:2]):
+                    return
+
+                if not gzip and len(head + data) < 2:
+                    head += data
+                    break
+
+                data, head = head + data, b''
+                decompressor = zlib.decompressobj(_wbits(data, gzip))
+
+            chunk = decompressor.decompress(data, chunk_size)
+            if chunk:
+                yield chunk
+
+            if not decompressor.eof:
+                data = decompressor.unconsumed_tail
+                continue
+
+            if not gzip:
+                return
+
+            data = decompressor.unused_data
+            decompressor = None
+            members += 1
+
+    if decompressor is not None:
+        chunk = decompressor.flush()
+        if chunk:
+            yield chunk
+
+
+def _unbrotli(chunks, chunk_size):
+    decompressor = brotli.Decompressor()
+    for data in chunks:
+        while True:
+            chunk = decompressor.process(data, output_buffer_limit=chunk_size)
+            if chunk:
+                yield chunk
+
+            if decompressor.can_accept_more_data():
+                break
+
+            data = b''
+
+    while not decompressor.is_finished():
+        chunk = decompressor.process(b'', output_buffer_limit=chunk_size)
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def _capped(chunks, max_size):
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise ValueError(
+                f'Decompressed response exceeds {max_size} bytes'
+            )
+
+        yield chunk
+
+
+def decompress_chunks(
+        chunks, content_encoding, max_size=None, chunk_size=CHUNK_SIZE
+):
+    codings = content_codings(content_encoding)
+    if not codings:
+        return chunks
+
+    for coding in reversed(codings):
+        if coding not in CODINGS:
+            raise ValueError(f'Unsupported content encoding: {coding}')
+
+        if coding == 'br':
+            chunks = _unbrotli(chunks, chunk_size)
+
+        else:
+            chunks = _inflate(chunks, coding != 'deflate', chunk_size)
+
+    return _capped(chunks, max_size or MAX_DECOMPRESSED)
+
+
+class ReadLimit:
+    def __init__(self, max_bytes=None, max_lines=None):
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self.size = 0
+        self.lines = 0
+        self.reached = None
+
+    def headers(self):
+        if self.max_bytes:
+            return {'Range': f'bytes=0-{self.max_bytes - 1}'}
+
+        return {}
+
+    def content_range(self, value):
+        if self.max_bytes and value:
+            total = value.rpartition('/')[2].strip()
+            if total.isdigit() and int(total) > self.max_bytes:
+                self.reached = 'bytes'
+
+    def _cut(self, chunk):
+        if self.max_bytes is not None:
+            if self.size >= self.max_bytes:
+                return chunk[:0], 'bytes'
+
+            if self.size + len(chunk) > self.max_bytes:
+                chunk, reached = self._cut_lines(
+                    chunk[:self.max_bytes - self.size]
+                )
+                return chunk, reached or 'bytes'
+
+        return self._cut_lines(chunk)
+
+    def _cut_lines(self, chunk):
+        if self.max_lines is None:
+            return chunk, None
+
+        if self.lines >= self.max_lines:
+            return chunk[:0], 'lines'
+
+        count = chunk.count(b'\n')
+        if self.lines + count < self.max_lines:
+            return chunk, None
+
+        end = -1
+        for _ in range(self.max_lines - self.lines):
+            end = chunk.index(b'\n', end + 1)
+
+        if end + 1 < len(chunk):
+            return chunk[:end + 1], 'lines'
+
+        return chunk, None
+
+    def apply(self, chunks):
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            chunk, reached = self._cut(chunk)
+            self.size += len(chunk)
+            self.lines += chunk.count(b'\n')
+            if chunk:
+                yield chunk
+
+            if reached:
+                self.reached = reached
+                return
+
+    def describe(self):
+        if self.reached == 'bytes':
+            return f'Response truncated to {self.max_bytes} bytes'
+
+        if self.reached == 'lines':
+            return f'Response truncated to {self.max_lines} lines'
+
+        return None
+
+
+def bounded_lines(lines, max_lines=None, max_bytes=None):
+    kept = []
+    size = 0
+    for line in lines:
+        if max_lines is not None and len(kept) >= max_lines:
+            return kept, True
+
+        line = line.strip()
+        if max_bytes is not None:
+            encoded = line.encode('utf-8')
+            size += len(encoded) + (1 if kept else 0)
+            if size > max_bytes:
+                if not kept:
+                    kept.append(encoded[:max_bytes].decode(
+                        'utf-8', errors='ignore'
+                    ))
+
+                return kept, True
+
+        kept.append(line)
+
+    return kept, False
+
+
+class Fetched:
+    def __init__(self, status, headers, chunks, content_encoding, declared):
+        self.status = status
+        self.headers = headers
+        self.chunks = chunks
+        self.content_encoding = content_encoding
+        self.declared = declared
+
+
+class BaseHttpParse:
+    critical_errors = ()
+
+    def __init__(self, hostname, port, uri, ssl=False, cache=None):
+        self.hostname = hostname
+        self.port = port
+        self.uri = uri
+        self.ssl = ssl
+        self.cache = cache
+
+        self.nagios = NagiosResponse()
+
+    def _build_url(self):
+        hostname = self.hostname
+        if hostname.startswith('https://'):
+            hostname = hostname[8:]
+
+        if hostname.startswith('http://'):
+            hostname = hostname[7:]
+
+        if hostname.endswith('/'):
+            hostname = hostname[0:-1]
+
+        uri = self.uri
+        if not uri.startswith('/'):
+            uri = '/{}'.format(uri)
+
+        if self.ssl:
+            return 'https://{}:{}{}'.format(hostname, self.port, uri)
+
+        else:
+            return 'http://{}:{}{}'.format(hostname, self.port, uri)
+
+    @staticmethod
+    def _bytes_safe(encoding, searches, case_sensitive):
+        name = codecs.lookup(encoding).name
+        if name != 'utf-8':
+            decoded = bytes(range(256)).decode(name, errors='replace')
+            if len(decoded) != 256 or not _is_ascii(decoded[:128]):
+                return False
+
+        if not case_sensitive and (
+                not all(_is_ascii(s) for s in searches) or
+                any(_encodes(char, name) for char in ASCII_FOLDING)
+        ):
+            return False
+
+        return all(_encodes(search, name) for search in searches)
+
+    def _fetch(
+            self, url, timeout, headers=None, chunk_size=CHUNK_SIZE,
+            timer=None
+    ):
+        raise NotImplementedError
+
+    def _error_message(self, url, error):
+        return str(error)
+
+    @staticmethod
+    def _body(
+            fetched, stream, chunk_size, timer=None, limit=None,
+            max_decompressed=None
+    ):
+        content = fetched.chunks
+        if timer:
+            content = timer.timed(content)
+
+        content = decompress_chunks(
+            content, fetched.content_encoding, max_decompressed, chunk_size
+        )
+        if limit:
+            content = limit.apply(content)
+
+        if stream:
+            return content
+
+        content = [b''.join(content)]
+        if timer:
+            timer.skip()
+
+        return content
+
+    def _read(
+            self, fetched, content, searches, case_sensitive, stream,
+            encoding, match_bytes
+    ):
+        searches, encoding, match_bytes = self._prepare(
+            searches=searches,
+            case_sensitive=case_sensitive,
+            encoding=encoding,
+            match_bytes=match_bytes,
+            declared=fetched.declared if match_bytes else None
+        )
+
+        if stream:
+            chunks = content if match_bytes else decode_chunks(
+                content, encoding or fetched.declared or 'utf-8'
+            )
+
+        elif match_bytes:
+            chunks = slices(content.pop())
+
+        else:
+            chunks = slices(content.pop().decode(
+                encoding or fetched.declared or 'utf-8', errors='replace'
+            ))
+
+        return chunks, searches, encoding
+
+    def _prepare(
+            self, searches, case_sensitive, encoding, match_bytes, declared
+    ):
+        if match_bytes:
+            encoding = encoding or declared or 'utf-8'
+            match_bytes = self._bytes_safe(encoding, searches, case_sensitive)
+
+        if match_bytes:
+            searches = [search.encode(encoding) for search in searches]
+
+        return searches, encoding, match_bytes
+
+    def _cache_lookup(self, url, **params):
+        if not self.cache:
+            return None, None, {}
+
+        entry = self.cache.load(url)
+        key = self.cache.key(**params)
+        headers = entry.validators() if key in entry.verdicts else {}
+        return entry, key, headers
+
+    def _cache_hit(self, entry, key, not_modified, digest=None):
+        if key not in entry.verdicts:
+            return False
+
+        if not_modified or (digest and digest == entry.digest):
+            self.nagios.set_status(*entry.verdicts[key])
+            return True
+
+        return False
+
+    def _cache_store(self, entry, key, etag, last_modified, digest=None):
+        message = self.nagios.get_message(perfdata=False)
+        entry.update(etag=etag, last_modified=last_modified, digest=digest)
+        entry.verdicts[key] = [
+            self.nagios.get_code(),
+            message[len(self.nagios.get_status()) + 3:]
+        ]
+        self.cache.save(entry)
+
+    @staticmethod
+    def _evaluate(
+            chunks, searches, case_sensitive, early_exit, finish_line,
+            stop=1 << CRITICAL, timer=None, collect=False, max_lines=None,
+            patterns=None, regex_timeout=REGEX_TIMEOUT, json_levels=None,
+            spool_threshold=None, exact_counts=True
+    ):
+        if json_levels:
+            evaluation = JsonEvaluation(
+                json_levels, case_sensitive=case_sensitive, stop=stop,
+                max_lines=max_lines
+            )
+
+        elif patterns:
+            evaluation = RegexEvaluation(
+                patterns, case_sensitive=case_sensitive,
+                early_exit=early_exit, stop=stop, max_lines=max_lines,
+                timeout=regex_timeout
+            )
+
+        else:
+            evaluation = Evaluation(
+                searches, case_sensitive=case_sensitive,
+                early_exit=early_exit, finish_line=finish_line, stop=stop,
+                collect=collect, max_lines=max_lines,
+                spool_threshold=spool_threshold, exact_counts=exact_counts
+            )
+
+        try:
+            for chunk in chunks:
+                evaluation.feed(chunk)
+                if evaluation.complete:
+                    break
+
+            evaluation.close()
+
+        except BaseException:
+            evaluation.release()
+            raise
+
+        if timer:
+            timer.skip()
+            timer.add('strip', evaluation.strip_time)
+            timer.add('match', evaluation.match_time)
+
+        return evaluation
+
+    @staticmethod
+    def _matched_lines(
+            search, evaluation, is_case_sensitive, encoding=None, index=None
+    ):
+        resp = None
+        if index is not None:
+            resp = evaluation.matched_lines(index)
+
+        if resp is None:
+            if evaluation.binary:
+                search = search.encode(encoding)
+
+            if is_case_sensitive:
+                resp = (m for m in evaluation.iter_lines() if search in m)
+
+            else:
+                search = fold(search)
+                resp = (
+                    m for m in evaluation.iter_lines() if search in fold(m)
+                )
+
+        for line in resp:
+            if isinstance(line, bytes):
+                line = line.decode(encoding, errors='replace')
+
+            yield line
+
+    @staticmethod
+    def _matched_count(
+            search, evaluation, is_case_sensitive, encoding=None, index=None
+    ):
+        count = evaluation.matched_count(index)
+        if count is None:
+            count = sum(1 for _ in BaseHttpParse._matched_lines(
+                search, evaluation, is_case_sensitive, encoding=encoding
+            ))
+
+        return count
+
+    @classmethod
+    def _build_msg(
+            cls, search, evaluation, is_case_sensitive, encoding=None,
+            index=None, max_lines=None, max_bytes=None
+    ):
+        resp = cls._matched_lines(
+            search, evaluation, is_case_sensitive, encoding=encoding,
+            index=index
+        )
+        lines, truncated = bounded_lines(resp, max_lines, max_bytes)
+        msg = "\n".join(lines)
+        if truncated or len(lines) == max_lines:
+            more = cls._matched_count(
+                search, evaluation, is_case_sensitive, encoding=encoding,
+                index=index
+            ) - len(lines)
+            if more > 0:
+                if index is not None and evaluation.partial_count(index):
+                    more = f"at least {more}"
+
+                msg = f"{msg}\n... and {more} more"
+
+        return msg
+
+    def _set_status(
+            self, url, evaluation, ok_search, warn_search, crit_search,
+            ok_msg, warn_msg, crit_msg, unknown_msg, case_sensitive,
+            encoding=None, group=0, nagios=None, msg_lines=None,
+            msg_bytes=None
+    ):
+        if nagios is None:
+            nagios = self.nagios
+
+        match = evaluation.group_match(group)
+        if match == CRITICAL:
+            if crit_msg:
+                msg = crit_msg
+
+            else:
+                msg = self._build_msg(
+                    search=crit_search,
+                    evaluation=evaluation,
+                    is_case_sensitive=case_sensitive,
+                    encoding=encoding,
+                    index=LEVELS * group + CRITICAL,
+                    max_lines=msg_lines,
+                    max_bytes=msg_bytes
+                )
+
+            msg = f"{msg}\nFor more info check URL: {url}"
+            nagios.set_critical(msg)
+
+        elif match == WARNING:
+            if warn_msg:
+                msg = warn_msg
+
+            else:
+                msg = self._build_msg(
+                    search=warn_search,
+                    evaluation=evaluation,
+                    is_case_sensitive=case_sensitive,
+                    encoding=encoding,
+                    index=LEVELS * group + WARNING,
+                    max_lines=msg_lines,
+                    max_bytes=msg_bytes
+                )
+
+            msg = f"{msg}\nFor more info check URL: {url}"
+            nagios.set_warning(msg)
+
+        elif match == OK:
+            nagios.set_ok(ok_msg)
+
+        else:
+            if unknown_msg:
+                msg = f"{unknown_msg}\nFor more info check URL: {url}"
+
+            else:
+                msg = f"For more info check URL: {url}"
+
+            nagios.set_unknown(msg)
+
+    def _set_decision_status(
+            self, url, evaluation, decision, unknown_msg, case_sensitive,
+            encoding=None, msg_lines=None, msg_bytes=None
+    ):
+        index = decision.decide(evaluation.found)
+        if index is None:
+            if unknown_msg:
+                msg = f"{unknown_msg}\nFor more info check URL: {url}"
+
+            else:
+                msg = f"For more info check URL: {url}"
+
+            self.nagios.set_unknown(msg)
+            return
+
+        rule = decision.rules[index]
+        fields = {'lines': '', 'count': 0, 'pattern': ''}
+        match = decision.evidence(index, evaluation.found)
+        if match is not None:
+            search = decision.patterns[match]
+            fields = {
+                'lines': self._build_msg(
+                    search=search,
+                    evaluation=evaluation,
+                    is_case_sensitive=case_sensitive,
+                    encoding=encoding,
+                    index=match,
+                    max_lines=msg_lines,
+                    max_bytes=msg_bytes
+                ),
+                'count': self._matched_count(
+                    search, evaluation, case_sensitive, encoding=encoding,
+                    index=match
+                ),
+                'pattern': search
+            }
+
+        if rule.message:
+            msg = rule.message.format(**fields)
+
+        elif rule.severity == NagiosResponse.OK:
+            msg = ''
+
+        else:
+            msg = fields['lines']
+
+        if rule.severity != NagiosResponse.OK:
+            msg = f"{msg}\nFor more info check URL: {url}"
+
+        self.nagios.set_status(rule.severity, msg)
+
+    def _report_limit(self, limit):
+        if limit and limit.reached:
+            self.nagios.add_detail(limit.describe())
+
+    def _add_perfdata(
+            self, timer, evaluation=None, searches=None, case_sensitive=False,
+            encoding=None
+    ):
+        for phase, seconds in timer.phases.items():
+            self.nagios.add_perfdata(
+                phase, '{:.6f}'.format(seconds), 's', minimum=0
+            )
+
+        self.nagios.add_perfdata(
+            'time', '{:.6f}'.format(timer.total), 's', minimum=0
+        )
+        self.nagios.add_perfdata('size', timer.size, 'B', minimum=0)
+        if evaluation is not None:
+            lines = 0
+            if evaluation.match is not None:
+                lines = self._matched_count(
+                    searches[evaluation.match], evaluation, case_sensitive,
+                    encoding=encoding, index=evaluation.match
+                )
+
+            self.nagios.add_perfdata('lines', lines, minimum=0)
+
+    def _set_rule_statuses(
+            self, url, evaluation, rule_sets, case_sensitive, encoding=None,
+            msg_lines=None, msg_bytes=None, limit=None
+    ):
+        results = []
+        for group, rule_set in enumerate(rule_sets):
+            nagios = NagiosResponse()
+            self._set_status(
+                url=url,
+                evaluation=evaluation,
+                ok_search=rule_set.ok_search,
+                warn_search=rule_set.warn_search,
+                crit_search=rule_set.crit_search,
+                ok_msg=rule_set.ok_msg,
+                warn_msg=rule_set.warn_msg,
+                crit_msg=rule_set.crit_msg,
+                unknown_msg=rule_set.unknown_msg,
+                case_sensitive=case_sensitive,
+                encoding=encoding,
+                group=group,
+                nagios=nagios,
+                msg_lines=msg_lines,
+                msg_bytes=msg_bytes
+            )
+            if limit and limit.reached:
+                nagios.add_detail(limit.describe())
+
+            results.append((rule_set, nagios))
+
+        return results
+
+    @staticmethod
+    def _fail_rules(rule_sets, code, msg):
+        results = []
+        for rule_set in rule_sets:
+            nagios = NagiosResponse()
+            nagios.set_status(code, msg)
+            results.append((rule_set, nagios))
+
+        return results
+
+    def check(
+            self, ok_search, warn_search, crit_search, ok_msg, warn_msg,
+            crit_msg, unknown_msg, timeout, case_sensitive, stream=False,
+            chunk_size=CHUNK_SIZE, encoding=None, match_bytes=False,
+            perfdata=False, msg_lines=None, msg_bytes=None, max_bytes=None,
+            max_lines=None, range_request=False, max_decompressed=None,
+            ok_regex=None, warn_regex=None, crit_regex=None,
+            regex_timeout=REGEX_TIMEOUT, ok_json=None, warn_json=None,
+            crit_json=None, spool_threshold=None, match_rules=None
+    ):
+        url = self._build_url()
+        timer = PhaseTimer() if perfdata else None
+        patterns = search_patterns(
+            [crit_search, warn_search, ok_search],
+            [crit_regex, warn_regex, ok_regex]
+        )
+        levels = json_levels(crit_json, warn_json, ok_json)
+        rules = decision_rules(match_rules)
+        if rules:
+            patterns = levels = None
+
+        if patterns or levels:
+            match_bytes = False
+
+        limit = ReadLimit(max_bytes, max_lines) \
+            if max_bytes or max_lines else None
+        read_stream = stream or limit is not None or levels is not None or \
+            spool_threshold is not None
+        entry, key, headers = self._cache_lookup(
+            url,
+            ok_search=ok_search,
+            warn_search=warn_search,
+            crit_search=crit_search,
+            ok_msg=ok_msg,
+            warn_msg=warn_msg,
+            crit_msg=crit_msg,
+            unknown_msg=unknown_msg,
+            case_sensitive=case_sensitive,
+            stream=stream,
+            encoding=encoding,
+            match_bytes=match_bytes,
+            msg_lines=msg_lines,
+            msg_bytes=msg_bytes,
+            max_bytes=max_bytes,
+            max_lines=max_lines,
+            range_request=range_request,
+            ok_regex=ok_regex,
+            warn_regex=warn_regex,
+            crit_regex=crit_regex,
+            ok_json=ok_json,
+            warn_json=warn_json,
+            crit_json=crit_json,
+            match_rules=rules
+        )
+        if limit and range_request:
+            headers = dict(headers, **limit.headers())
+
+        evaluation = None
+        try:
+            decision = compile_match_rules(rules) if rules else None
+            with self._fetch(
+                    url, timeout, headers=headers, chunk_size=chunk_size,
+                    timer=timer
+            ) as fetched:
+                if limit and range_request and fetched.status == 206:
+                    limit.content_range(fetched.headers.get('Content-Range'))
+
+                content = self._body(
+                    fetched, read_stream, chunk_size, timer=timer,
+                    limit=limit, max_decompressed=max_decompressed
+                )
+                digest = None
+                if entry:
+                    if not read_stream:
+                        digest = self.cache.digest(content[0])
+
+                    if self._cache_hit(
+                            entry, key, fetched.status == 304, digest
+                    ):
+                        if timer:
+                            self._add_perfdata(timer)
+
+                        return self.nagios
+
+                chunks, searches, encoding = self._read(
+                    fetched=fetched,
+                    content=content,
+                    searches=decision.patterns if decision else [
+                        crit_search, warn_search, ok_search
+                    ],
+                    case_sensitive=case_sensitive,
+                    stream=read_stream,
+                    encoding=encoding,
+                    match_bytes=match_bytes
+                )
+                if timer and not read_stream:
+                    timer.mark('decode')
+
+                evaluation = self._evaluate(
+                    chunks=chunks,
+                    searches=searches,
+                    case_sensitive=case_sensitive,
+                    early_exit=stream and decision is None,
+                    finish_line=not crit_msg,
+                    stop=0 if decision else 1 << CRITICAL,
+                    timer=timer,
+                    collect=(
+                        perfdata or not crit_msg or not warn_msg or
+                        decision is not None
+                    ),
+                    max_lines=msg_lines,
+                    patterns=patterns,
+                    regex_timeout=regex_timeout,
+                    json_levels=levels,
+                    spool_threshold=spool_threshold,
+                    exact_counts=perfdata
+                )
+
+            if decision:
+                self._set_decision_status(
+                    url=url,
+                    evaluation=evaluation,
+                    decision=decision,
+                    unknown_msg=unknown_msg,
+                    case_sensitive=case_sensitive,
+                    encoding=encoding,
+                    msg_lines=msg_lines,
+                    msg_bytes=msg_bytes
+                )
+
+            else:
+                self._set_status(
+                    url=url,
+                    evaluation=evaluation,
+                    ok_search=ok_search,
+                    warn_search=warn_search,
+                    crit_search=crit_search,
+                    ok_msg=ok_msg,
+                    warn_msg=warn_msg,
+                    crit_msg=crit_msg,
+                    unknown_msg=unknown_msg,
+                    case_sensitive=case_sensitive,
+                    encoding=encoding,
+                    msg_lines=msg_lines,
+                    msg_bytes=msg_bytes
+                )
+
+            self._report_limit(limit)
+            if timer:
+                self._add_perfdata(
+                    timer,
+                    evaluation=evaluation,
+                    searches=decision.patterns if decision else [
+                        crit_search, warn_search, ok_search
+                    ],
+                    case_sensitive=case_sensitive,
+                    encoding=encoding
+                )
+
+            if entry:
+                self._cache_store(
+                    entry, key,
+                    etag=fetched.headers.get('ETag'),
+                    last_modified=fetched.headers.get('Last-Modified'),
+                    digest=digest
+                )
+
+        except self.critical_errors as e:
+            self.nagios.set_critical(self._error_message(url, e))
+
+        except Exception as e:
+            self.nagios.set_unknown(str(e))
+
+        finally:
+            if evaluation is not None:
+                evaluation.release()
+
+        return self.nagios
+
+    def check_rules(
+            self, rule_sets, timeout, case_sensitive, stream=False,
+            chunk_size=CHUNK_SIZE, encoding=None, match_bytes=False,
+            msg_lines=None, msg_bytes=None, max_bytes=None, max_lines=None,
+            range_request=False, max_decompressed=None, spool_threshold=None
+    ):
+        url = self._build_url()
+        limit = ReadLimit(max_bytes, max_lines) \
+            if max_bytes or max_lines else None
+        read_stream = stream or limit is not None or \
+            spool_threshold is not None
+        headers = limit.headers() if limit and range_request else None
+
+        evaluation = None
+        try:
+            with self._fetch(
+                    url, timeout, headers=headers, chunk_size=chunk_size
+            ) as fetched:
+                if limit and range_request and fetched.status == 206:
+                    limit.content_range(fetched.headers.get('Content-Range'))
+
+                content = self._body(
+                    fetched, read_stream, chunk_size, limit=limit,
+                    max_decompressed=max_decompressed
+                )
+                chunks, searches, encoding = self._read(
+                    fetched=fetched,
+                    content=content,
+                    searches=rule_searches(rule_sets),
+                    case_sensitive=case_sensitive,
+                    stream=read_stream,
+                    encoding=encoding,
+                    match_bytes=match_bytes
+                )
+                evaluation = self._evaluate(
+                    chunks=chunks,
+                    searches=searches,
+                    case_sensitive=case_sensitive,
+                    early_exit=False,
+                    finish_line=True,
+                    stop=0,
+                    collect=True,
+                    max_lines=msg_lines,
+                    spool_threshold=spool_threshold
+                )
+
+            return self._set_rule_statuses(
+                url=url,
+                evaluation=evaluation,
+                rule_sets=rule_sets,
+                case_sensitive=case_sensitive,
+                encoding=encoding,
+                msg_lines=msg_lines,
+                msg_bytes=msg_bytes,
+                limit=limit
+            )
+
+        except self.critical_errors as e:
+            return self._fail_rules(
+                rule_sets, NagiosResponse.CRITICAL, self._error_message(url, e)
+            )
+
+        except Exception as e:
+            return self._fail_rules(rule_sets, NagiosResponse.UNKNOWN, str(e))
+
+        finally:
+            if evaluation is not None:
+                evaluation.release()
@@ -0,0 +1,129 @@
+import configparser
+from urllib.parse import urlsplit
+
+from argo_probe_http_parser.nagios import format_passive_result
+from argo_probe_http_parser.parse import CHUNK_SIZE, HttpParse
+from argo_probe_http_parser.regex import REGEX_TIMEOUT
+from argo_probe_http_parser.scheduler import schedule
+from argo_probe_http_parser.session import POOL_CONNECTIONS, PooledSession
+
+WORKERS = 16
+
+
+class BatchCheck:
+    def __init__(self, name, host_name, hostname, port, uri, ssl, **params):
+        self.name = name
+        self.host_name = host_name
+        self.hostname = hostname
+        self.port = port
+        self.uri = uri
+        self.ssl = ssl
+        self.params = params
+
+    def http_parser(self, session=None, cache=None):
+        return HttpParse(
+            hostname=self.hostname, port=self.port, uri=self.uri, ssl=self.ssl,
+            session=session, cache=cache
+        )
+
+    def address(self):
+        parts = urlsplit(self.http_parser()._build_url())
+        return parts.hostname, parts.port
+
+    def run(self, session=None, cache=None):
+        return self.http_parser(session=session, cache=cache).check(
+            **self.params
+        )
+
+
+def _lines(value):
+    if value is None:
+        return None
+
+    return [line.strip() for line in value.splitlines() if line.strip()]
+
+
+def load_checks(path):
+    config = configparser.ConfigParser(interpolation=None)
+    with open(path) as f:
+        config.read_file(f)
+
+    checks = []
+    for name in config.sections():
+        section = config[name]
+        if 'hostname' not in section:
+            raise ValueError(f'Check {name} is missing hostname')
+
+        checks.append(BatchCheck(
+            name=name,
+            host_name=section.get('host_name', section['hostname']),
+            hostname=section['hostname'],
+            port=section.getint('port', 80),
+            uri=section.get('uri', '/'),
+            ssl=section.getboolean('ssl', False),
+            ok_search=section.get('ok_search', 'ok'),
+            warn_search=section.get('warning_search', 'warning'),
+            crit_search=section.get('critical_search', 'critical'),
+            ok_msg=section.get('ok_message', ''),
+            warn_msg=section.get('warning_message', ''),
+            crit_msg=section.get('critical_message', ''),
+            unknown_msg=section.get(
+                'unknown_message', 'None of the sample texts found in response'
+            ),
+            timeout=section.getfloat('timeout', 10),
+            case_sensitive=section.getboolean('case_sensitive', False),
+            stream=section.getboolean('stream', False),
+            chunk_size=section.getint('chunk_size', CHUNK_SIZE),
+            encoding=section.get('encoding', None),
+            match_bytes=section.getboolean('match_bytes', False),
+            perfdata=section.getboolean('perfdata', False),
+            msg_lines=section.getint('message_lines', None),
+            msg_bytes=section.getint('message_bytes', None),
+            max_bytes=section.getint('max_bytes', None),
+            max_lines=section.getint('max_lines', None),
+            range_request=section.getboolean('range', False),
+            max_decompressed=section.getint('max_decompressed', None),
+            spool_threshold=section.getint('spool_threshold', None),
+            ok_regex=section.get('ok_search_regex', None),
+            warn_regex=section.get('warning_search_regex', None),
+            crit_regex=section.get('critical_search_regex', None),
+            regex_timeout=section.getfloat('regex_timeout', REGEX_TIMEOUT),
+            ok_json=_lines(section.get('ok_json_rule', None)),
+            warn_json=_lines(section.get('warning_json_rule', None)),
+            crit_json=_lines(section.get('critical_json_rule', None)),
+            match_rules=_lines(section.get('match_rule', None))
+        ))
+
+    return checks
+
+
+def run_checks(
+        checks, workers=WORKERS, session=None, cache=None, prefetch=False,
+        per_host=None, rate=None, history=None
+):
+    if session is None:
+        session = PooledSession(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=workers
+        )
+
+    if prefetch and session.resolver:
+        session.resolver.prefetch(
+            [check.address() for check in checks], workers=workers
+        )
+
+    yield from schedule(
+        checks,
+        run=lambda check: check.run(session, cache),
+        host=lambda check: check.address()[0],
+        name=lambda check: check.name,
+        workers=workers,
+        per_host=per_host,
+        rate=rate,
+        history=history
+    )
+
+
+def format_result(check, nagios, timestamp=None):
+    return format_passive_result(
+        check.host_name, check.name, nagios, timestamp=timestamp
+    )
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import tempfile
+
+
+class CacheEntry:
+    def __init__(
+            self, url, etag=None, last_modified=None, digest=None,
+            verdicts=None
+    ):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.verdicts = verdicts or {}
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+    def update(self, etag, last_modified, digest):
+        if (etag, last_modified, digest) != \
+                (self.etag, self.last_modified, self.digest):
+            self.etag = etag
+            self.last_modified = last_modified
+            self.digest = digest
+            self.verdicts = {}
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'digest': self.digest,
+            'verdicts': self.verdicts
+        }
+
+
+class ResponseCache:
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def key(**params):
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    @staticmethod
+    def digest(content):
+        return hashlib.sha256(content).hexdigest()
+
+    def _file(self, url):
+        return os.path.join(
+            self.path,
+            '{}.json'.format(hashlib.sha256(url.encode('utf-8')).hexdigest())
+        )
+
+    def load(self, url):
+        try:
+            with open(self._file(url)) as f:
+                data = json.load(f)
+
+            if data.get('url') == url:
+                return CacheEntry(**data)
+
+        except (OSError, ValueError, TypeError):
+            pass
+
+        return CacheEntry(url)
+
+    def save(self, entry):
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry.to_dict(), f)
+
+            os.replace(tmp, self._file(entry.url))
+
+        except BaseException:
+            os.remove(tmp)
+            raise
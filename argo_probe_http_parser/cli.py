@@ -0,0 +1,382 @@
+import argparse
+import sys
+
+from argo_probe_http_parser.defaults import (
+    CHUNK_SIZE, MAX_DECOMPRESSED, REGEX_TIMEOUT
+)
+from argo_probe_http_parser.nagios import format_passive_result
+from argo_probe_http_parser.rules import load_rule_sets
+
+TRANSPORTS = ('requests', 'http.client')
+RULE_IGNORED = (
+    'perfdata', 'ok_regex', 'warn_regex', 'crit_regex', 'regex_timeout',
+    'ok_json', 'warn_json', 'crit_json', 'match_rules'
+)
+
+
+def build_parser(parser_class=argparse.ArgumentParser, prog=None):
+    parser = parser_class(
+        prog=prog,
+        description='ARGO probe that parses http response for given three '
+                    'versions of text that, if found, will return OK, WARNING '
+                    'or CRITICAL status.',
+        add_help=False
+    )
+    required = parser.add_argument_group('required arguments')
+    optional = parser.add_argument_group('optional arguments')
+    required.add_argument(
+        '-H', '--hostname', dest='hostname', type=str, required=True,
+        help='Name of the host'
+    )
+    required.add_argument(
+        '-t', '--timeout', dest='timeout', type=float, default=10,
+        required=True, help='Seconds before connection times out (default 10)'
+    )
+    optional.add_argument(
+        '-h', '--help', action='help', default=argparse.SUPPRESS,
+        help='Show this help message and exit'
+    )
+    optional.add_argument(
+        '-p', '--port', dest='port', type=int, default=80,
+        help='Port number (default: 80)'
+    )
+    optional.add_argument(
+        '-u', '--uri', dest='uri', type=str, action='append', default=None,
+        help='URI to GET; can be given more than once to check several URIs '
+             'in parallel (default /)'
+    )
+    optional.add_argument(
+        '--mirror', dest='mirrors', type=str, action='append', default=None,
+        help='Another host serving the same URIs, as HOSTNAME or '
+             'HOSTNAME:PORT; can be given more than once. Every URI is '
+             'checked on the host and all mirrors in parallel'
+    )
+    optional.add_argument(
+        '--quorum', dest='quorum', type=int, default=None,
+        help='When several URLs are checked, return the worst status reached '
+             'by at least this many of them (default: worst status of all)'
+    )
+    optional.add_argument(
+        '--ok-search', dest='ok_search', type=str, default='ok',
+        help='Text to be searched in the http response which, if found, will '
+             'return status OK (default: ok)'
+    )
+    optional.add_argument(
+        '--warning-search', dest='warning_search', type=str, default='warning',
+        help='Text to be searched in the http response which, if found, will '
+             'return status WARNING (default: warning)'
+    )
+    optional.add_argument(
+        '--critical-search', dest='critical_search', type=str,
+        default='critical',
+        help='Text to be searched in the http response which, if found, will '
+             'return status CRITICAL (default: critical)'
+    )
+    optional.add_argument(
+        '--ok-search-regex', dest='ok_regex', type=str, default=None,
+        help='Regular expression to be searched in each line of the http '
+             'response which, if found, will return status OK; overrides '
+             '--ok-search'
+    )
+    optional.add_argument(
+        '--warning-search-regex', dest='warning_regex', type=str,
+        default=None,
+        help='Regular expression to be searched in each line of the http '
+             'response which, if found, will return status WARNING; '
+             'overrides --warning-search'
+    )
+    optional.add_argument(
+        '--critical-search-regex', dest='critical_regex', type=str,
+        default=None,
+        help='Regular expression to be searched in each line of the http '
+             'response which, if found, will return status CRITICAL; '
+             'overrides --critical-search'
+    )
+    optional.add_argument(
+        '--ok-json-rule', dest='ok_json', action='append', default=None,
+        help='Rule such as \'$.status == "OK"\' evaluated against the JSON '
+             'response which, if true, will return status OK; can be given '
+             'more than once. JSON rules replace search texts and regular '
+             'expressions'
+    )
+    optional.add_argument(
+        '--warning-json-rule', dest='warning_json', action='append',
+        default=None,
+        help='Rule such as \'$.items[*].state in ["degraded"]\' evaluated '
+             'against the JSON response which, if true, will return status '
+             'WARNING; can be given more than once'
+    )
+    optional.add_argument(
+        '--critical-json-rule', dest='critical_json', action='append',
+        default=None,
+        help='Rule such as \'$.status == "CRITICAL"\' evaluated against the '
+             'JSON response which, if true, will return status CRITICAL; can '
+             'be given more than once'
+    )
+    optional.add_argument(
+        '--match-rule', dest='match_rules', action='append', default=None,
+        help='Rule such as \'CRITICAL: any ["down", "error"] not '
+             '"maintenance" => Service down: {lines}\' with a status, any, '
+             'all and not clauses and an optional message; can be given more '
+             'than once and the first rule that holds sets the status. Match '
+             'rules replace search texts, regular expressions and JSON rules'
+    )
+    optional.add_argument(
+        '--regex-timeout', dest='regex_timeout', type=float,
+        default=REGEX_TIMEOUT,
+        help='Seconds regular expressions may spend matching the response '
+             'in total before the check returns UNKNOWN status. The time is '
+             'checked after each chunk, so a single slow search is not '
+             'interrupted (default: {})'.format(REGEX_TIMEOUT)
+    )
+    optional.add_argument(
+        '--ok-message', dest='ok_msg', type=str, default='',
+        help='Status message to return if ok string is found in the response '
+             '(default: "")'
+    )
+    optional.add_argument(
+        '--warning-message', dest='warning_msg', type=str, default='',
+        help='Status message to return if warning string is found in the '
+             'response (default: "")'
+    )
+    optional.add_argument(
+        '--critical-message', dest='critical_msg', type=str, default='',
+        help='Status message to return if critical string is found in the '
+             'response (default: "")'
+    )
+    optional.add_argument(
+        '--unknown-message', dest='unknown_msg', type=str,
+        default='None of the sample texts found in response',
+        help='Status message to return in case if none of the defined strings '
+             'is found in the response.'
+    )
+    optional.add_argument(
+        '--ssl', dest='ssl', action='store_true', help='Connect using SSL.'
+    )
+    optional.add_argument(
+        '--case-sensitive', dest='case_sensitive', action='store_true',
+        help='Parse text as case sensitive. (default: false)'
+    )
+    optional.add_argument(
+        '--stream', dest='stream', action='store_true',
+        help='Read response in chunks and stop reading as soon as critical '
+             'string is found. (default: false)'
+    )
+    optional.add_argument(
+        '--chunk-size', dest='chunk_size', type=int, default=CHUNK_SIZE,
+        help='Size of chunks in bytes when reading response in stream mode '
+             '(default: {})'.format(CHUNK_SIZE)
+    )
+    optional.add_argument(
+        '--encoding', dest='encoding', type=str, default=None,
+        help='Character encoding of the response, overrides the one declared '
+             'by the server (default: declared charset)'
+    )
+    optional.add_argument(
+        '--match-bytes', dest='match_bytes', action='store_true',
+        help='Search raw response bytes using declared charset, or UTF-8 if '
+             'none is declared, instead of decoding the whole response; '
+             'falls back to text when bytes could match differently, as '
+             'in case insensitive UTF-8 searches (default: false)'
+    )
+    optional.add_argument(
+        '--transport', dest='transport', choices=TRANSPORTS,
+        default='requests',
+        help='HTTP client used to fetch the response; http.client starts '
+             'faster since it does not import requests (default: requests)'
+    )
+    optional.add_argument(
+        '--cache-dir', dest='cache_dir', type=str, default=None,
+        help='Directory where response validators and verdicts are kept; '
+             'unchanged responses are then not parsed again (default: no '
+             'cache)'
+    )
+    optional.add_argument(
+        '--max-bytes', dest='max_bytes', type=int, default=None,
+        help='Stop reading the response after given number of bytes and '
+             'evaluate only what was read (default: no limit)'
+    )
+    optional.add_argument(
+        '--max-lines', dest='max_lines', type=int, default=None,
+        help='Stop reading the response after given number of lines and '
+             'evaluate only what was read (default: no limit)'
+    )
+    optional.add_argument(
+        '--range', dest='range_request', action='store_true',
+        help='Ask the server for the first --max-bytes bytes only with a Range '
+             'header (default: false)'
+    )
+    optional.add_argument(
+        '--max-decompressed', dest='max_decompressed', type=int, default=None,
+        help='Maximum size in bytes of a compressed response once it is '
+             'decompressed; larger responses return UNKNOWN status '
+             '(default: {})'.format(MAX_DECOMPRESSED)
+    )
+    optional.add_argument(
+        '--spool-threshold', dest='spool_threshold', type=int, default=None,
+        help='Keep the response in an anonymous temporary file instead of '
+             'memory once it grows over given number of bytes; matching '
+             'lines are then read through mmap. The response is read in '
+             'chunks (default: always in memory)'
+    )
+    optional.add_argument(
+        '--message-lines', dest='msg_lines', type=int, default=None,
+        help='Maximum number of matching lines put into the status message '
+             'if no custom message is defined (default: all)'
+    )
+    optional.add_argument(
+        '--message-bytes', dest='msg_bytes', type=int, default=None,
+        help='Maximum size in bytes of matching lines put into the status '
+             'message if no custom message is defined (default: no limit)'
+    )
+    optional.add_argument(
+        '--perfdata', dest='perfdata', action='store_true',
+        help='Add duration of each phase of the check (DNS lookup, connect, '
+             'TLS handshake, time to first byte, download, tag stripping, '
+             'matching), response size and number of matched lines as '
+             'performance data (default: false)'
+    )
+    optional.add_argument(
+        '--rules', dest='rules', type=str, default=None,
+        help='Configuration file with one section per service, each defining '
+             'its own search texts and messages; the response is fetched '
+             'once and one passive check result is written per service '
+             '(search and message options are used as defaults)'
+    )
+    optional.add_argument(
+        '--host-name', dest='host_name', type=str, default=None,
+        help='Nagios host name used in passive check results written with '
+             '--rules (default: hostname)'
+    )
+    return parser
+
+
+def _targets(args):
+    hosts = [(args.hostname, args.port)]
+    for mirror in args.mirrors or []:
+        hostname, sep, port = mirror.rpartition(':')
+        if sep and port.isdigit():
+            hosts.append((hostname, int(port)))
+
+        else:
+            hosts.append((mirror, args.port))
+
+    return [
+        (hostname, port, uri)
+        for hostname, port in hosts for uri in args.uri or ['/']
+    ]
+
+
+def _http_parser(args, session=None):
+    cache = None
+    if args.cache_dir:
+        from argo_probe_http_parser.cache import ResponseCache
+        cache = ResponseCache(args.cache_dir)
+
+    if args.transport == 'http.client':
+        from argo_probe_http_parser.httpclient import StdlibHttpParse
+        http_parsers = [
+            StdlibHttpParse(
+                hostname=hostname, port=port, uri=uri, ssl=args.ssl,
+                cache=cache
+            ) for hostname, port, uri in _targets(args)
+        ]
+
+    else:
+        from argo_probe_http_parser.parse import HttpParse
+        http_parsers = [
+            HttpParse(
+                hostname=hostname, port=port, uri=uri, ssl=args.ssl,
+                session=session, cache=cache
+            ) for hostname, port, uri in _targets(args)
+        ]
+
+    if len(http_parsers) == 1:
+        return http_parsers[0]
+
+    from argo_probe_http_parser.multi import MultiHttpParse
+    return MultiHttpParse(http_parsers, quorum=args.quorum)
+
+
+def _params(args):
+    return dict(
+        ok_search=args.ok_search,
+        warn_search=args.warning_search,
+        crit_search=args.critical_search,
+        ok_msg=args.ok_msg,
+        warn_msg=args.warning_msg,
+        crit_msg=args.critical_msg,
+        unknown_msg=args.unknown_msg,
+        timeout=args.timeout,
+        case_sensitive=args.case_sensitive,
+        stream=args.stream,
+        chunk_size=args.chunk_size,
+        encoding=args.encoding,
+        match_bytes=args.match_bytes,
+        perfdata=args.perfdata,
+        msg_lines=args.msg_lines,
+        msg_bytes=args.msg_bytes,
+        max_bytes=args.max_bytes,
+        max_lines=args.max_lines,
+        range_request=args.range_request,
+        max_decompressed=args.max_decompressed,
+        spool_threshold=args.spool_threshold,
+        ok_regex=args.ok_regex,
+        warn_regex=args.warning_regex,
+        crit_regex=args.critical_regex,
+        regex_timeout=args.regex_timeout,
+        ok_json=args.ok_json,
+        warn_json=args.warning_json,
+        crit_json=args.critical_json,
+        match_rules=args.match_rules
+    )
+
+
+def _rule_defaults(args):
+    params = _params(args)
+    return {
+        key: params[key] for key in (
+            'ok_search', 'warn_search', 'crit_search', 'ok_msg', 'warn_msg',
+            'crit_msg', 'unknown_msg'
+        )
+    }
+
+
+def run(args, session=None):
+    return _http_parser(args, session=session).check(**_params(args))
+
+
+def run_rules(args, session=None):
+    defaults = _rule_defaults(args)
+    try:
+        rule_sets = load_rule_sets(args.rules, **defaults)
+
+    except Exception as e:
+        return 3, f'UNKNOWN - Unable to load rule sets: {str(e)}\n'
+
+    if len(_targets(args)) > 1:
+        return 3, 'UNKNOWN - --rules checks a single URL\n'
+
+    params = {
+        key: value for key, value in _params(args).items()
+        if key not in defaults and key not in RULE_IGNORED
+    }
+    results = _http_parser(args, session=session).check_rules(
+        rule_sets, **params
+    )
+    return 0, ''.join(
+        format_passive_result(
+            args.host_name or args.hostname, rule_set.name, nagios
+        ) + '\n' for rule_set, nagios in results
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.rules:
+        code, output = run_rules(args)
+        sys.stdout.write(output)
+        sys.exit(code)
+
+    else:
+        _http_parser(args).parse(**_params(args))
@@ -0,0 +1,72 @@
+import json
+import os
+import socket
+import sys
+
+SOCKET = '/var/run/argo-probe-http-parser/daemon.sock'
+SOCKET_ENV = 'ARGO_HTTP_PARSER_SOCKET'
+TIMEOUT = 120
+
+
+def socket_path():
+    return os.environ.get(SOCKET_ENV, SOCKET)
+
+
+def connect(path=None, timeout=TIMEOUT):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path or socket_path())
+
+    except BaseException:
+        sock.close()
+        raise
+
+    return sock
+
+
+def request(sock, argv, prog=None):
+    sock.sendall(
+        json.dumps({'argv': argv, 'prog': prog}).encode('utf-8') + b'\n'
+    )
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+
+        data += chunk
+
+    return json.loads(data.decode('utf-8'))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    try:
+        sock = connect()
+
+    except OSError:
+        from argo_probe_http_parser.cli import main as run_locally
+        run_locally(argv)
+        return
+
+    try:
+        response = request(sock, argv, prog=os.path.basename(sys.argv[0]))
+
+    except (OSError, ValueError) as e:
+        print(f'UNKNOWN - No response from http parser daemon: {str(e)}')
+        sys.exit(3)
+
+    finally:
+        sock.close()
+
+    if response.get('local'):
+        from argo_probe_http_parser.cli import main as run_locally
+        run_locally(argv)
+        return
+
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    sys.exit(response['code'])
@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+
+from argo_probe_http_parser.cli import build_parser, run
+from argo_probe_http_parser.resolver import DnsCache
+from argo_probe_http_parser.session import PooledSession
+
+SOCKET_MODE = 0o660
+DIRECTORY_MODE = 0o755
+PATH_OPTIONS = (('cache_dir', '--cache-dir'), ('rules', '--rules'))
+
+
+class _ParserExit(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class _CaptureParser(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stdout = []
+        self.stderr = []
+
+    def _print_message(self, message, file=None):
+        if message:
+            if file is sys.stderr:
+                self.stderr.append(message)
+
+            else:
+                self.stdout.append(message)
+
+    def exit(self, status=0, message=None):
+        if message:
+            self._print_message(message, sys.stderr)
+
+        raise _ParserExit(status)
+
+
+def handle_request(request, session=None):
+    parser = build_parser(
+        parser_class=_CaptureParser,
+        prog=request.get('prog') or 'check_http_parser'
+    )
+    try:
+        args = parser.parse_args(request['argv'])
+
+    except _ParserExit as e:
+        return {
+            'code': e.status,
+            'stdout': ''.join(parser.stdout),
+            'stderr': ''.join(parser.stderr)
+        }
+
+    for dest, option in PATH_OPTIONS:
+        if getattr(args, dest):
+            return {
+                'code': 3,
+                'stdout': f'UNKNOWN - Option {option} is not accepted by '
+                          f'http parser daemon\n',
+                'stderr': '',
+                'local': True
+            }
+
+    nagios = run(args, session=session)
+    return {
+        'code': nagios.get_code(),
+        'stdout': nagios.get_message() + '\n',
+        'stderr': ''
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            response = handle_request(
+                json.loads(self.rfile.readline().decode('utf-8')),
+                session=self.server.session
+            )
+
+        except Exception as e:
+            response = {
+                'code': 3, 'stdout': f'UNKNOWN - {str(e)}\n', 'stderr': ''
+            }
+
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class HttpParserDaemon(socketserver.ThreadingMixIn,
+                       socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, session=None, mode=SOCKET_MODE):
+        if os.path.exists(path):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(path)
+
+            except OSError:
+                os.remove(path)
+
+            else:
+                raise RuntimeError(f'Daemon already listening on {path}')
+
+            finally:
+                sock.close()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=DIRECTORY_MODE, exist_ok=True)
+        self.path = path
+        self.mode = mode
+        self.session = session or PooledSession(resolver=DnsCache())
+        super().__init__(path, _RequestHandler)
+
+    def server_bind(self):
+        umask = os.umask(0o777 & ~self.mode)
+        try:
+            super().server_bind()
+
+        finally:
+            os.umask(umask)
+
+        os.chmod(self.path, self.mode)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
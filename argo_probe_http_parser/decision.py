@@ -0,0 +1,165 @@
+import functools
+import json
+import re
+import string
+
+from argo_probe_http_parser.matcher import Matcher
+from argo_probe_http_parser.nagios import NagiosResponse
+
+MATCH_RULE_CACHE_SIZE = 256
+DECISION_CACHE_SIZE = 4096
+SEVERITIES = {
+    'OK': NagiosResponse.OK,
+    'WARNING': NagiosResponse.WARNING,
+    'CRITICAL': NagiosResponse.CRITICAL,
+    'UNKNOWN': NagiosResponse.UNKNOWN
+}
+FIELDS = ('lines', 'count', 'pattern')
+
+_SEVERITY = re.compile(r'\s*([A-Za-z]+)\s*:')
+_CLAUSE = re.compile(r'\s*(any|all|not)\b\s*')
+_MESSAGE = re.compile(r'\s*=>\s?(.*?)\s*$', re.S)
+_END = re.compile(r'\s*$')
+_decoder = json.JSONDecoder()
+
+
+def _patterns(text, pos):
+    try:
+        value, end = _decoder.raw_decode(text, pos)
+
+    except ValueError:
+        raise ValueError(f'Invalid patterns in match rule {text!r}')
+
+    if isinstance(value, str):
+        value = [value]
+
+    if not isinstance(value, list) or not value or \
+            not all(isinstance(item, str) and item for item in value):
+        raise ValueError(
+            f'Match rule {text!r} needs a non-empty string or list of strings'
+        )
+
+    return value, end
+
+
+def _check_message(text, message):
+    try:
+        fields = [
+            field for _, field, _, _ in string.Formatter().parse(message)
+            if field is not None
+        ]
+
+    except ValueError:
+        raise ValueError(f'Invalid message in match rule {text!r}')
+
+    for field in fields:
+        if field not in FIELDS:
+            raise ValueError(
+                f'Unknown field {{{field}}} in match rule {text!r}'
+            )
+
+
+class MatchRule:
+    def __init__(self, text):
+        severity = _SEVERITY.match(text)
+        if not severity or severity.group(1).upper() not in SEVERITIES:
+            raise ValueError(f'Match rule {text!r} has no valid severity')
+
+        self.text = text
+        self.severity = SEVERITIES[severity.group(1).upper()]
+        self.clauses = []
+        self.message = ''
+        pos = severity.end()
+        while True:
+            clause = _CLAUSE.match(text, pos)
+            if not clause:
+                break
+
+            patterns, pos = _patterns(text, clause.end())
+            self.clauses.append((clause.group(1), patterns))
+
+        message = _MESSAGE.match(text, pos)
+        if message:
+            self.message = message.group(1)
+            _check_message(text, self.message)
+
+        elif not _END.match(text, pos):
+            raise ValueError(f'Invalid match rule {text!r} at offset {pos}')
+
+        if not self.clauses:
+            raise ValueError(f'Match rule {text!r} has no any, all or not')
+
+
+class Decision:
+    def __init__(self, texts):
+        self.rules = tuple(MatchRule(text) for text in texts)
+        self.patterns = []
+        indexes = {}
+        self._tests = []
+        self._positive = []
+        for rule in self.rules:
+            any_masks = []
+            all_mask = 0
+            none_mask = 0
+            positive = 0
+            for kind, patterns in rule.clauses:
+                mask = 0
+                for pattern in patterns:
+                    if pattern not in indexes:
+                        indexes[pattern] = len(self.patterns)
+                        self.patterns.append(pattern)
+
+                    mask |= 1 << indexes[pattern]
+
+                if kind == 'any':
+                    any_masks.append(mask)
+
+                elif kind == 'all':
+                    all_mask |= mask
+
+                else:
+                    none_mask |= mask
+
+                if kind != 'not':
+                    positive |= mask
+
+            self._tests.append((tuple(any_masks), all_mask, none_mask))
+            self._positive.append(positive)
+
+        self._decided = {}
+
+    def _decide(self, found):
+        for index, (any_masks, all_mask, none_mask) in enumerate(self._tests):
+            if found & all_mask != all_mask or found & none_mask:
+                continue
+
+            if all(found & mask for mask in any_masks):
+                return index
+
+        return None
+
+    def decide(self, found):
+        try:
+            return self._decided[found]
+
+        except KeyError:
+            index = self._decide(found)
+            if len(self._decided) < DECISION_CACHE_SIZE:
+                self._decided[found] = index
+
+            return index
+
+    def evidence(self, index, found):
+        return Matcher.first(found & self._positive[index])
+
+
+@functools.lru_cache(maxsize=MATCH_RULE_CACHE_SIZE)
+def compile_match_rules(texts):
+    return Decision(texts)
+
+
+def decision_rules(rules):
+    if not rules:
+        return None
+
+    return (rules,) if isinstance(rules, str) else tuple(rules)
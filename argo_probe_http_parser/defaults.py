@@ -0,0 +1,3 @@
+CHUNK_SIZE = 64 * 1024
+MAX_DECOMPRESSED = 100 * 1024 * 1024
+REGEX_TIMEOUT = 5
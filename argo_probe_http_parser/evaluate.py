@@ -0,0 +1,294 @@
+import time
+
+from argo_probe_http_parser.matcher import Matcher, compile_matcher, fold
+from argo_probe_http_parser.spool import MappedText, SpooledText
+from argo_probe_http_parser.strip import TagStripper
+
+CRITICAL, WARNING, OK = range(3)
+LEVELS = 3
+
+
+class Evaluation:
+    def __init__(
+            self, searches, case_sensitive=False, early_exit=False,
+            finish_line=True, stop=1 << CRITICAL, collect=False,
+            max_lines=None, spool_threshold=None, exact_counts=True
+    ):
+        if not case_sensitive:
+            searches = [fold(search) for search in searches]
+
+        binary = isinstance(searches[0], bytes)
+        self.binary = binary
+        self.case_sensitive = case_sensitive
+        self.early_exit = early_exit
+        self.finish_line = finish_line
+        self.complete = False
+        self.strip_time = 0
+        self.match_time = 0
+        self.exact_counts = exact_counts
+        self._final = stop
+
+        if collect and not early_exit:
+            stop = 0
+
+        self._crit_search = searches[CRITICAL]
+        self._scanner = compile_matcher(
+            tuple(searches), case_sensitive
+        ).scanner(stop=stop)
+        self._stripper = TagStripper(sep=b'|' if binary else '|')
+        self._newline = b'\n' if binary else '\n'
+        self._empty = self._newline[:0]
+
+        self.collect = collect and all(searches)
+        self.max_lines = max_lines
+        self._searches = searches
+        self._tail_length = max(len(search) for search in searches) - 1
+        self._collect_tail = self._empty
+        self._offset = 0
+        self._collect_sep = None
+        self._line_start = 0
+        self._starts = [[] for _ in searches]
+        self._last = [None] * len(searches)
+        self._counts = [0] * len(searches)
+        self._partial = 0
+        self._text = None
+        self._stripped = SpooledText(self._empty, spool_threshold)
+        self._tail = self._empty
+        self._finishing = False
+        self._lines = None
+
+    @property
+    def html(self):
+        return self._stripper.html
+
+    @property
+    def found(self):
+        return self._scanner.found
+
+    @property
+    def match(self):
+        return Matcher.first(self._scanner.found)
+
+    @property
+    def text(self):
+        if self._text is not None:
+            return self._text
+
+        text = self._stripped.text
+        if self.complete:
+            self._text = text
+
+        return text
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.text.split(self._sep())
+
+        return self._lines
+
+    def iter_lines(self):
+        if self._lines is not None:
+            return iter(self._lines)
+
+        text = self.text
+        if isinstance(text, MappedText):
+            return text.iter_split(self._sep())
+
+        return iter(self.lines)
+
+    def group_match(self, group):
+        return Matcher.first(
+            (self._scanner.found >> (LEVELS * group)) & ((1 << LEVELS) - 1)
+        )
+
+    def _sync(self):
+        if self._collect_sep not in (None, self._sep()):
+            self._recollect(self._sep(), self._stripped.chunks())
+
+    def matched_lines(self, index):
+        if not self.collect:
+            return None
+
+        self._sync()
+        sep = self._sep()
+        text = self.text
+        lines = []
+        for start in self._starts[index]:
+            end = text.find(sep, start)
+            lines.append(text[start:] if end < 0 else text[start:end])
+
+        return lines
+
+    def matched_count(self, index):
+        if not self.collect:
+            return None
+
+        self._sync()
+        return self._counts[index]
+
+    def partial_count(self, index):
+        return bool(self._partial >> index & 1)
+
+    def _verdict_known(self):
+        return bool(self._final) and \
+            self._scanner.found & self._final == self._final
+
+    def _sep(self):
+        return self._stripper.sep if self.html else self._newline
+
+    def _recollect(self, sep, stripped):
+        self._collect_sep = sep
+        self._collect_tail = self._empty
+        self._offset = 0
+        self._line_start = 0
+        self._starts = [[] for _ in self._searches]
+        self._last = [None] * len(self._searches)
+        self._counts = [0] * len(self._searches)
+        self._partial = 0
+        for text in stripped:
+            self._collect(text, (1 << len(self._searches)) - 1, last=False)
+
+    def _collect(self, text, found, last=True):
+        length = len(text)
+        if not self.case_sensitive:
+            text = fold(text)
+            if len(text) != length:
+                self.collect = False
+                return
+
+        sep = self._sep()
+        if self._collect_sep is None:
+            self._collect_sep = sep
+
+        elif sep != self._collect_sep:
+            self._recollect(sep, self._stripped.chunks(last=False))
+
+        tail = self._collect_tail
+        combined = tail + text
+        offset = self._offset - len(tail)
+        limit = len(combined)
+        if last and self._scanner.done:
+            crit_search = self._searches[CRITICAL]
+            limit = combined.find(crit_search) + len(crit_search)
+
+        capped = False
+        if not self.exact_counts and self._verdict_known():
+            found &= self._final & ~self._partial
+            capped = self.max_lines is not None
+
+        while found:
+            index = (found & -found).bit_length() - 1
+            found &= found - 1
+            search = self._searches[index]
+            starts = self._starts[index]
+            last = self._last[index]
+            count = self._counts[index]
+            line = self._line_start
+            previous = 0
+            pos = combined.find(search)
+            while 0 <= pos and pos + len(search) <= limit:
+                start = combined.rfind(sep, previous, pos)
+                if start >= 0:
+                    line = offset + start + 1
+
+                previous = pos
+                if line != last and pos + len(search) > len(tail):
+                    last = line
+                    count += 1
+                    if self.max_lines is None or len(starts) < self.max_lines:
+                        starts.append(line)
+
+                    elif capped:
+                        self._partial |= 1 << index
+                        break
+
+                pos = combined.find(search, pos + 1)
+
+            self._last[index] = last
+            self._counts[index] = count
+
+        pos = text.rfind(sep)
+        if pos >= 0:
+            self._line_start = self._offset + pos + 1
+
+        self._offset += len(text)
+        if self._tail_length:
+            self._collect_tail = combined[-self._tail_length:]
+
+    def _scan(self, text):
+        self._stripped.append(text)
+        self._scanner.feed(text)
+        if self.collect:
+            self._collect(text, self._scanner.last_found)
+
+        crit_search = self._crit_search
+        if not self.early_exit:
+            return
+
+        if self._scanner.done:
+            if self.finish_line:
+                combined = self._tail + text
+                folded = combined
+                if not self.case_sensitive:
+                    folded = fold(combined)
+
+                end = folded.find(crit_search) + len(crit_search)
+                cut = folded.find(self._sep(), end) - len(self._tail)
+                if cut >= 0:
+                    self.complete = True
+                    if len(folded) == len(combined):
+                        self._stripped.replace_last(text[:cut])
+
+                else:
+                    self._finishing = True
+
+            else:
+                self.complete = True
+
+        elif len(crit_search) > 1:
+            self._tail = (
+                self._tail + text[1 - len(crit_search):]
+            )[1 - len(crit_search):]
+
+    def feed(self, chunk):
+        if self.complete:
+            return
+
+        start = time.monotonic()
+        text = self._stripper.feed(chunk)
+        stripped = time.monotonic()
+        if self._finishing:
+            sep = self._sep()
+            if sep in text:
+                self._stripped.append(text[:text.index(sep)])
+                self.complete = True
+
+            else:
+                self._stripped.append(text)
+
+        else:
+            self._scan(text)
+
+        self.strip_time += stripped - start
+        self.match_time += time.monotonic() - stripped
+
+    def close(self):
+        if not self.complete:
+            start = time.monotonic()
+            text = self._stripper.close()
+            stripped = time.monotonic()
+            if self._finishing:
+                self._stripped.append(text)
+
+            else:
+                self._scan(text)
+
+            self.complete = True
+            self.strip_time += stripped - start
+            self.match_time += time.monotonic() - stripped
+
+    def release(self):
+        self._text = None
+        self._lines = None
+        self._stripped.close()
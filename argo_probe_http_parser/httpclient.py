@@ -0,0 +1,129 @@
+import contextlib
+import http.client
+import socket
+import ssl
+import sys
+from urllib.parse import urljoin, urlsplit
+
+from argo_probe_http_parser.base import (
+    ACCEPT_ENCODING, CHUNK_SIZE, BaseHttpParse, Fetched, declared_encoding
+)
+
+MAX_REDIRECTS = 30
+
+
+class StdlibHttpParse(BaseHttpParse):
+    critical_errors = (OSError, http.client.HTTPException)
+
+    @staticmethod
+    def _connect(connection, parts, timeout, context, timer):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        addresses = socket.getaddrinfo(
+            parts.hostname, port, type=socket.SOCK_STREAM
+        )
+        timer.mark('dns')
+
+        error = None
+        for family, type_, proto, _, address in addresses:
+            sock = socket.socket(family, type_, proto)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(address)
+                break
+
+            except OSError as e:
+                sock.close()
+                error = e
+
+        else:
+            raise error
+
+        timer.mark('connect')
+        if context:
+            try:
+                sock = context.wrap_socket(
+                    sock, server_hostname=parts.hostname
+                )
+
+            except BaseException:
+                sock.close()
+                raise
+
+            timer.mark('tls')
+
+        connection.sock = sock
+
+    @classmethod
+    def _get(cls, url, timeout, headers=None, timer=None):
+        headers = dict({'Accept-Encoding': ACCEPT_ENCODING}, **(headers or {}))
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme == 'https':
+                context = ssl.create_default_context()
+                connection = http.client.HTTPSConnection(
+                    parts.hostname, parts.port, timeout=timeout,
+                    context=context
+                )
+
+            else:
+                context = None
+                connection = http.client.HTTPConnection(
+                    parts.hostname, parts.port, timeout=timeout
+                )
+
+            try:
+                if timer:
+                    cls._connect(connection, parts, timeout, context, timer)
+
+                path = url[len('{}://{}'.format(parts.scheme, parts.netloc)):]
+                connection.request('GET', path or '/', headers=headers)
+                response = connection.getresponse()
+                if timer:
+                    timer.mark('ttfb')
+
+            except BaseException:
+                connection.close()
+                raise
+
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                connection.close()
+                url = urljoin(url, location)
+                continue
+
+            return connection, response
+
+        raise http.client.HTTPException(
+            f'Exceeded {MAX_REDIRECTS} redirects'
+        )
+
+    @contextlib.contextmanager
+    def _fetch(
+            self, url, timeout, headers=None, chunk_size=CHUNK_SIZE,
+            timer=None
+    ):
+        connection, response = self._get(
+            url, timeout, headers=headers, timer=timer
+        )
+        try:
+            yield Fetched(
+                status=response.status,
+                headers=response.msg,
+                chunks=iter(lambda: response.read(chunk_size), b''),
+                content_encoding=response.getheader('Content-Encoding'),
+                declared=declared_encoding(response.getheader('Content-Type'))
+            )
+
+        finally:
+            connection.close()
+
+    def _error_message(self, url, error):
+        if isinstance(error, socket.timeout):
+            return f'Connection to {url} timed out'
+
+        return str(error)
+
+    def parse(self, *args, **kwargs):
+        self.check(*args, **kwargs)
+        print(self.nagios.get_message())
+        sys.exit(self.nagios.get_code())
@@ -0,0 +1,464 @@
+import functools
+import json
+import operator
+import re
+import time
+
+from argo_probe_http_parser.evaluate import CRITICAL, LEVELS
+from argo_probe_http_parser.matcher import Matcher
+
+JSON_RULE_CACHE_SIZE = 256
+WILDCARD = object()
+
+_RULE = re.compile(
+    r'\s*(\$\S*)\s*(==|!=|<=|>=|<|>|not\s+in\b|in\b)\s*(.*?)\s*$', re.S
+)
+_STEP = re.compile(
+    r'\.([A-Za-z_][\w-]*|\*)|\[(\*|\d+|"(?:[^"\\]|\\.)*"|\'[^\']*\')\]'
+)
+_TOKEN = re.compile(
+    r'[ \t\r\n]*(?:([{}\[\],:])|"([^"\\]*(?:\\.[^"\\]*)*)"|'
+    r'(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)|(true|false|null))'
+)
+_PARTIAL = re.compile(
+    r'[ \t\r\n]*(?:t(?:ru?)?|f(?:a(?:ls?)?)?|n(?:ul?)?|'
+    r'-?(?:\d+(?:\.\d*)?(?:[eE][+-]?)?)?)'
+)
+_QUOTE = re.compile(r'[ \t\r\n]*"')
+_STRING = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*')
+_SKIP = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+_NUMBER = re.compile(r'-?\d+(?:\.\d*)?(?:[eE][+-]?\d*)?')
+_LITERALS = {'true': True, 'false': False, 'null': None}
+
+_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, values: value in values,
+    'not in': lambda value, values: value not in values
+}
+
+
+def parse_path(text):
+    if not text.startswith('$'):
+        raise ValueError(f'JSON path {text!r} does not start with $')
+
+    path = []
+    pos = 1
+    while pos < len(text):
+        step = _STEP.match(text, pos)
+        if not step:
+            raise ValueError(f'Invalid JSON path {text!r} at offset {pos}')
+
+        name, index = step.groups()
+        if name == '*' or index == '*':
+            path.append(WILDCARD)
+
+        elif name is not None:
+            path.append(name)
+
+        elif index.isdigit():
+            path.append(int(index))
+
+        elif index.startswith('"'):
+            path.append(json.loads(index))
+
+        else:
+            path.append(index[1:-1])
+
+        pos = step.end()
+
+    return tuple(path)
+
+
+def format_path(path):
+    steps = ['$']
+    for step in path:
+        if isinstance(step, int):
+            steps.append(f'[{step}]')
+
+        elif re.fullmatch(r'[A-Za-z_][\w-]*', step):
+            steps.append(f'.{step}')
+
+        else:
+            steps.append(f'[{json.dumps(step)}]')
+
+    return ''.join(steps)
+
+
+def _fold(value):
+    if isinstance(value, str):
+        return value.lower()
+
+    if isinstance(value, list):
+        return [_fold(item) for item in value]
+
+    return value
+
+
+class JsonRule:
+    def __init__(self, text, case_sensitive=False):
+        rule = _RULE.match(text)
+        if not rule:
+            raise ValueError(f'Invalid JSON rule {text!r}')
+
+        path, op, value = rule.groups()
+        op = ' '.join(op.split())
+        try:
+            value = json.loads(value)
+
+        except ValueError:
+            raise ValueError(f'Invalid value in JSON rule {text!r}')
+
+        if op.endswith('in') and not isinstance(value, list):
+            raise ValueError(f'JSON rule {text!r} needs a list after {op}')
+
+        self.text = text
+        self.path = parse_path(path)
+        self.exact = WILDCARD not in self.path
+        self.op = op
+        self.case_sensitive = case_sensitive
+        self.value = value if case_sensitive else _fold(value)
+        self._compare = _OPERATORS[op]
+
+    def matches(self, path, value):
+        if len(path) != len(self.path):
+            return False
+
+        for step, expected in zip(path, self.path):
+            if expected is not WILDCARD and step != expected:
+                return False
+
+        return self.test(value)
+
+    def test(self, value):
+        if not self.case_sensitive:
+            value = _fold(value)
+
+        try:
+            return bool(self._compare(value, self.value))
+
+        except TypeError:
+            return False
+
+
+@functools.lru_cache(maxsize=JSON_RULE_CACHE_SIZE)
+def compile_json_rules(levels, case_sensitive=False):
+    return tuple(
+        tuple(JsonRule(text, case_sensitive) for text in texts)
+        for texts in levels
+    )
+
+
+def json_levels(*levels):
+    if not any(levels):
+        return None
+
+    return tuple(
+        (level,) if isinstance(level, str) else tuple(level or ())
+        for level in levels
+    )
+
+
+class JsonEvaluation:
+    def __init__(
+            self, levels, case_sensitive=False, stop=1 << CRITICAL,
+            max_lines=None
+    ):
+        self.rules = compile_json_rules(levels, case_sensitive)
+        self.stop = stop
+        self.max_lines = max_lines
+        self.complete = False
+        self.collect = True
+        self.html = False
+        self.strip_time = 0
+        self.match_time = 0
+        self.found = 0
+
+        self._rules = []
+        self._levels = []
+        for level, rules in enumerate(self.rules):
+            for rule in rules:
+                self._rules.append(rule)
+                self._levels.append(level)
+
+        self._buffer = ''
+        self._offset = 0
+        self._path = []
+        self._containers = []
+        self._active = [tuple(range(len(self._rules)))]
+        self._value_active = self._active[0]
+        self._expect_key = False
+        self._skip_depth = 0
+        self._in_string = False
+        self._string_parts = None
+        self._escape = False
+        self._lines = [[] for _ in levels]
+        self._counts = [0] * len(levels)
+        self._unseen = None
+        if all(rule.exact for rule in self._rules):
+            self._unseen = set(range(len(self._rules)))
+
+    @property
+    def match(self):
+        return Matcher.first(self.found)
+
+    def group_match(self, group):
+        return Matcher.first(
+            (self.found >> (LEVELS * group)) & ((1 << LEVELS) - 1)
+        )
+
+    def matched_lines(self, index):
+        return self._lines[index]
+
+    def matched_count(self, index):
+        return self._counts[index]
+
+    def partial_count(self, index):
+        return False
+
+    def _error(self, pos):
+        return ValueError(
+            f'Invalid JSON in response at offset {self._offset + pos}'
+        )
+
+    def _step(self, step):
+        depth = len(self._path) - 1
+        rules = self._rules
+        self._value_active = tuple(
+            index for index in self._active[-1]
+            if len(rules[index].path) > depth and (
+                rules[index].path[depth] is WILDCARD or
+                rules[index].path[depth] == step
+            )
+        )
+
+    def _value(self, value):
+        depth = len(self._path)
+        found = 0
+        for index in self._value_active:
+            rule = self._rules[index]
+            if len(rule.path) == depth:
+                if rule.test(value):
+                    found |= 1 << self._levels[index]
+
+                if self._unseen is not None:
+                    self._unseen.discard(index)
+
+        self.found |= found
+        while found:
+            level = (found & -found).bit_length() - 1
+            found &= found - 1
+            self._counts[level] += 1
+            if self.max_lines is None or \
+                    len(self._lines[level]) < self.max_lines:
+                self._lines[level].append(
+                    f'{format_path(self._path)}: {json.dumps(value)}'
+                )
+
+        if self.stop and self.found & self.stop == self.stop or \
+                self._unseen == set():
+            self.complete = True
+
+    def _open(self, bracket):
+        if not self._value_active:
+            self._skip_depth = 1
+            return
+
+        self._containers.append(bracket)
+        self._active.append(self._value_active)
+        if bracket == '{':
+            self._path.append(None)
+            self._expect_key = True
+            self._value_active = ()
+
+        else:
+            self._path.append(0)
+            self._step(0)
+
+    def _close(self, pos, bracket):
+        containers = self._containers
+        if not containers or containers.pop() != bracket:
+            raise self._error(pos)
+
+        self._path.pop()
+        self._active.pop()
+        self._value_active = ()
+        self._expect_key = False
+
+    def _skip(self, buffer, pos, final):
+        end = len(buffer)
+        while self._skip_depth:
+            pos = _SKIP.match(buffer, pos).end()
+            if pos == end:
+                break
+
+            char = buffer[pos]
+            if char in '{[':
+                self._skip_depth += 1
+
+            elif char in '}]':
+                self._skip_depth -= 1
+
+            elif char == '"' and not final:
+                self._in_string = True
+                pos = self._string(buffer, pos + 1)
+                continue
+
+            elif final:
+                raise self._error(pos)
+
+            else:
+                break
+
+            pos += 1
+
+        return pos
+
+    def _string(self, buffer, pos):
+        start = pos
+        if self._escape:
+            pos += 1
+            self._escape = False
+
+        end = _STRING.match(buffer, pos).end()
+        parts = self._string_parts
+        if end == len(buffer) or \
+                buffer[end] == '\\' and end + 1 == len(buffer):
+            if parts is not None:
+                parts.append(buffer[start:])
+
+            self._escape = end < len(buffer)
+            return len(buffer)
+
+        if buffer[end] != '"':
+            raise self._error(end)
+
+        self._in_string = False
+        self._string_parts = None
+        if parts is not None:
+            parts.append(buffer[start:end])
+            self._string_token(''.join(parts))
+
+        return end + 1
+
+    def _string_token(self, string):
+        if self._expect_key:
+            if '\\' in string:
+                string = json.loads(f'"{string}"')
+
+            self._path[-1] = string
+            self._step(string)
+
+        elif self._value_active:
+            if '\\' in string:
+                string = json.loads(f'"{string}"')
+
+            self._value(string)
+
+    def _parse(self, final=False):
+        buffer = self._buffer
+        pos = 0
+        end = len(buffer)
+        match = _TOKEN.match
+        while pos < end and not self.complete:
+            if self._in_string:
+                pos = self._string(buffer, pos)
+                continue
+
+            if self._skip_depth:
+                pos = self._skip(buffer, pos, final)
+                if self._skip_depth:
+                    break
+
+                self._value_active = ()
+                continue
+
+            token = match(buffer, pos)
+            if not token:
+                quote = _QUOTE.match(buffer, pos)
+                if quote:
+                    self._in_string = True
+                    if self._expect_key or self._value_active:
+                        self._string_parts = []
+
+                    pos = quote.end()
+                    continue
+
+                partial = _PARTIAL.match(buffer, pos)
+                if partial.end() < end or final and partial.group().strip():
+                    raise self._error(pos)
+
+                break
+
+            punctuation, string, number, literal = token.groups()
+            if punctuation is not None:
+                if punctuation == ',':
+                    if not self._containers:
+                        raise self._error(pos)
+
+                    if self._containers[-1] == '[':
+                        self._path[-1] += 1
+                        self._step(self._path[-1])
+
+                    else:
+                        self._expect_key = True
+
+                elif punctuation == ':':
+                    self._expect_key = False
+
+                elif punctuation == '{':
+                    self._open('{')
+
+                elif punctuation == '[':
+                    self._open('[')
+
+                else:
+                    self._close(pos, '{' if punctuation == '}' else '[')
+
+            elif string is not None:
+                self._string_token(string)
+
+            elif number is not None:
+                if not final and _NUMBER.fullmatch(buffer, token.start(3), end):
+                    break
+
+                if self._value_active:
+                    self._value(
+                        int(number) if number.lstrip('-').isdigit()
+                        else float(number)
+                    )
+
+            elif self._value_active:
+                self._value(_LITERALS[literal])
+
+            pos = token.end()
+
+        self._buffer = buffer[pos:]
+        self._offset += pos
+
+    def feed(self, chunk):
+        if self.complete:
+            return
+
+        start = time.monotonic()
+        self._buffer += chunk
+        self._parse()
+        self.match_time += time.monotonic() - start
+
+    def close(self):
+        if not self.complete:
+            start = time.monotonic()
+            self._parse(final=True)
+            if (self._containers or self._in_string) and \
+                    not self.complete:
+                raise self._error(len(self._buffer))
+
+            self.complete = True
+            self.match_time += time.monotonic() - start
+
+    def release(self):
+        pass
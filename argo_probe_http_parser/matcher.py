@@ -0,0 +1,310 @@
+import functools
+import re
+import threading
+from collections import deque
+
+MATCHER_CACHE_SIZE = 256
+FEW_PATTERNS = 4
+
+
+def fold(text):
+    if isinstance(text, bytes):
+        return text.lower()
+
+    return text.lower().replace('\u03c2', '\u03c3')
+
+
+def _fold(char):
+    if isinstance(char, int):
+        return (char + 32,) if 65 <= char <= 90 else (char,)
+
+    return fold(char)
+
+
+class _FoldedTransitions(dict):
+    __slots__ = ('matcher', 'state')
+
+    def __init__(self, matcher, state, transitions):
+        super().__init__(transitions)
+        self.matcher = matcher
+        self.state = state
+
+    def __missing__(self, char):
+        return self.matcher._transition(self.state, char)
+
+
+class Matcher:
+    def __init__(self, patterns, case_sensitive=True):
+        if not case_sensitive:
+            patterns = [fold(pattern) for pattern in patterns]
+
+        self.patterns = list(patterns)
+        self.case_sensitive = case_sensitive
+        self._delta = [{}]
+        self._out = [0]
+        self._lock = threading.Lock()
+        self._build()
+
+    def _build(self):
+        goto = [{}]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    self._out.append(0)
+                    goto[state][char] = nxt
+
+                state = nxt
+
+            self._out[state] |= 1 << index
+
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            for char, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(char, 0)
+                self._out[nxt] |= self._out[fail[nxt]]
+                queue.append(nxt)
+
+        if not self.case_sensitive:
+            delta = [
+                _FoldedTransitions(self, state, transitions)
+                for state, transitions in enumerate(delta)
+            ]
+
+        self._delta = delta
+
+    def _transition(self, state, char):
+        folded = _fold(char)
+        if len(folded) == 1:
+            nxt = self._delta[state].get(folded[0], 0)
+            self._delta[state][char] = nxt
+            return nxt
+
+        with self._lock:
+            nxt = state
+            out = 0
+            for part in folded:
+                nxt = self._delta[nxt].get(part, 0)
+                out |= self._out[nxt]
+
+            if out != self._out[nxt]:
+                self._delta.append(self._delta[nxt])
+                self._out.append(out)
+                nxt = len(self._delta) - 1
+
+            self._delta[state][char] = nxt
+
+        return nxt
+
+    def scanner(self, stop=0):
+        return Scanner(self, stop=stop)
+
+    def search(self, text, stop=0):
+        return self.scanner(stop=stop).feed(text)
+
+    @staticmethod
+    def first(found):
+        if not found:
+            return None
+
+        return (found & -found).bit_length() - 1
+
+
+class Scanner:
+    def __init__(self, matcher, stop=0):
+        self._delta = matcher._delta
+        self._out = matcher._out
+        self._folded = not matcher.case_sensitive
+        self._state = 0
+        self.stop = stop
+        self.found = matcher._out[0]
+        self.last_found = 0
+
+    @property
+    def done(self):
+        return bool(self.stop) and self.found & self.stop == self.stop
+
+    def feed(self, text):
+        if self.done:
+            self.last_found = 0
+            return self.found
+
+        delta = self._delta
+        out = self._out
+        state = self._state
+        found = self.found
+        last_found = 0
+        stop = self.stop
+        if not self._folded:
+            for char in text:
+                state = delta[state].get(char, 0)
+                if out[state]:
+                    last_found |= out[state]
+                    found |= out[state]
+                    if stop and found & stop == stop:
+                        break
+
+        else:
+            for char in text:
+                state = delta[state][char]
+                if out[state]:
+                    last_found |= out[state]
+                    found |= out[state]
+                    if stop and found & stop == stop:
+                        break
+
+        self._state = state
+        self.found = found
+        self.last_found = last_found
+        return found
+
+
+class LiteralMatcher:
+    def __init__(self, patterns, case_sensitive=True):
+        if not case_sensitive:
+            patterns = [fold(pattern) for pattern in patterns]
+
+        self.patterns = list(patterns)
+        self.case_sensitive = case_sensitive
+        self.empty = 0
+        self.literals = 0
+        self.tail_length = max(
+            [len(pattern) - 1 for pattern in self.patterns] + [0]
+        )
+        self._own = {}
+        self._masks = {}
+        self._regexes = {}
+        for index, pattern in enumerate(self.patterns):
+            if pattern:
+                self._own[pattern] = self._own.get(pattern, 0) | 1 << index
+                self.literals |= 1 << index
+
+            else:
+                self.empty |= 1 << index
+
+        for pattern in self._own:
+            self._masks[pattern] = 0
+            for other, own in self._own.items():
+                if pattern.startswith(other):
+                    self._masks[pattern] |= own
+
+    def regex(self, remaining):
+        try:
+            return self._regexes[remaining]
+
+        except KeyError:
+            literals = sorted(
+                (
+                    re.escape(pattern) for pattern, own in self._own.items()
+                    if own & remaining
+                ), key=len, reverse=True
+            )
+            separator = b'|' if isinstance(literals[0], bytes) else '|'
+            regex = re.compile(separator.join(literals))
+            self._regexes[remaining] = regex
+            return regex
+
+    def scanner(self, stop=0):
+        return LiteralScanner(self, stop=stop)
+
+    def search(self, text, stop=0):
+        return self.scanner(stop=stop).feed(text)
+
+    first = staticmethod(Matcher.first)
+
+
+class LiteralScanner:
+    def __init__(self, matcher, stop=0):
+        self._matcher = matcher
+        self._folded = not matcher.case_sensitive
+        self._tail = None
+        self.stop = stop
+        self.found = matcher.empty
+        self.last_found = 0
+
+    @property
+    def done(self):
+        return bool(self.stop) and self.found & self.stop == self.stop
+
+    def _crossing(self, match, boundary):
+        mask = 0
+        for pattern, own in self._matcher._own.items():
+            if match.group().startswith(pattern) and \
+                    match.start() + len(pattern) > boundary:
+                mask |= own
+
+        return mask
+
+    def _scan(self, text, remaining, boundary=0):
+        masks = self._matcher._masks
+        stop = self.stop
+        found = 0
+        pos = 0
+        while remaining:
+            match = self._matcher.regex(remaining).search(text, pos)
+            if match is None or boundary and match.start() >= boundary:
+                break
+
+            pos = match.start() + 1
+            if match.end() <= boundary:
+                continue
+
+            mask = masks[match.group()]
+            if match.start() < boundary:
+                mask = self._crossing(match, boundary)
+
+            found |= mask
+            remaining &= ~mask
+            self.found |= mask
+            if stop and self.found & stop == stop:
+                break
+
+        return found
+
+    def feed(self, text):
+        if self.done:
+            self.last_found = 0
+            return self.found
+
+        if self._folded:
+            text = fold(text)
+
+        matcher = self._matcher
+        remaining = matcher.literals
+        last_found = 0
+        tail = self._tail
+        if tail:
+            last_found = self._scan(
+                tail + text[:matcher.tail_length], remaining,
+                boundary=len(tail)
+            )
+
+        if not self.done:
+            last_found |= self._scan(text, remaining & ~last_found)
+
+        length = matcher.tail_length
+        if length:
+            if len(text) < length and tail:
+                text = tail + text
+
+            self._tail = text[-length:]
+
+        self.last_found = last_found
+        return self.found
+
+
+@functools.lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def compile_matcher(patterns, case_sensitive=True):
+    if len(patterns) <= FEW_PATTERNS:
+        return LiteralMatcher(patterns, case_sensitive=case_sensitive)
+
+    return Matcher(patterns, case_sensitive=case_sensitive)
@@ -0,0 +1,81 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from argo_probe_http_parser.nagios import NagiosResponse
+
+WORKERS = 16
+SEVERITY = (
+    NagiosResponse.OK, NagiosResponse.WARNING, NagiosResponse.UNKNOWN,
+    NagiosResponse.CRITICAL
+)
+
+
+def aggregate(codes, quorum=None):
+    quorum = min(max(quorum or 1, 1), len(codes))
+    ranked = sorted(codes, key=SEVERITY.index)
+    return ranked[len(codes) - quorum]
+
+
+def _summary(responses):
+    statuses = {nagios.get_code(): nagios.get_status() for nagios in responses}
+    codes = [nagios.get_code() for nagios in responses]
+    return ', '.join(
+        f'{codes.count(code)} {statuses[code]}'
+        for code in reversed(SEVERITY) if code in statuses
+    )
+
+
+class MultiHttpParse:
+    def __init__(self, http_parsers, quorum=None, workers=WORKERS):
+        self.http_parsers = list(http_parsers)
+        self.quorum = quorum
+        self.workers = workers
+
+        self.nagios = NagiosResponse()
+
+    @staticmethod
+    def _check(http_parser, params):
+        start = time.monotonic()
+        nagios = http_parser.check(**params)
+        return nagios, time.monotonic() - start
+
+    def check(self, **params):
+        start = time.monotonic()
+        workers = max(min(self.workers, len(self.http_parsers)), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda http_parser: self._check(http_parser, params),
+                self.http_parsers
+            ))
+
+        responses = [nagios for nagios, _ in results]
+        codes = [nagios.get_code() for nagios in responses]
+        summary = f'{len(codes)} URLs'
+        if self.quorum:
+            summary = f'{summary}, quorum {self.quorum}'
+
+        self.nagios.set_status(
+            aggregate(codes, self.quorum), f'{summary}: {_summary(responses)}'
+        )
+        for http_parser, nagios in zip(self.http_parsers, responses):
+            message = nagios.get_message(perfdata=False).partition('\n')[0]
+            self.nagios.add_detail(f'{http_parser._build_url()}: {message}')
+
+        if params.get('perfdata'):
+            for index, (_, seconds) in enumerate(results, start=1):
+                self.nagios.add_perfdata(
+                    f'time_{index}', '{:.6f}'.format(seconds), 's', minimum=0
+                )
+
+            self.nagios.add_perfdata(
+                'time', '{:.6f}'.format(time.monotonic() - start), 's',
+                minimum=0
+            )
+
+        return self.nagios
+
+    def parse(self, **params):
+        self.check(**params)
+        print(self.nagios.get_message())
+        sys.exit(self.nagios.get_code())
@@ -1,3 +1,6 @@
+import time
+
+
 class NagiosResponse:
     OK = 0
     WARNING = 1
@@ -8,6 +11,7 @@ class NagiosResponse:
         self._code = self.OK
         self._status = 'OK'
         self._msg = ''
+        self._perfdata = []
 
     def _create_msg(self, msg):
         if msg:
@@ -36,8 +40,52 @@ class NagiosResponse:
         self._status = 'UNKNOWN'
         self._msg = self._create_msg(msg)
 
+    def set_status(self, code, msg=''):
+        {
+            self.OK: self.set_ok,
+            self.WARNING: self.set_warning,
+            self.CRITICAL: self.set_critical,
+            self.UNKNOWN: self.set_unknown
+        }[code](msg)
+
+    def get_status(self):
+        return self._status
+
     def get_code(self):
         return self._code
 
-    def get_message(self):
-        return self._msg
+    def add_detail(self, msg):
+        self._msg = '{}\n{}'.format(self._msg, msg)
+
+    def add_perfdata(
+            self, label, value, uom='', warning='', critical='', minimum='',
+            maximum=''
+    ):
+        if "'" in label or '=' in label or ' ' in label:
+            label = "'{}'".format(label.replace("'", "''"))
+
+        self._perfdata.append(
+            '{}={}{};{};{};{};{}'.format(
+                label, value, uom, warning, critical, minimum, maximum
+            ).rstrip(';')
+        )
+
+    def get_perfdata(self):
+        return ' '.join(self._perfdata)
+
+    def get_message(self, perfdata=True):
+        if not perfdata or not self._perfdata:
+            return self._msg
+
+        first, sep, rest = self._msg.partition('\n')
+        return '{} | {}{}{}'.format(first, self.get_perfdata(), sep, rest)
+
+
+def format_passive_result(host_name, service, nagios, timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
+
+    return '[{}] PROCESS_SERVICE_CHECK_RESULT;{};{};{};{}'.format(
+        int(timestamp), host_name, service, nagios.get_code(),
+        nagios.get_message().replace('\n', '\\n')
+    )
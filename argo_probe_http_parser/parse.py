@@ -1,139 +1,86 @@
-import re
+import contextlib
 import sys
 
 import requests
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
 
-from argo_probe_http_parser.nagios import NagiosResponse
+from argo_probe_http_parser.base import (
+    CHUNK_SIZE, CODINGS, BaseHttpParse, Fetched, content_codings
+)
 
 
-class HttpParse:
-    def __init__(self, hostname, port, uri, ssl=False):
-        self.hostname = hostname
-        self.port = port
-        self.uri = uri
-        self.ssl = ssl
+class HttpParse(BaseHttpParse):
+    critical_errors = (requests.exceptions.RequestException,)
 
-        self.nagios = NagiosResponse()
-
-    def _build_url(self):
-        hostname = self.hostname
-        if hostname.startswith('https://'):
-            hostname = hostname[8:]
-
-        if hostname.startswith('http://'):
-            hostname = hostname[7:]
-
-        if hostname.endswith('/'):
-            hostname = hostname[0:-1]
-
-        uri = self.uri
-        if not uri.startswith('/'):
-            uri = '/{}'.format(uri)
-
-        if self.ssl:
-            return 'https://{}:{}{}'.format(hostname, self.port, uri)
-
-        else:
-            return 'http://{}:{}{}'.format(hostname, self.port, uri)
-
-    def parse(
-            self, ok_search, warn_search, crit_search, ok_msg, warn_msg,
-            crit_msg, unknown_msg, timeout, case_sensitive
+    def __init__(
+            self, hostname, port, uri, ssl=False, session=None, cache=None
     ):
-        def _remove_html_tags(s):
-            return re.compile(r'<[^>]+>').sub("|", s)
-
-        def build_msg(search, resp, is_case_sensitive, is_html):
-            if is_html:
-                resp = _remove_html_tags(resp).split("|")
-
-            else:
-                resp = resp.split("\n")
-
-            if is_case_sensitive:
-                return "\n".join([m.strip() for m in resp if search in m])
-
-            else:
-                return "\n".join([
-                    m.strip() for m in resp if search in m.lower()
-                ])
-
-        url = self._build_url()
-        crit_search_original = crit_search
-        warn_search_original = warn_search
-
+        super().__init__(
+            hostname=hostname, port=port, uri=uri, ssl=ssl, cache=cache
+        )
+        self.session = session
+
+    @staticmethod
+    def _time_response(timer, phases=None):
+        for phase, seconds in (phases or {}).items():
+            timer.add(phase, seconds)
+
+        timer.mark('ttfb')
+        if phases:
+            timer.phases['ttfb'] = max(
+                timer.phases['ttfb'] - sum(phases.values()), 0
+            )
+
+    @staticmethod
+    def _raw_content(response, chunk_size):
         try:
-            response = requests.get(url, timeout=timeout)
-            response_text = _remove_html_tags(response.text)
-            html = False
-            if response_text != response.text:
-                html = True
-
-            if not case_sensitive:
-                crit_search = crit_search.lower()
-                warn_search = warn_search.lower()
-                ok_search = ok_search.lower()
-                response_text = response_text.lower()
-
-            if crit_search in response_text:
-                if crit_msg:
-                    msg = crit_msg
-
-                else:
-                    search_str = crit_search
-                    if case_sensitive:
-                        search_str = crit_search_original
-
-                    msg = build_msg(
-                        search=search_str,
-                        resp=response.text,
-                        is_case_sensitive=case_sensitive,
-                        is_html=html
-                    )
-
-                msg = f"{msg}\nFor more info check URL: {url}"
-                self.nagios.set_critical(msg)
-
-            elif warn_search in response_text:
-                if warn_msg:
-                    msg = warn_msg
-
-                else:
-                    search_str = warn_search
-                    if case_sensitive:
-                        search_str = warn_search_original
-
-                    msg = build_msg(
-                        search=search_str,
-                        resp=response.text,
-                        is_case_sensitive=case_sensitive,
-                        is_html=html
-                    )
-
-                msg = f"{msg}\nFor more info check URL: {url}"
-                self.nagios.set_warning(msg)
-
-            elif ok_search in response_text:
-                self.nagios.set_ok(ok_msg)
+            yield from response.raw.stream(chunk_size, decode_content=False)
 
-            else:
-                if unknown_msg:
-                    msg = f"{unknown_msg}\nFor more info check URL: {url}"
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
 
-                else:
-                    msg = f"For more info check URL: {url}"
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
 
-                self.nagios.set_unknown(msg)
+    @contextlib.contextmanager
+    def _fetch(
+            self, url, timeout, headers=None, chunk_size=CHUNK_SIZE,
+            timer=None
+    ):
+        kwargs = {'headers': headers} if headers else {}
+        times = getattr(self.session, 'times', None)
+        if times:
+            times.take()
 
-        except (
-                requests.exceptions.HTTPError,
-                requests.exceptions.ConnectionError,
-                requests.exceptions.RequestException
-        ) as e:
-            self.nagios.set_critical(str(e))
+        get = self.session.get if self.session else requests.get
+        response = get(url, timeout=timeout, stream=True, **kwargs)
+        try:
+            if timer:
+                self._time_response(
+                    timer, phases=times.take() if times else None
+                )
 
-        except Exception as e:
-            self.nagios.set_unknown(str(e))
+            content_encoding = response.headers.get('Content-Encoding')
+            codings = content_codings(content_encoding)
+            if codings and all(coding in CODINGS for coding in codings):
+                chunks = self._raw_content(response, chunk_size)
 
+            else:
+                chunks = response.iter_content(chunk_size=chunk_size)
+                content_encoding = None
+
+            yield Fetched(
+                status=response.status_code,
+                headers=response.headers,
+                chunks=chunks,
+                content_encoding=content_encoding,
+                declared=response.encoding
+            )
+
+        finally:
+            response.close()
+
+    def parse(self, *args, **kwargs):
+        self.check(*args, **kwargs)
         print(self.nagios.get_message())
         sys.exit(self.nagios.get_code())
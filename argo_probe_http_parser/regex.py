@@ -0,0 +1,399 @@
+import functools
+import re
+import time
+
+try:
+    from re import _parser as sre_parse
+
+except ImportError:
+    import sre_parse
+
+from argo_probe_http_parser.defaults import REGEX_TIMEOUT
+from argo_probe_http_parser.evaluate import CRITICAL, LEVELS
+from argo_probe_http_parser.matcher import Matcher
+from argo_probe_http_parser.strip import TagStripper
+
+REGEX_CACHE_SIZE = 256
+LEVEL_NAMES = ('critical', 'warning', 'ok')
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+_ANY = object()
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: re.compile(r'\d'),
+    sre_parse.CATEGORY_WORD: re.compile(r'\w'),
+    sre_parse.CATEGORY_SPACE: re.compile(r'\s')
+}
+
+
+def _unbounded_repeat(parsed):
+    for op, av in parsed:
+        if op in _REPEATS:
+            if av[1] == sre_parse.MAXREPEAT or _unbounded_repeat(av[2]):
+                return True
+
+        elif op == sre_parse.SUBPATTERN:
+            if _unbounded_repeat(av[-1]):
+                return True
+
+        elif op == sre_parse.BRANCH:
+            if any(_unbounded_repeat(branch) for branch in av[1]):
+                return True
+
+    return False
+
+
+def _nested_repeat(parsed):
+    for op, av in parsed:
+        if op in _REPEATS:
+            if av[1] == sre_parse.MAXREPEAT and _unbounded_repeat(av[2]):
+                return True
+
+            if _nested_repeat(av[2]):
+                return True
+
+        elif op == sre_parse.SUBPATTERN:
+            if _nested_repeat(av[-1]):
+                return True
+
+        elif op == sre_parse.BRANCH:
+            if any(_nested_repeat(branch) for branch in av[1]):
+                return True
+
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _nested_repeat(av[1]):
+                return True
+
+    return False
+
+
+def _chars(items):
+    chars = set()
+    for kind, value in items:
+        if kind == sre_parse.LITERAL:
+            chars.add(chr(value).lower())
+
+        elif kind == sre_parse.RANGE and value[1] - value[0] < 256:
+            chars.update(
+                chr(char).lower() for char in range(value[0], value[1] + 1)
+            )
+
+        elif kind == sre_parse.CATEGORY and value in _CATEGORIES:
+            chars.add(_CATEGORIES[value])
+
+        else:
+            return {_ANY}
+
+    return chars
+
+
+def _first_item(op, av):
+    if op == sre_parse.LITERAL:
+        return {chr(av).lower()}, False
+
+    if op == sre_parse.IN:
+        return _chars(av), False
+
+    if op in (sre_parse.ANY, sre_parse.NOT_LITERAL):
+        return {_ANY}, False
+
+    if op in _REPEATS:
+        first, nullable = _first(av[2])
+        return first, nullable or av[0] == 0
+
+    if op == sre_parse.SUBPATTERN:
+        return _first(av[-1])
+
+    if op == sre_parse.BRANCH:
+        first = set()
+        nullable = False
+        for branch in av[1]:
+            branch_first, branch_nullable = _first(branch)
+            first |= branch_first
+            nullable = nullable or branch_nullable
+
+        return first, nullable
+
+    if op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return set(), True
+
+    return {_ANY}, True
+
+
+def _first(parsed):
+    first = set()
+    for op, av in parsed:
+        item, nullable = _first_item(op, av)
+        first |= item
+        if not nullable:
+            return first, False
+
+    return first, True
+
+
+def _same(item, other):
+    if isinstance(item, str):
+        return item == other if isinstance(other, str) else \
+            bool(other.match(item))
+
+    if isinstance(other, str):
+        return bool(item.match(other))
+
+    return item is other or {item.pattern, other.pattern} == {r'\d', r'\w'}
+
+
+def _overlap(first, other):
+    if not first or not other:
+        return False
+
+    if _ANY in first or _ANY in other:
+        return True
+
+    return any(_same(item, rest) for item in first for rest in other)
+
+
+def _ambiguous(parsed, follow):
+    parsed = list(parsed)
+    for index, (op, av) in enumerate(parsed):
+        rest, nullable = _first(parsed[index + 1:])
+        if nullable:
+            rest |= follow
+
+        if op in _REPEATS:
+            body, _ = _first(av[2])
+            if av[0] != av[1] and _overlap(body, rest):
+                return True
+
+            if _ambiguous(av[2], body | rest):
+                return True
+
+        elif op == sre_parse.SUBPATTERN:
+            if _ambiguous(av[-1], rest):
+                return True
+
+        elif op == sre_parse.BRANCH:
+            firsts = []
+            for branch in av[1]:
+                first, branch_nullable = _first(branch)
+                if branch_nullable:
+                    first |= rest
+
+                if any(_overlap(first, other) for other in firsts) or \
+                        _ambiguous(branch, rest):
+                    return True
+
+                firsts.append(first)
+
+    return False
+
+
+def _ambiguous_repeat(parsed):
+    for op, av in parsed:
+        if op in _REPEATS:
+            if av[1] == sre_parse.MAXREPEAT and \
+                    _ambiguous(av[2], _first(av[2])[0]):
+                return True
+
+            if _ambiguous_repeat(av[2]):
+                return True
+
+        elif op == sre_parse.SUBPATTERN:
+            if _ambiguous_repeat(av[-1]):
+                return True
+
+        elif op == sre_parse.BRANCH:
+            if any(_ambiguous_repeat(branch) for branch in av[1]):
+                return True
+
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _ambiguous_repeat(av[1]):
+                return True
+
+    return False
+
+
+def check_pattern(pattern):
+    try:
+        parsed = sre_parse.parse(pattern)
+
+    except re.error as e:
+        raise ValueError(f'Invalid regular expression {pattern!r}: {e}')
+
+    if _nested_repeat(parsed):
+        raise ValueError(
+            f'Regular expression {pattern!r} nests unbounded repetitions and '
+            f'may backtrack catastrophically'
+        )
+
+    if _ambiguous_repeat(parsed):
+        raise ValueError(
+            f'Regular expression {pattern!r} repeats a part that can match '
+            f'the same text in more than one way and may backtrack '
+            f'catastrophically'
+        )
+
+
+def _group_name(index):
+    name = LEVEL_NAMES[index % LEVELS]
+    return name if index < LEVELS else f'{name}{index // LEVELS}'
+
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(patterns, case_sensitive=False):
+    for pattern in patterns:
+        check_pattern(pattern)
+
+    combined = '|'.join(
+        f'(?=(?P<{_group_name(index)}>{pattern}))'
+        for index, pattern in enumerate(patterns)
+    )
+    try:
+        return re.compile(combined, 0 if case_sensitive else re.IGNORECASE)
+
+    except re.error as e:
+        raise ValueError(f'Invalid regular expression: {e}')
+
+
+def search_patterns(searches, regexes):
+    if not any(regexes):
+        return None
+
+    return [
+        regex or re.escape(search) for search, regex in zip(searches, regexes)
+    ]
+
+
+class RegexEvaluation:
+    def __init__(
+            self, patterns, case_sensitive=False, early_exit=False,
+            stop=1 << CRITICAL, max_lines=None, timeout=REGEX_TIMEOUT
+    ):
+        self.case_sensitive = case_sensitive
+        self.early_exit = early_exit
+        self.stop = stop
+        self.max_lines = max_lines
+        self.timeout = timeout
+        self.complete = False
+        self.collect = True
+        self.strip_time = 0
+        self.match_time = 0
+        self.found = 0
+
+        regex = compile_regex(tuple(patterns), case_sensitive)
+        self._finditer = regex.finditer
+        self._indexes = {
+            _group_name(index): index for index in range(len(patterns))
+        }
+        self._all = (1 << len(patterns)) - 1
+        self._stripper = TagStripper(sep='|')
+        self._stripped = []
+        self._pending = ''
+        self._sep = '\n'
+        self._reset(len(patterns))
+
+    def _reset(self, count):
+        self.found = 0
+        self._lines = [[] for _ in range(count)]
+        self._counts = [0] * count
+
+    @property
+    def html(self):
+        return self._stripper.html
+
+    @property
+    def match(self):
+        return Matcher.first(self.found)
+
+    @property
+    def text(self):
+        return ''.join(self._stripped)
+
+    @property
+    def lines(self):
+        return self.text.split(self._sep)
+
+    def group_match(self, group):
+        return Matcher.first(
+            (self.found >> (LEVELS * group)) & ((1 << LEVELS) - 1)
+        )
+
+    def matched_lines(self, index):
+        return self._lines[index]
+
+    def matched_count(self, index):
+        return self._counts[index]
+
+    def partial_count(self, index):
+        return False
+
+    @property
+    def _done(self):
+        return self.early_exit and bool(self.stop) and \
+            self.found & self.stop == self.stop
+
+    def _match_line(self, line):
+        found = 0
+        indexes = self._indexes
+        for match in self._finditer(line):
+            found |= 1 << indexes[match.lastgroup]
+            if found == self._all:
+                break
+
+        self.found |= found
+        while found:
+            index = (found & -found).bit_length() - 1
+            found &= found - 1
+            self._counts[index] += 1
+            if self.max_lines is None or \
+                    len(self._lines[index]) < self.max_lines:
+                self._lines[index].append(line)
+
+    def _match(self, text, final=False):
+        lines = (self._pending + text).split(self._sep)
+        self._pending = '' if final else lines.pop()
+        for line in lines:
+            self._match_line(line)
+            if self._done:
+                self.complete = True
+                break
+
+    def _scan(self, text, final=False):
+        self._stripped.append(text)
+        if self.html and self._sep != self._stripper.sep:
+            self._sep = self._stripper.sep
+            self._pending = ''
+            self._reset(len(self._counts))
+            text = self.text
+
+        self._match(text, final=final)
+
+    def _check_timeout(self):
+        if self.timeout and self.match_time > self.timeout:
+            raise ValueError(
+                f'Regular expression matching exceeded {self.timeout} seconds'
+            )
+
+    def feed(self, chunk):
+        if self.complete:
+            return
+
+        start = time.monotonic()
+        text = self._stripper.feed(chunk)
+        stripped = time.monotonic()
+        self._scan(text)
+        self.strip_time += stripped - start
+        self.match_time += time.monotonic() - stripped
+        self._check_timeout()
+
+    def close(self):
+        if not self.complete:
+            start = time.monotonic()
+            text = self._stripper.close()
+            stripped = time.monotonic()
+            self._scan(text, final=True)
+            self.complete = True
+            self.strip_time += stripped - start
+            self.match_time += time.monotonic() - stripped
+            self._check_timeout()
+
+    def release(self):
+        pass
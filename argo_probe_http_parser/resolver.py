@@ -0,0 +1,91 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DNS_TTL = 60
+DNS_NEGATIVE_TTL = 10
+PREFETCH_WORKERS = 16
+
+
+class DnsCache:
+    def __init__(
+            self, ttl=DNS_TTL, negative_ttl=DNS_NEGATIVE_TTL,
+            clock=time.monotonic
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > self._clock():
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            return None
+
+    def getaddrinfo(
+            self, host, port, family=0, type=socket.SOCK_STREAM, proto=0,
+            flags=0
+    ):
+        key = (host, port, family, type, proto, flags)
+        start = time.monotonic()
+        try:
+            entry = self._lookup(key)
+            if entry is None:
+                try:
+                    addresses = socket.getaddrinfo(
+                        host, port, family, type, proto, flags
+                    )
+                    entry = (self._clock() + self.ttl, addresses, None)
+
+                except socket.gaierror as e:
+                    entry = (self._clock() + self.negative_ttl, None, e)
+
+                with self._lock:
+                    self._entries[key] = entry
+
+        finally:
+            self._local.seconds = self.elapsed() + time.monotonic() - start
+
+        _, addresses, error = entry
+        if error is not None:
+            raise socket.gaierror(*error.args)
+
+        return addresses
+
+    def elapsed(self):
+        return getattr(self._local, 'seconds', 0)
+
+    def take_elapsed(self):
+        seconds = self.elapsed()
+        self._local.seconds = 0
+        return seconds
+
+    def prefetch(self, hosts, workers=PREFETCH_WORKERS):
+        hosts = sorted(set(hosts))
+        if not hosts:
+            return
+
+        def resolve(host):
+            try:
+                self.getaddrinfo(*host)
+
+            except socket.gaierror:
+                pass
+
+        with ThreadPoolExecutor(
+                max_workers=max(min(workers, len(hosts)), 1)
+        ) as executor:
+            list(executor.map(resolve, hosts))
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
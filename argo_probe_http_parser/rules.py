@@ -0,0 +1,51 @@
+import configparser
+
+
+class RuleSet:
+    def __init__(
+            self, name, ok_search='ok', warn_search='warning',
+            crit_search='critical', ok_msg='', warn_msg='', crit_msg='',
+            unknown_msg='None of the sample texts found in response'
+    ):
+        self.name = name
+        self.ok_search = ok_search
+        self.warn_search = warn_search
+        self.crit_search = crit_search
+        self.ok_msg = ok_msg
+        self.warn_msg = warn_msg
+        self.crit_msg = crit_msg
+        self.unknown_msg = unknown_msg
+
+    @property
+    def searches(self):
+        return [self.crit_search, self.warn_search, self.ok_search]
+
+
+def rule_searches(rule_sets):
+    return [search for rule_set in rule_sets for search in rule_set.searches]
+
+
+def load_rule_sets(path, **defaults):
+    config = configparser.ConfigParser(interpolation=None)
+    with open(path) as f:
+        config.read_file(f)
+
+    defaults = RuleSet(name=None, **defaults)
+    rule_sets = []
+    for name in config.sections():
+        section = config[name]
+        rule_sets.append(RuleSet(
+            name=name,
+            ok_search=section.get('ok_search', defaults.ok_search),
+            warn_search=section.get('warning_search', defaults.warn_search),
+            crit_search=section.get('critical_search', defaults.crit_search),
+            ok_msg=section.get('ok_message', defaults.ok_msg),
+            warn_msg=section.get('warning_message', defaults.warn_msg),
+            crit_msg=section.get('critical_message', defaults.crit_msg),
+            unknown_msg=section.get('unknown_message', defaults.unknown_msg)
+        ))
+
+    if not rule_sets:
+        raise ValueError(f'No rule sets defined in {path}')
+
+    return rule_sets
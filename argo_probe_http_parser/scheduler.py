@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+HISTORY_SIZE = 5
+
+
+class DurationHistory:
+    def __init__(self, path=None, size=HISTORY_SIZE):
+        self.path = path
+        self.size = size
+        self._durations = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict):
+            return
+
+        for name, durations in data.items():
+            if isinstance(durations, list) and all(
+                    isinstance(seconds, (int, float)) for seconds in durations
+            ):
+                self._durations[name] = durations[-self.size:]
+
+    def estimate(self, name):
+        durations = self._durations.get(name)
+        if not durations:
+            return None
+
+        return sum(durations) / len(durations)
+
+    def record(self, name, seconds):
+        with self._lock:
+            durations = self._durations.setdefault(name, [])
+            durations.append(round(seconds, 6))
+            del durations[:-self.size]
+
+    def retain(self, names):
+        names = set(names)
+        with self._lock:
+            for name in list(self._durations):
+                if name not in names:
+                    del self._durations[name]
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                with self._lock:
+                    json.dump(self._durations, f, sort_keys=True)
+
+            os.replace(tmp, self.path)
+
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+def _timed(run, item):
+    start = time.monotonic()
+    result = run(item)
+    return result, time.monotonic() - start
+
+
+def schedule(
+        items, run, host, name, workers, per_host=None, rate=None,
+        history=None
+):
+    queues = {}
+    for order, item in enumerate(items):
+        estimate = history.estimate(name(item)) if history else None
+        if estimate is None:
+            estimate = float('inf')
+
+        queues.setdefault(host(item), []).append((-estimate, order, item))
+
+    for key in queues:
+        queues[key] = deque(sorted(queues[key], key=lambda entry: entry[:2]))
+
+    interval = 1 / rate if rate else 0
+    running = dict.fromkeys(queues, 0)
+    next_start = dict.fromkeys(queues, 0)
+    futures = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while queues or futures:
+            wake = None
+            while queues and len(futures) < workers:
+                now = time.monotonic()
+                best = None
+                for key, queue in queues.items():
+                    if per_host and running[key] >= per_host:
+                        continue
+
+                    if next_start[key] > now:
+                        if wake is None or next_start[key] < wake:
+                            wake = next_start[key]
+
+                        continue
+
+                    if best is None or queue[0][:2] < queues[best][0][:2]:
+                        best = key
+
+                if best is None:
+                    break
+
+                _, _, item = queues[best].popleft()
+                if not queues[best]:
+                    del queues[best]
+
+                running[best] += 1
+                next_start[best] = max(next_start[best], now) + interval
+                futures[executor.submit(_timed, run, item)] = (best, item)
+
+            timeout = None
+            if wake is not None:
+                timeout = max(wake - time.monotonic(), 0)
+
+            if not futures:
+                time.sleep(timeout or 0)
+                continue
+
+            done, _ = wait(
+                futures, timeout=timeout, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                key, item = futures.pop(future)
+                running[key] -= 1
+                result, seconds = future.result()
+                if history:
+                    history.record(name(item), seconds)
+
+                yield item, result
@@ -0,0 +1,158 @@
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+try:
+    from urllib3.exceptions import NameResolutionError
+
+except ImportError:
+    NameResolutionError = None
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+
+class ConnectionTimes:
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def phases(self):
+        if not hasattr(self._local, 'phases'):
+            self._local.phases = {}
+
+        return self._local.phases
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0) + seconds
+
+    def take(self):
+        phases = self.phases
+        self._local.phases = {}
+        return phases
+
+
+class _ResolvingConnection:
+    resolver = None
+    times = None
+
+    def _resolution_error(self, error):
+        if NameResolutionError is not None:
+            return NameResolutionError(self.host, self, error)
+
+        return NewConnectionError(
+            self, f'Failed to establish a new connection: {error}'
+        )
+
+    def _getaddrinfo(self, host):
+        start = time.monotonic()
+        try:
+            return (self.resolver or socket).getaddrinfo(
+                host.strip('[]'), self.port, type=socket.SOCK_STREAM
+            )
+
+        except socket.gaierror as e:
+            raise self._resolution_error(e) from e
+
+        finally:
+            self.times.add('dns', time.monotonic() - start)
+
+    def _new_conn(self):
+        host = self._dns_host
+        addresses = self._getaddrinfo(host)
+        error = None
+        start = time.monotonic()
+        try:
+            for address in addresses:
+                self._dns_host = address[4][0]
+                try:
+                    return super()._new_conn()
+
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+
+        finally:
+            self._dns_host = host
+            self._connected = time.monotonic()
+            self.times.add('connect', self._connected - start)
+
+        raise error
+
+    def connect(self):
+        self._connected = None
+        super().connect()
+        if isinstance(self, HTTPSConnection) and self._connected:
+            self.times.add('tls', time.monotonic() - self._connected)
+
+
+def resolving_pool_classes(resolver, times):
+    attrs = {'resolver': resolver, 'times': times}
+    http_connection = type(
+        'ResolvingHTTPConnection', (_ResolvingConnection, HTTPConnection),
+        attrs
+    )
+    https_connection = type(
+        'ResolvingHTTPSConnection', (_ResolvingConnection, HTTPSConnection),
+        attrs
+    )
+    return {
+        'http': type(
+            'ResolvingHTTPConnectionPool', (HTTPConnectionPool,),
+            {'ConnectionCls': http_connection}
+        ),
+        'https': type(
+            'ResolvingHTTPSConnectionPool', (HTTPSConnectionPool,),
+            {'ConnectionCls': https_connection}
+        )
+    }
+
+
+class _ResolvingAdapter(HTTPAdapter):
+    def __init__(self, resolver, times, **kwargs):
+        self.resolver = resolver
+        self.times = times
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = resolving_pool_classes(
+            self.resolver, self.times
+        )
+
+
+class PooledSession(requests.Session):
+    def __init__(
+            self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+            resolver=None
+    ):
+        super().__init__()
+        self.resolver = resolver
+        self.times = ConnectionTimes()
+        self.adapter = _ResolvingAdapter(
+            resolver, self.times, pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+
+        self.mount('http://', self.adapter)
+        self.mount('https://', self.adapter)
+
+    def pool_stats(self):
+        num_requests = 0
+        num_connections = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            num_requests += pool.num_requests
+            num_connections += pool.num_connections
+
+        return {
+            'requests': num_requests,
+            'hits': num_requests - num_connections,
+            'misses': num_connections
+        }
@@ -0,0 +1,180 @@
+import bisect
+import mmap
+import tempfile
+
+
+class SpooledText:
+    def __init__(self, empty, threshold=None):
+        self.threshold = threshold
+        self._empty = empty
+        self._binary = isinstance(empty, bytes)
+        self._chunks = []
+        self._size = 0
+        self._file = None
+        self._starts = []
+        self._offsets = []
+        self._bytes = 0
+        self._text = None
+
+    @property
+    def spooled(self):
+        return self._file is not None
+
+    def __len__(self):
+        return self._size
+
+    def _encode(self, text):
+        if self._binary:
+            return text
+
+        return text.encode('utf-8', errors='surrogatepass')
+
+    def _write(self, text):
+        data = self._encode(text)
+        self._starts.append(self._size)
+        self._offsets.append(self._bytes)
+        self._file.write(data)
+        self._size += len(text)
+        self._bytes += len(data)
+
+    def _spool(self):
+        self._file = tempfile.TemporaryFile()
+        chunks = self._chunks
+        self._chunks = []
+        self._size = 0
+        for chunk in chunks:
+            self._write(chunk)
+
+    def append(self, text):
+        self._text = None
+        if self._file is not None:
+            self._write(text)
+            return
+
+        self._chunks.append(text)
+        self._size += len(text)
+        if self.threshold is not None and self._size > self.threshold:
+            self._spool()
+
+    def replace_last(self, text):
+        self._text = None
+        if self._file is None:
+            self._size += len(text) - len(self._chunks[-1])
+            self._chunks[-1] = text
+            return
+
+        self._size = self._starts.pop()
+        self._bytes = self._offsets.pop()
+        self._file.seek(self._bytes)
+        self._file.truncate()
+        self._write(text)
+
+    def chunks(self, last=True):
+        if self._file is None:
+            return iter(self._chunks if last else self._chunks[:-1])
+
+        text = self.text
+        count = len(self._starts) if last else len(self._starts) - 1
+        return (text.chunk(index) for index in range(count))
+
+    @property
+    def text(self):
+        if self._text is None:
+            if self._file is None:
+                self._text = self._empty.join(self._chunks)
+
+            else:
+                self._file.flush()
+                self._text = MappedText(
+                    self._file, self._starts, self._offsets, self._size,
+                    self._bytes, self._empty
+                )
+
+        return self._text
+
+    def close(self):
+        if isinstance(self._text, MappedText):
+            self._text.close()
+
+        self._text = None
+        if self._file is not None:
+            self._file.close()
+
+
+class MappedText:
+    def __init__(self, file, starts, offsets, size, length, empty):
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if length else b''
+        self._starts = list(starts)
+        self._offsets = list(offsets) + [length]
+        self._size = size
+        self._empty = empty
+        self._binary = isinstance(empty, bytes)
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def chunk(self, index):
+        data = self._map[self._offsets[index]:self._offsets[index + 1]]
+        if self._binary:
+            return data
+
+        return data.decode('utf-8', errors='surrogatepass')
+
+    def _locate(self, pos):
+        return max(bisect.bisect_right(self._starts, pos) - 1, 0)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError('MappedText supports contiguous slices only')
+
+        start, stop, _ = key.indices(self._size)
+        if start >= stop:
+            return self._empty
+
+        index = self._locate(start)
+        parts = []
+        while index < len(self._starts) and self._starts[index] < stop:
+            base = self._starts[index]
+            parts.append(self.chunk(index)[max(start - base, 0):stop - base])
+            index += 1
+
+        return self._empty.join(parts)
+
+    def find(self, sub, start=0):
+        if start >= self._size or not self._starts:
+            return -1
+
+        index = self._locate(start)
+        text = self.chunk(index)[start - self._starts[index]:]
+        base = start
+        tail = self._empty
+        while True:
+            combined = tail + text
+            pos = combined.find(sub)
+            if pos >= 0:
+                return base - len(tail) + pos
+
+            index += 1
+            if index == len(self._starts):
+                return -1
+
+            tail = combined[max(len(combined) - len(sub) + 1, 0):]
+            base += len(text)
+            text = self.chunk(index)
+
+    def iter_split(self, sep):
+        pending = self._empty
+        for index in range(len(self._starts)):
+            parts = (pending + self.chunk(index)).split(sep)
+            pending = parts.pop()
+            yield from parts
+
+        yield pending
+
+    def split(self, sep):
+        return list(self.iter_split(sep))
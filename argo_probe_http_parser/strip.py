@@ -0,0 +1,71 @@
+import re
+
+TAG = re.compile(r'<[^>]+>')
+BYTES_TAG = re.compile(rb'<[^>]+>')
+
+
+class TagStripper:
+    def __init__(self, sep='|'):
+        self.sep = sep
+        self.html = False
+        if isinstance(sep, bytes):
+            self._lt, self._gt, self._empty = b'<', b'>', b''
+            self._tag = BYTES_TAG
+
+        else:
+            self._lt, self._gt, self._empty = '<', '>', ''
+            self._tag = TAG
+
+        self._pending = []
+        self._pending_len = 0
+
+    def feed(self, chunk):
+        out = []
+        pos = 0
+        if self._pending:
+            end = chunk.find(self._gt)
+            if end == -1:
+                self._pending.append(chunk)
+                self._pending_len += len(chunk)
+                return self._empty
+
+            if end == 0 and self._pending_len == 1:
+                out.append(self._lt + self._gt)
+
+            else:
+                out.append(self.sep)
+                self.html = True
+
+            pos = end + 1
+            self._pending = []
+            self._pending_len = 0
+
+        end = max(chunk.rfind(self._gt) + 1, pos)
+        if end > pos:
+            text, count = self._tag.subn(self.sep, chunk[pos:end])
+            out.append(text)
+            if count:
+                self.html = True
+
+        start = chunk.find(self._lt, end)
+        if start == -1:
+            out.append(chunk[end:])
+
+        else:
+            out.append(chunk[end:start])
+            self._pending = [chunk[start:]]
+            self._pending_len = len(chunk) - start
+
+        return self._empty.join(out)
+
+    def close(self):
+        text = self._empty.join(self._pending)
+        self._pending = []
+        self._pending_len = 0
+        return text
+
+
+def strip_tags(text, sep='|'):
+    stripper = TagStripper(sep=sep)
+    text = stripper.feed(text) + stripper.close()
+    return text, stripper.html
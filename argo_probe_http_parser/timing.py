@@ -0,0 +1,38 @@
+import time
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.phases = {}
+        self.size = 0
+        self.start = self._last = time.monotonic()
+
+    @property
+    def total(self):
+        return time.monotonic() - self.start
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0) + seconds
+
+    def mark(self, phase):
+        now = time.monotonic()
+        self.add(phase, now - self._last)
+        self._last = now
+
+    def skip(self):
+        self._last = time.monotonic()
+
+    def timed(self, chunks, phase='download'):
+        chunks = iter(chunks)
+        while True:
+            start = time.monotonic()
+            try:
+                chunk = next(chunks)
+
+            except StopIteration:
+                self.add(phase, time.monotonic() - start)
+                return
+
+            self.add(phase, time.monotonic() - start)
+            self.size += len(chunk)
+            yield chunk
@@ -0,0 +1,322 @@
+#!/usr/bin/python3
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from argo_probe_http_parser.evaluate import CRITICAL, Evaluation
+from argo_probe_http_parser.parse import HttpParse
+from argo_probe_http_parser.strip import strip_tags
+
+from tests.server import MockHandler, MockServer
+
+KB = 1024
+MB = 1024 * KB
+SIZES = (KB, 10 * KB, 100 * KB, MB, 10 * MB, 100 * MB)
+KINDS = ('plain', 'html', 'matches', 'nomatch', 'markup')
+MODES = ('default', 'stream', 'match-bytes')
+REPEAT = 5
+
+PARAMS = dict(
+    ok_search='ok',
+    warn_search='warning',
+    crit_search='critical',
+    ok_msg='',
+    warn_msg='',
+    crit_msg='',
+    unknown_msg='None of the sample texts found in response',
+    timeout=60
+)
+
+FILLER = {
+    'plain': 'item{}: publication delayed by scheduler\n',
+    'html': '<tr><td class="item">item{}</td><td>delayed</td></tr>\n',
+    'matches': 'item{}: Warning, publication delayed\n',
+    'nomatch': 'item{}: publication delayed by scheduler\n',
+    'markup': '<a<b<c<d{}'
+}
+
+LAST = {
+    'plain': 'item: CRITICAL\nStatus: OK\n',
+    'html': '<tr><td>item</td><td>CRITICAL</td></tr><p>OK</p></html>\n',
+    'matches': 'Status: OK\n',
+    'nomatch': 'Status: unknown\n',
+    'markup': '> CRITICAL OK'
+}
+
+
+def make_body(kind, size):
+    last = LAST[kind]
+    parts = ['<html>\n'] if kind == 'html' else []
+    length = len(parts[0]) if parts else 0
+    i = 0
+    while length + len(last) < size:
+        line = FILLER[kind].format(i)
+        parts.append(line)
+        length += len(line)
+        i += 1
+
+    parts.append(last)
+    return ''.join(parts)[-size:].encode('utf-8')
+
+
+class BodyHandler(MockHandler):
+    def do_GET(self):
+        kind, size = self.path.strip('/').split('/')
+        self.send_body(
+            self.server.body(kind, int(size)),
+            content_type='text/{}; charset=utf-8'.format(
+                'html' if kind in ('html', 'markup') else 'plain'
+            )
+        )
+
+
+class BodyServer(MockServer):
+    def __init__(self):
+        super().__init__(BodyHandler)
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def body(self, kind, size):
+        with self._lock:
+            if (kind, size) not in self._bodies:
+                self._bodies.clear()
+                self._bodies[(kind, size)] = make_body(kind, size)
+
+            return self._bodies[(kind, size)]
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def mode_params(mode):
+    return {
+        'default': {},
+        'stream': {'stream': True},
+        'match-bytes': {'match_bytes': True}
+    }[mode]
+
+
+def time_parse(port, kind, size, case_sensitive, mode):
+    http_parser = HttpParse(
+        hostname='127.0.0.1', port=port, uri=f'/{kind}/{size}'
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            http_parser.parse(
+                case_sensitive=case_sensitive, **PARAMS, **mode_params(mode)
+            )
+
+        except SystemExit:
+            pass
+
+    return time.perf_counter() - start, http_parser.nagios.get_code()
+
+
+def time_phases(port, kind, size, case_sensitive):
+    url = f'http://127.0.0.1:{port}/{kind}/{size}'
+    phases = {}
+
+    start = time.perf_counter()
+    response = requests.get(url, timeout=PARAMS['timeout'])
+    content = response.content
+    phases['fetch'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    text = content.decode(response.encoding or 'utf-8', errors='replace')
+    phases['decode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    strip_tags(text)
+    phases['strip'] = time.perf_counter() - start
+
+    searches = [PARAMS['crit_search'], PARAMS['warn_search'],
+                PARAMS['ok_search']]
+    start = time.perf_counter()
+    evaluation = Evaluation(
+        searches, case_sensitive=case_sensitive, collect=True
+    )
+    evaluation.feed(text)
+    evaluation.close()
+    phases['evaluate'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if evaluation.match == CRITICAL:
+        HttpParse._build_msg(
+            PARAMS['crit_search'], evaluation, case_sensitive, index=CRITICAL
+        )
+
+    phases['message'] = time.perf_counter() - start
+    return phases
+
+
+def summary(samples):
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'max': max(samples)
+    }
+
+
+def run(sizes, kinds, modes, repeat, phases=True, log=None):
+    results = []
+    with BodyServer() as server:
+        for size in sizes:
+            for kind in kinds:
+                server.body(kind, size)
+                for case_sensitive in (True, False):
+                    for mode in modes:
+                        samples = []
+                        for _ in range(repeat):
+                            elapsed, code = time_parse(
+                                server.port, kind, size, case_sensitive, mode
+                            )
+                            samples.append(elapsed)
+
+                        result = {
+                            'kind': kind,
+                            'size': size,
+                            'case_sensitive': case_sensitive,
+                            'mode': mode,
+                            'code': code,
+                            'repeat': repeat,
+                            'parse': summary(samples)
+                        }
+                        if phases and mode == 'default':
+                            runs = [
+                                time_phases(
+                                    server.port, kind, size, case_sensitive
+                                ) for _ in range(repeat)
+                            ]
+                            result['phases'] = {
+                                phase: summary([r[phase] for r in runs])
+                                for phase in runs[0]
+                            }
+
+                        results.append(result)
+                        if log:
+                            log.write('{kind:>8} {size:>10} {cs:>16} {mode:>12} '
+                                      '{median:10.6f}s\n'.format(
+                                          kind=kind, size=size, mode=mode,
+                                          cs='case-sensitive' if case_sensitive
+                                          else 'case-insensitive',
+                                          median=result['parse']['median']
+                                      ))
+
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE,
+            universal_newlines=True, check=True
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result):
+    return (
+        result['kind'], result['size'], result['case_sensitive'],
+        result['mode']
+    )
+
+
+def compare(baseline, results, log):
+    baseline = {result_key(r): r for r in baseline['results']}
+    for result in results:
+        old = baseline.get(result_key(result))
+        if not old:
+            continue
+
+        log.write('{:>8} {:>10} {:>16} {:>12} {:10.6f}s -> {:10.6f}s '
+                  '({:+.1f}%)\n'.format(
+                      result['kind'], result['size'],
+                      'case-sensitive' if result['case_sensitive']
+                      else 'case-insensitive', result['mode'],
+                      old['parse']['median'], result['parse']['median'],
+                      100 * (result['parse']['median'] /
+                             old['parse']['median'] - 1)
+                  ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks HttpParse.parse on synthetic responses served '
+                    'by a local HTTP server.'
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=SIZES,
+        help='Body sizes in bytes (default: 1 KB to 100 MB)'
+    )
+    parser.add_argument(
+        '--max-size', type=int, default=None,
+        help='Skip bodies larger than given number of bytes'
+    )
+    parser.add_argument(
+        '--kinds', nargs='+', choices=KINDS, default=KINDS,
+        help='Kinds of bodies (default: all)'
+    )
+    parser.add_argument(
+        '--modes', nargs='+', choices=MODES, default=MODES,
+        help='Parser modes (default: all)'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=REPEAT,
+        help='Number of runs per case (default: {})'.format(REPEAT)
+    )
+    parser.add_argument(
+        '--no-phases', dest='phases', action='store_false',
+        help='Do not time individual phases'
+    )
+    parser.add_argument(
+        '-o', '--output', type=str, default=None,
+        help='JSON file results are written to'
+    )
+    parser.add_argument(
+        '--compare', type=str, default=None,
+        help='JSON file with baseline results to compare with'
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes if not args.max_size or s <= args.max_size]
+    results = run(
+        sizes, args.kinds, args.modes, args.repeat, phases=args.phases,
+        log=sys.stderr
+    )
+    data = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': int(time.time()),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results, sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,10 @@ setup(
     url='https://github.com/ARGOeu-Metrics/argo-probe-http-parser',
     packages=['argo_probe_http_parser'],
     data_files=[
-        ('/usr/libexec/argo/probes/http_parser', ['plugins/check_http_parser'])
+        ('/usr/libexec/argo/probes/http_parser', [
+            'plugins/check_http_parser', 'plugins/check_http_parser_batch',
+            'plugins/check_http_parser_client',
+            'plugins/check_http_parser_daemon'
+        ])
     ]
 )
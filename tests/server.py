@@ -0,0 +1,61 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def send_body(
+            self, body, content_type='text/plain; charset=utf-8', status=200,
+            headers=None
+    ):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.port = self.server_address[1]
+        self.requests = []
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={'poll_interval': 0.05}
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+class ServerTestCase(unittest.TestCase):
+    handler = MockHandler
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockServer(cls.handler).start()
+        cls.port = cls.server.port
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
@@ -0,0 +1,238 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.aio import AsyncHttpParse, ConcurrencyLimit
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.test_parse import MockStreamResponse, html_response
+
+bodies = {
+    '/ok': 'OK',
+    '/warning': 'WARNING: item1,item2,item3\nOK:item4,item5',
+    '/critical': 'WARNING: item1,item2\nCRITICAL:item3, item4\nOK:item5',
+    '/strange': 'Some strange text.',
+    '/html': html_response
+}
+redirects = {
+    '/old': '/new', '/loop': '/loop', '/absolute': 'http://127.0.0.1/new'
+}
+moved = {'/new': 'Status: critical'}
+
+params = dict(
+    ok_search='ok', warn_search='warning', crit_search='error', ok_msg='',
+    warn_msg='', crit_msg='', unknown_msg='Something unknown.', timeout=5,
+    case_sensitive=False
+)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+
+    finally:
+        loop.close()
+
+
+class MockServer:
+    def __init__(self, chunked=False, delay=0):
+        self.chunked = chunked
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle, '127.0.0.1', 0
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        while self.active:
+            await asyncio.sleep(0.01)
+
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.active += 1
+        self.max_active = max(self.active, self.max_active)
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+            path = request.split(b' ')[1].decode()
+            await asyncio.sleep(self.delay)
+            if path in redirects:
+                writer.write(
+                    b'HTTP/1.1 301 Moved Permanently\r\n'
+                    b'Location: %s\r\n'
+                    b'Content-Length: 0\r\n\r\n' % redirects[path].encode()
+                )
+                await writer.drain()
+                return
+
+            body = bodies.get(path, moved.get(path, '')).encode('utf-8')
+            writer.write(
+                b'HTTP/1.1 200 OK\r\n'
+                b'Content-Type: text/html; charset=utf-8\r\n'
+            )
+            if self.chunked:
+                writer.write(b'Transfer-Encoding: chunked\r\n\r\n')
+                for i in range(0, len(body), 10):
+                    part = body[i:i + 10]
+                    writer.write(b'%x\r\n%s\r\n' % (len(part), part))
+
+                writer.write(b'0\r\n\r\n')
+
+            else:
+                writer.write(
+                    b'Content-Length: %d\r\n\r\n%s' % (len(body), body)
+                )
+
+            await writer.drain()
+
+        finally:
+            self.active -= 1
+            writer.close()
+
+
+class AsyncHttpParseTests(unittest.TestCase):
+    def check_all(self, server, paths, limit=None, **kwargs):
+        async def _check_all():
+            await server.start()
+            try:
+                return await asyncio.gather(*[
+                    AsyncHttpParse(
+                        hostname='127.0.0.1', port=server.port, uri=path,
+                        limit=limit
+                    ).check(**dict(params, **kwargs)) for path in paths
+                ])
+
+            finally:
+                await server.stop()
+
+        return run(_check_all())
+
+    def sync_check(self, port, path, **kwargs):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            get.return_value = MockStreamResponse([bodies[path]])
+            return HttpParse(
+                hostname='127.0.0.1', port=port, uri=path
+            ).check(stream=True, **dict(params, **kwargs))
+
+    def assertSameAsSync(self, server, **kwargs):
+        paths = sorted(bodies)
+        results = self.check_all(server, paths, **kwargs)
+        for path, result in zip(paths, results):
+            expected = self.sync_check(server.port, path, **kwargs)
+            self.assertEqual(result.get_code(), expected.get_code(), path)
+            self.assertEqual(
+                result.get_message(), expected.get_message(), path
+            )
+
+    def test_check_same_as_sync(self):
+        self.assertSameAsSync(MockServer())
+
+    def test_check_same_as_sync_case_sensitive(self):
+        self.assertSameAsSync(MockServer(), case_sensitive=True)
+
+    def test_check_same_as_sync_chunked(self):
+        self.assertSameAsSync(MockServer(chunked=True))
+
+    def test_check_same_as_sync_match_bytes(self):
+        self.assertSameAsSync(MockServer(chunked=True), match_bytes=True)
+
+    def test_check_critical(self):
+        result = self.check_all(MockServer(), ['/html'])[0]
+        self.assertEqual(result.get_code(), 2)
+        self.assertTrue(result.get_message().startswith(
+            'CRITICAL - A warning / error is raised'
+        ))
+
+    def test_check_per_host_limit(self):
+        server = MockServer(delay=0.05)
+        results = self.check_all(
+            server, ['/ok'] * 10, limit=ConcurrencyLimit(per_host=3)
+        )
+        self.assertEqual([r.get_code() for r in results], [0] * 10)
+        self.assertEqual(server.max_active, 3)
+
+    def test_check_total_limit(self):
+        server = MockServer(delay=0.05)
+        self.check_all(
+            server, ['/ok'] * 10,
+            limit=ConcurrencyLimit(total=2, per_host=5)
+        )
+        self.assertEqual(server.max_active, 2)
+
+    def test_check_connection_refused(self):
+        async def _check():
+            server = MockServer()
+            await server.start()
+            port = server.port
+            await server.stop()
+            return await AsyncHttpParse(
+                hostname='127.0.0.1', port=port, uri='/ok'
+            ).check(**params)
+
+        result = run(_check())
+        self.assertEqual(result.get_code(), 2)
+
+    def test_check_redirect(self):
+        server = MockServer()
+        result = self.check_all(server, ['/old'], crit_search='critical')[0]
+        self.assertEqual(result.get_code(), 2)
+        self.assertEqual(
+            result.get_message(),
+            'CRITICAL - Status: critical\n'
+            'For more info check URL: http://127.0.0.1:{}/old'.format(
+                server.port
+            )
+        )
+
+    def test_check_redirect_without_port(self):
+        server = MockServer()
+        open_connection = asyncio.open_connection
+        ports = []
+
+        def connect(host, port, **kwargs):
+            ports.append(port)
+            return open_connection(
+                host, server.port if port == 80 else port, **kwargs
+            )
+
+        with mock.patch(
+                'argo_probe_http_parser.aio.asyncio.open_connection', connect
+        ):
+            result = self.check_all(
+                server, ['/absolute'], crit_search='critical'
+            )[0]
+
+        self.assertEqual(ports, [server.port, 80])
+        self.assertEqual(result.get_code(), 2)
+
+    def test_check_rules_not_supported(self):
+        self.assertRaises(
+            NotImplementedError,
+            AsyncHttpParse(hostname='127.0.0.1', port=80, uri='/').check_rules,
+            [], timeout=5, case_sensitive=False
+        )
+
+    def test_check_redirect_loop(self):
+        result = self.check_all(MockServer(), ['/loop'])[0]
+        self.assertEqual(result.get_code(), 2)
+        self.assertEqual(
+            result.get_message(), 'CRITICAL - Exceeded 30 redirects'
+        )
+
+    def test_check_timeout(self):
+        server = MockServer(delay=0.3)
+        result = self.check_all(server, ['/ok'], timeout=0.05)[0]
+        self.assertEqual(result.get_code(), 2)
+        self.assertEqual(
+            result.get_message(),
+            'CRITICAL - Connection to http://127.0.0.1:{}/ok timed '
+            'out'.format(server.port)
+        )
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.batch import (
+    BatchCheck, format_result, load_checks, run_checks
+)
+from argo_probe_http_parser.scheduler import DurationHistory
+
+from tests.test_parse import MockResponse
+
+config = """
+[DEFAULT]
+timeout = 20
+
+[APEL-Pub]
+hostname = hostname.com
+uri = /api/test.php
+critical_search = error
+critical_message = Nothing is ok.
+
+[Status]
+host_name = status.hostname.com
+hostname = https://hostname.com/
+port = 443
+ssl = true
+case_sensitive = true
+ok_search = OK
+"""
+
+
+def mock_response(url, timeout, **kwargs):
+    if url.startswith('https'):
+        return MockResponse('OK')
+
+    return MockResponse('ERROR: item1\nOK: item2')
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as f:
+            f.write(config)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_load_checks(self):
+        checks = load_checks(self.path)
+        self.assertEqual(len(checks), 2)
+        self.assertEqual(checks[0].name, 'APEL-Pub')
+        self.assertEqual(checks[0].host_name, 'hostname.com')
+        self.assertEqual(checks[0].port, 80)
+        self.assertFalse(checks[0].ssl)
+        self.assertEqual(checks[0].params['crit_search'], 'error')
+        self.assertEqual(checks[0].params['crit_msg'], 'Nothing is ok.')
+        self.assertEqual(checks[0].params['timeout'], 20.)
+        self.assertFalse(checks[0].params['case_sensitive'])
+        self.assertEqual(checks[1].host_name, 'status.hostname.com')
+        self.assertEqual(checks[1].port, 443)
+        self.assertTrue(checks[1].ssl)
+        self.assertTrue(checks[1].params['case_sensitive'])
+
+    def test_load_checks_missing_hostname(self):
+        with open(self.path, 'a') as f:
+            f.write('\n[Broken]\nuri = /\n')
+
+        with self.assertRaises(ValueError):
+            load_checks(self.path)
+
+    @mock.patch('argo_probe_http_parser.batch.PooledSession.get')
+    def test_run_checks(self, mock_get):
+        mock_get.side_effect = mock_response
+        results = dict(
+            (check.name, format_result(check, nagios, timestamp=1679415290))
+            for check, nagios in run_checks(load_checks(self.path), workers=2)
+        )
+        self.assertEqual(results, {
+            'APEL-Pub':
+                '[1679415290] PROCESS_SERVICE_CHECK_RESULT;hostname.com;'
+                'APEL-Pub;2;CRITICAL - Nothing is ok.\\n'
+                'For more info check URL: http://hostname.com:80/api/test.php',
+            'Status':
+                '[1679415290] PROCESS_SERVICE_CHECK_RESULT;'
+                'status.hostname.com;Status;0;OK'
+        })
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_run_checks_history(self):
+        history = DurationHistory()
+        history.record('APEL-Pub', 0.5)
+        started = []
+        with mock.patch.object(
+                BatchCheck, 'run', autospec=True,
+                side_effect=lambda check, *args: started.append(check.name)
+        ):
+            list(run_checks(
+                load_checks(self.path), workers=1, per_host=1, rate=100,
+                history=history
+            ))
+
+        self.assertEqual(started, ['Status', 'APEL-Pub'])
+        self.assertIsNotNone(history.estimate('Status'))
@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.cache import CacheEntry, ResponseCache
+from argo_probe_http_parser.httpclient import StdlibHttpParse
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.server import MockHandler, MockServer
+
+
+class ConditionalHandler(MockHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.etag and self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.send_header('ETag', server.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_body(
+            server.body, headers={'ETag': server.etag} if server.etag else None
+        )
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_load_missing(self):
+        entry = self.cache.load('http://localhost/')
+        self.assertEqual(entry.url, 'http://localhost/')
+        self.assertEqual(entry.validators(), {})
+        self.assertEqual(entry.verdicts, {})
+
+    def test_save_and_load(self):
+        entry = CacheEntry(
+            'http://localhost/', etag='"v1"',
+            last_modified='Wed, 21 Oct 2015 07:28:00 GMT',
+            digest='abc', verdicts={'key': [0, 'Everything is ok.']}
+        )
+        self.cache.save(entry)
+        loaded = self.cache.load('http://localhost/')
+        self.assertEqual(loaded.to_dict(), entry.to_dict())
+        self.assertEqual(loaded.validators(), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+        })
+        self.assertEqual(os.listdir(self.path), [
+            os.path.basename(self.cache._file('http://localhost/'))
+        ])
+
+    def test_load_corrupted(self):
+        with open(self.cache._file('http://localhost/'), 'w') as f:
+            f.write('{')
+
+        self.assertEqual(self.cache.load('http://localhost/').verdicts, {})
+
+    def test_update_resets_verdicts(self):
+        entry = CacheEntry('http://localhost/', etag='"v1"', verdicts={
+            'key': [0, '']
+        })
+        entry.update(etag='"v1"', last_modified=None, digest=None)
+        self.assertEqual(entry.verdicts, {'key': [0, '']})
+        entry.update(etag='"v2"', last_modified=None, digest=None)
+        self.assertEqual(entry.verdicts, {})
+        self.assertEqual(entry.etag, '"v2"')
+
+    def test_key(self):
+        self.assertEqual(
+            ResponseCache.key(ok_search='ok', crit_search='critical'),
+            ResponseCache.key(crit_search='critical', ok_search='ok')
+        )
+        self.assertNotEqual(
+            ResponseCache.key(ok_search='ok'),
+            ResponseCache.key(ok_search='OK')
+        )
+
+
+class ConditionalCheckTests(unittest.TestCase):
+    http_parser = HttpParse
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.server = MockServer(ConditionalHandler)
+        self.server.body = 'Status: ok'
+        self.server.etag = '"v1"'
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.path)
+
+    def check(self, ok_msg='Everything is ok.', **kwargs):
+        return self.http_parser(
+            hostname='127.0.0.1', port=self.server.port, uri='/',
+            cache=ResponseCache(self.path)
+        ).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg=ok_msg, warn_msg='', crit_msg='', unknown_msg='',
+            timeout=5, case_sensitive=False, **kwargs
+        )
+
+    def test_not_modified(self):
+        first = self.check()
+        self.assertEqual(first.get_message(), 'OK - Everything is ok.')
+        self.assertNotIn('If-None-Match', self.server.requests[0])
+        with mock.patch.object(self.http_parser, '_evaluate') as evaluate:
+            second = self.check()
+
+        evaluate.assert_not_called()
+        self.assertEqual(self.server.requests[1]['If-None-Match'], '"v1"')
+        self.assertEqual(second.get_code(), first.get_code())
+        self.assertEqual(second.get_message(), first.get_message())
+
+    def test_not_modified_stream(self):
+        first = self.check(stream=True)
+        with mock.patch.object(self.http_parser, '_evaluate') as evaluate:
+            second = self.check(stream=True)
+
+        evaluate.assert_not_called()
+        self.assertEqual(second.get_message(), first.get_message())
+
+    def test_modified(self):
+        self.check()
+        self.server.body = 'Status: critical'
+        self.server.etag = '"v2"'
+        nagios = self.check()
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertEqual(self.server.requests[1]['If-None-Match'], '"v1"')
+
+    def test_same_digest(self):
+        self.server.etag = None
+        first = self.check()
+        with mock.patch.object(self.http_parser, '_evaluate') as evaluate:
+            second = self.check()
+
+        evaluate.assert_not_called()
+        self.assertEqual(second.get_message(), first.get_message())
+
+    def test_different_params(self):
+        self.check()
+        nagios = self.check(ok_msg='All good.')
+        self.assertEqual(nagios.get_message(), 'OK - All good.')
+        self.assertNotIn('If-None-Match', self.server.requests[1])
+
+
+class StdlibConditionalCheckTests(ConditionalCheckTests):
+    http_parser = StdlibHttpParse
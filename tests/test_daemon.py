@@ -0,0 +1,136 @@
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser import client
+from argo_probe_http_parser.daemon import HttpParserDaemon, handle_request
+from argo_probe_http_parser.session import PooledSession
+
+from tests.test_parse import MockResponse
+
+argv = [
+    '-H', 'hostname.com', '-t', '20', '-u', '/api/test.php',
+    '--ok-message', 'Everything is ok.'
+]
+
+
+def mock_response(url, timeout, **kwargs):
+    return MockResponse('OK')
+
+
+class HandleRequestTests(unittest.TestCase):
+    def test_handle_request(self):
+        session = mock.Mock(spec=PooledSession)
+        session.get.side_effect = mock_response
+        self.assertEqual(
+            handle_request({'argv': argv}, session=session),
+            {'code': 0, 'stdout': 'OK - Everything is ok.\n', 'stderr': ''}
+        )
+        session.get.assert_called_with(
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
+        )
+
+    def test_handle_request_help(self):
+        response = handle_request({'argv': ['--help'], 'prog': 'check'})
+        self.assertEqual(response['code'], 0)
+        self.assertTrue(response['stdout'].startswith('usage: check -H'))
+        self.assertEqual(response['stderr'], '')
+
+    def test_handle_request_invalid_arguments(self):
+        response = handle_request({'argv': ['-H', 'hostname.com']})
+        self.assertEqual(response['code'], 2)
+        self.assertEqual(response['stdout'], '')
+        self.assertTrue(response['stderr'].endswith(
+            'check_http_parser: error: the following arguments are '
+            'required: -t/--timeout\n'
+        ))
+
+    def test_handle_request_path_options(self):
+        session = mock.Mock(spec=PooledSession)
+        for option in (
+                ['--cache-dir', '/tmp'], ['--cache=/tmp'],
+                ['--rules', '/etc/shadow']
+        ):
+            response = handle_request({'argv': argv + option}, session=session)
+            self.assertEqual(response['code'], 3)
+            self.assertTrue(response['local'])
+            self.assertIn('is not accepted by http parser daemon',
+                          response['stdout'])
+
+        session.get.assert_not_called()
+
+
+class HttpParserDaemonTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'daemon.sock')
+        self.session = mock.Mock(spec=PooledSession)
+        self.session.get.side_effect = mock_response
+        self.server = HttpParserDaemon(self.path, session=self.session)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.05}
+        )
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        os.rmdir(self.tmpdir)
+
+    def test_request(self):
+        sock = client.connect(self.path)
+        try:
+            response = client.request(sock, argv)
+
+        finally:
+            sock.close()
+
+        self.assertEqual(response, {
+            'code': 0, 'stdout': 'OK - Everything is ok.\n', 'stderr': ''
+        })
+
+    def test_socket_mode(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o660)
+
+    def test_creates_directory(self):
+        path = os.path.join(self.tmpdir, 'run', 'daemon.sock')
+        server = HttpParserDaemon(path, session=self.session, mode=0o600)
+        try:
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+        finally:
+            server.server_close()
+            os.rmdir(os.path.dirname(path))
+
+    def test_already_running(self):
+        with self.assertRaises(RuntimeError):
+            HttpParserDaemon(self.path)
+
+    @mock.patch('argo_probe_http_parser.client.sys.exit')
+    @mock.patch('argo_probe_http_parser.client.sys.stdout')
+    def test_client_main(self, mock_stdout, mock_exit):
+        with mock.patch.dict(os.environ, {client.SOCKET_ENV: self.path}):
+            client.main(argv)
+
+        mock_stdout.write.assert_called_with('OK - Everything is ok.\n')
+        mock_exit.assert_called_with(0)
+
+    @mock.patch('argo_probe_http_parser.cli.main')
+    def test_client_main_without_daemon(self, mock_main):
+        path = os.path.join(self.tmpdir, 'missing.sock')
+        with mock.patch.dict(os.environ, {client.SOCKET_ENV: path}):
+            client.main(argv)
+
+        mock_main.assert_called_once_with(argv)
+
+    @mock.patch('argo_probe_http_parser.cli.main')
+    def test_client_main_path_option(self, mock_main):
+        with mock.patch.dict(os.environ, {client.SOCKET_ENV: self.path}):
+            client.main(argv + ['--cache-dir', self.tmpdir])
+
+        mock_main.assert_called_once_with(argv + ['--cache-dir', self.tmpdir])
+        self.session.get.assert_not_called()
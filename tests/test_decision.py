@@ -0,0 +1,181 @@
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.decision import (
+    Decision, MatchRule, compile_match_rules, decision_rules
+)
+from argo_probe_http_parser.nagios import NagiosResponse
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.test_parse import MockResponse, MockStreamResponse
+
+rules = (
+    'CRITICAL: any ["down", "error"] not "maintenance" => '
+    '{count} down: {lines}',
+    'WARNING: all ["disk", "full"]',
+    'WARNING: any "maintenance" any ["down", "error"] => In maintenance',
+    'OK: not "down"',
+)
+
+
+def found(decision, *patterns):
+    mask = 0
+    for pattern in patterns:
+        mask |= 1 << decision.patterns.index(pattern)
+
+    return mask
+
+
+class MatchRuleTests(unittest.TestCase):
+    def test_parse(self):
+        rule = MatchRule(rules[0])
+        self.assertEqual(rule.severity, NagiosResponse.CRITICAL)
+        self.assertEqual(
+            rule.clauses,
+            [('any', ['down', 'error']), ('not', ['maintenance'])]
+        )
+        self.assertEqual(rule.message, '{count} down: {lines}')
+        rule = MatchRule('warning:all["a \\"b\\""]')
+        self.assertEqual(rule.severity, NagiosResponse.WARNING)
+        self.assertEqual(rule.clauses, [('all', ['a "b"'])])
+        self.assertEqual(rule.message, '')
+
+    def test_invalid(self):
+        for text in (
+                'any "down"', 'BROKEN: any "down"', 'CRITICAL:',
+                'CRITICAL: any down', 'CRITICAL: any []',
+                'CRITICAL: any [1]', 'CRITICAL: any ""',
+                'CRITICAL: any "down" or "error"',
+                'CRITICAL: any "down" => {url}',
+                'CRITICAL: any "down" => {lines'
+        ):
+            self.assertRaises(ValueError, MatchRule, text)
+
+    def test_decision_rules(self):
+        self.assertIsNone(decision_rules(None))
+        self.assertIsNone(decision_rules([]))
+        self.assertEqual(decision_rules('OK: any "a"'), ('OK: any "a"',))
+        self.assertEqual(decision_rules(['OK: any "a"']), ('OK: any "a"',))
+
+
+class DecisionTests(unittest.TestCase):
+    def setUp(self):
+        self.decision = Decision(rules)
+
+    def test_patterns_are_shared(self):
+        self.assertEqual(
+            self.decision.patterns,
+            ['down', 'error', 'maintenance', 'disk', 'full']
+        )
+
+    def test_first_rule_wins(self):
+        decision = self.decision
+        self.assertEqual(decision.decide(found(decision, 'error')), 0)
+        self.assertEqual(
+            decision.decide(found(decision, 'error', 'disk', 'full')), 0
+        )
+        self.assertEqual(
+            decision.decide(found(decision, 'error', 'maintenance')), 2
+        )
+        self.assertEqual(decision.decide(found(decision, 'disk', 'full')), 1)
+        self.assertEqual(decision.decide(found(decision, 'disk')), 3)
+        self.assertEqual(decision.decide(0), 3)
+        self.assertIsNone(Decision(rules[:2]).decide(0))
+
+    def test_evidence(self):
+        decision = self.decision
+        mask = found(decision, 'error', 'maintenance', 'disk')
+        self.assertEqual(
+            decision.patterns[decision.evidence(0, mask)], 'error'
+        )
+        self.assertIsNone(decision.evidence(3, mask))
+
+    def test_cached(self):
+        self.assertIs(compile_match_rules(rules), compile_match_rules(rules))
+        decision = compile_match_rules(rules)
+        with mock.patch.object(
+                decision, '_decide', wraps=decision._decide
+        ) as decide:
+            for _ in range(3):
+                decision.decide(found(decision, 'down'))
+
+        self.assertEqual(decide.call_count, 1)
+
+
+class HttpParseDecisionTests(unittest.TestCase):
+    def check(self, text, match_rules=rules, **kwargs):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            get.return_value = MockResponse(text)
+            return HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+                unknown_msg='No rule holds', timeout=20,
+                case_sensitive=False, match_rules=match_rules, **kwargs
+            )
+
+    def test_critical(self):
+        nagios = self.check(
+            'site-a: up\nsite-b: DOWN\nsite-c: down\nsite-d: error'
+        )
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - 2 down: site-b: DOWN\nsite-c: down\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
+
+    def test_default_message(self):
+        nagios = self.check('disk 1: full\nsite 2: ok')
+        self.assertEqual(
+            nagios.get_message(),
+            'WARNING - disk 1: full\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
+
+    def test_ok(self):
+        nagios = self.check('all fine, no warning or critical')
+        self.assertEqual(nagios.get_message(), 'OK')
+
+    def test_unknown(self):
+        nagios = self.check('site-a: down', match_rules=rules[1:3])
+        self.assertEqual(
+            nagios.get_message(),
+            'UNKNOWN - No rule holds\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
+
+    def test_invalid_rule(self):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            nagios = HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+                timeout=20, case_sensitive=False,
+                match_rules=['CRITICAL any "down"']
+            )
+            get.assert_not_called()
+
+        self.assertEqual(nagios.get_code(), NagiosResponse.UNKNOWN)
+
+    def test_stream_reads_whole_response(self):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            response = MockStreamResponse(
+                ['site-a: down\n', 'site-b: maintenance\n', 'site-c: up\n']
+            )
+            get.return_value = response
+            nagios = HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+                timeout=20, case_sensitive=False, stream=True,
+                match_rules=rules
+            )
+
+        self.assertEqual(response.read, 3)
+        self.assertEqual(
+            nagios.get_message().partition('\n')[0],
+            'WARNING - In maintenance'
+        )
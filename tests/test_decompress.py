@@ -0,0 +1,187 @@
+import gzip
+import tracemalloc
+import unittest
+import zlib
+from unittest import mock
+
+from argo_probe_http_parser.base import brotli, decompress_chunks
+from argo_probe_http_parser.httpclient import StdlibHttpParse
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.server import MockHandler, ServerTestCase
+
+body = b'OK: item1\n' * 1000 + b'WARNING: item2\n'
+
+
+def raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class EncodingHandler(MockHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.path == '/gzip':
+            coding, content = 'gzip', gzip.compress(body)
+
+        elif self.path == '/deflate':
+            coding, content = 'deflate', zlib.compress(body)
+
+        elif self.path == '/bomb':
+            coding, content = 'gzip', gzip.compress(b'\0' * 10 * 1024 * 1024)
+
+        else:
+            coding, content = None, body
+
+        self.send_body(
+            content, headers={'Content-Encoding': coding} if coding else None
+        )
+
+
+class DecompressChunksTests(unittest.TestCase):
+    def decompress(self, data, coding, **kwargs):
+        for size in (1, 7, 1000, len(data)):
+            yield b''.join(
+                decompress_chunks(split(data, size), coding, **kwargs)
+            )
+
+    def test_identity(self):
+        chunks = [b'abc']
+        self.assertIs(decompress_chunks(chunks, None), chunks)
+        self.assertIs(decompress_chunks(chunks, 'identity'), chunks)
+
+    def test_gzip(self):
+        for data in self.decompress(gzip.compress(body), 'gzip'):
+            self.assertEqual(data, body)
+
+    def test_gzip_members(self):
+        compressed = gzip.compress(b'abc') + gzip.compress(b'def') + b'\0\0'
+        for data in self.decompress(compressed, 'gzip'):
+            self.assertEqual(data, b'abcdef')
+
+    def test_deflate(self):
+        for compressed in (zlib.compress(body), raw_deflate(body)):
+            for data in self.decompress(compressed, 'deflate'):
+                self.assertEqual(data, body)
+
+    def test_several_codings(self):
+        compressed = zlib.compress(gzip.compress(body))
+        for data in self.decompress(compressed, 'gzip, deflate'):
+            self.assertEqual(data, body)
+
+    def test_bounded_chunks(self):
+        chunks = decompress_chunks(
+            [gzip.compress(b'\0' * 1024 * 1024)], 'gzip', chunk_size=1024
+        )
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+
+    def test_max_size(self):
+        chunks = decompress_chunks(
+            [gzip.compress(b'\0' * 1024 * 1024)], 'gzip', max_size=1000,
+            chunk_size=100
+        )
+        with self.assertRaises(ValueError) as context:
+            list(chunks)
+
+        self.assertEqual(
+            str(context.exception), 'Decompressed response exceeds 1000 bytes'
+        )
+
+    @unittest.skipUnless(brotli, 'brotli is not installed')
+    def test_brotli(self):
+        for data in self.decompress(brotli.compress(body), 'br'):
+            self.assertEqual(data, body)
+
+    @unittest.skipUnless(brotli, 'brotli is not installed')
+    def test_brotli_bounded_chunks(self):
+        chunks = list(decompress_chunks(
+            [brotli.compress(b'\0' * 1024 * 1024)], 'br',
+            chunk_size=64 * 1024
+        ))
+        self.assertGreater(len(chunks), 8)
+        self.assertTrue(all(len(chunk) <= 128 * 1024 for chunk in chunks))
+
+    def test_bomb_memory(self):
+        data = b'\0' * 16 * 1024 * 1024
+        bombs = {'gzip': gzip.compress(data, compresslevel=1)}
+        if brotli:
+            bombs['br'] = brotli.compress(data, quality=1)
+
+        del data
+        for coding, compressed in bombs.items():
+            tracemalloc.start()
+            try:
+                with self.assertRaises(ValueError):
+                    list(decompress_chunks(
+                        [compressed], coding, max_size=1024 * 1024
+                    ))
+
+                peak = tracemalloc.get_traced_memory()[1]
+
+            finally:
+                tracemalloc.stop()
+
+            self.assertLess(peak, 4 * 1024 * 1024, coding)
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, decompress_chunks, [b'abc'], 'compress')
+
+
+class DecompressedCheckTests(ServerTestCase):
+    handler = EncodingHandler
+    http_parser = HttpParse
+
+    def check(self, uri, **kwargs):
+        return self.http_parser(
+            hostname='127.0.0.1', port=self.port, uri=uri
+        ).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=5,
+            case_sensitive=False, **kwargs
+        )
+
+    def test_compressed(self):
+        for uri in ('/plain', '/gzip', '/deflate'):
+            for stream in (False, True):
+                nagios = self.check(uri, stream=stream, chunk_size=100)
+                self.assertIn(
+                    'gzip', self.server.requests[-1]['Accept-Encoding']
+                )
+                self.assertEqual(nagios.get_code(), 1, uri)
+                self.assertEqual(
+                    nagios.get_message(),
+                    'WARNING - WARNING: item2\nFor more info check URL: '
+                    'http://127.0.0.1:{}{}'.format(self.port, uri)
+                )
+
+    def test_max_decompressed(self):
+        nagios = self.check('/bomb', max_decompressed=1024 * 1024)
+        self.assertEqual(nagios.get_code(), 3)
+        self.assertEqual(
+            nagios.get_message(),
+            'UNKNOWN - Decompressed response exceeds 1048576 bytes'
+        )
+
+    def test_default_max_decompressed(self):
+        with mock.patch(
+                'argo_probe_http_parser.base.MAX_DECOMPRESSED', 1024 * 1024
+        ):
+            nagios = self.check('/bomb')
+
+        self.assertEqual(nagios.get_code(), 3)
+        self.assertEqual(
+            nagios.get_message(),
+            'UNKNOWN - Decompressed response exceeds 1048576 bytes'
+        )
+
+    def test_max_decompressed_not_reached(self):
+        nagios = self.check('/gzip', max_decompressed=len(body))
+        self.assertEqual(nagios.get_code(), 1)
+
+
+class StdlibDecompressedCheckTests(DecompressedCheckTests):
+    http_parser = StdlibHttpParse
@@ -0,0 +1,171 @@
+import random
+import unittest
+
+from argo_probe_http_parser.base import bounded_lines
+from argo_probe_http_parser.evaluate import CRITICAL, OK, WARNING, Evaluation
+
+from tests.test_parse import html_response
+
+
+def evaluate(text, searches, chunk_size=None, **kwargs):
+    evaluation = Evaluation(searches, collect=True, **kwargs)
+    chunk_size = chunk_size or len(text) or 1
+    for i in range(0, len(text), chunk_size):
+        evaluation.feed(text[i:i + chunk_size])
+
+    evaluation.close()
+    return evaluation
+
+
+def split_lines(evaluation, search, case_sensitive=False):
+    if case_sensitive:
+        return [line for line in evaluation.lines if search in line]
+
+    return [line for line in evaluation.lines if search.lower() in line.lower()]
+
+
+class EvaluationLinesTests(unittest.TestCase):
+    def assertSameLines(self, text, searches, **kwargs):
+        for chunk_size in (None, 1, 2, 3, 7, 64):
+            evaluation = evaluate(text, searches, chunk_size, **kwargs)
+            indexes = range(len(searches))
+            if kwargs.get('early_exit') and evaluation.match == CRITICAL:
+                indexes = [CRITICAL]
+
+            for index in indexes:
+                search = searches[index]
+                expected = split_lines(
+                    evaluation, search,
+                    case_sensitive=kwargs.get('case_sensitive', False)
+                )
+                self.assertEqual(
+                    evaluation.matched_lines(index), expected,
+                    (search, chunk_size)
+                )
+                self.assertEqual(
+                    evaluation.matched_count(index), len(expected),
+                    (search, chunk_size)
+                )
+
+    def test_plain(self):
+        self.assertSameLines(
+            'WARNING: item1,item2\nCRITICAL:item3, item4\nOK:item5\n'
+            'critical critical: item6\ncritical',
+            ['critical', 'warning', 'ok']
+        )
+
+    def test_case_sensitive(self):
+        self.assertSameLines(
+            'WARNING: item1\nCRITICAL:item3\ncritical: item4\nOK:item5',
+            ['CRITICAL', 'WARNING', 'OK'], case_sensitive=True
+        )
+
+    def test_html(self):
+        self.assertSameLines(html_response, ['fail', 'warn', 'ok'])
+
+    def test_non_ascii(self):
+        self.assertSameLines(
+            'État: ÉCHEC\nÄrger: Warnung\nstatus: échec, ok\nÜBER OK',
+            ['échec', 'ärger', 'über ok']
+        )
+
+    def test_bytes(self):
+        self.assertSameLines(
+            b'WARNING: item1\nCRITICAL:item3\nok\nOK:item5',
+            [b'critical', b'warning', b'ok']
+        )
+
+    def test_overlapping_searches(self):
+        self.assertSameLines(
+            'not ok\nokay\nbroken\nok', ['not ok', 'broken', 'ok']
+        )
+
+    def test_random(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            text = ''.join(
+                rng.choice(['ab', 'ba', 'a', '\n', '<b>', '|', 'x'])
+                for _ in range(40)
+            )
+            self.assertSameLines(text, ['ab', 'ba', 'aa'])
+            self.assertSameLines(text, ['ab', 'ba', 'aa'], early_exit=True)
+
+    def test_max_lines(self):
+        evaluation = evaluate(
+            'critical 1\ncritical 2\ncritical 3\n',
+            ['critical', 'warning', 'ok'], max_lines=2
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertEqual(
+            evaluation.matched_lines(CRITICAL), ['critical 1', 'critical 2']
+        )
+        self.assertEqual(evaluation.matched_count(CRITICAL), 3)
+
+    def test_max_lines_inexact(self):
+        for chunk_size in (None, 7):
+            evaluation = evaluate(
+                'warning 0\ncritical 1\nwarning 2\ncritical 2\n'
+                'critical 3\ncritical 4\n', ['critical', 'warning', 'ok'],
+                chunk_size=chunk_size, max_lines=2, exact_counts=False
+            )
+            self.assertEqual(
+                evaluation.matched_lines(CRITICAL),
+                ['critical 1', 'critical 2']
+            )
+            self.assertEqual(evaluation.matched_count(CRITICAL), 3)
+            self.assertTrue(evaluation.partial_count(CRITICAL))
+            self.assertFalse(evaluation.partial_count(WARNING))
+
+    def test_early_exit(self):
+        evaluation = evaluate(
+            'warning 1\nok\ncritical 2\nwarning 3\n',
+            ['critical', 'warning', 'ok'], chunk_size=4, early_exit=True
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertEqual(evaluation.matched_lines(CRITICAL), ['critical 2'])
+        self.assertEqual(evaluation.matched_lines(WARNING), ['warning 1'])
+        self.assertEqual(evaluation.matched_lines(OK), ['ok'])
+
+    def test_not_collected(self):
+        evaluation = Evaluation(['critical', 'warning', 'ok'])
+        evaluation.feed('critical\n')
+        evaluation.close()
+        self.assertIsNone(evaluation.matched_lines(CRITICAL))
+        self.assertIsNone(evaluation.matched_count(CRITICAL))
+
+    def test_folding_changes_length(self):
+        evaluation = evaluate(
+            'İstanbul: critical\nok', ['critical', 'warning', 'ok']
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertIsNone(evaluation.matched_lines(CRITICAL))
+
+
+class BoundedLinesTests(unittest.TestCase):
+    def test_unbounded(self):
+        self.assertEqual(
+            bounded_lines(iter([' a ', 'b'])), (['a', 'b'], False)
+        )
+
+    def test_max_lines(self):
+        self.assertEqual(
+            bounded_lines(iter(['a', 'b', 'c']), max_lines=2),
+            (['a', 'b'], True)
+        )
+        self.assertEqual(
+            bounded_lines(iter(['a', 'b']), max_lines=2), (['a', 'b'], False)
+        )
+
+    def test_max_bytes(self):
+        self.assertEqual(
+            bounded_lines(iter(['ab', 'cd', 'ef']), max_bytes=5),
+            (['ab', 'cd'], True)
+        )
+        self.assertEqual(
+            bounded_lines(iter(['abčd', 'ef']), max_bytes=3), (['ab'], True)
+        )
+
+    def test_stops_reading(self):
+        lines = iter(['a', 'b', 'c', 'd'])
+        bounded_lines(lines, max_lines=1)
+        self.assertEqual(list(lines), ['c', 'd'])
@@ -0,0 +1,138 @@
+import re
+
+from argo_probe_http_parser.httpclient import StdlibHttpParse
+
+from tests.server import MockHandler, MockServer, ServerTestCase
+from tests.test_parse import html_response
+
+bodies = {
+    '/ok': ('text/plain', 'OK'),
+    '/mixed': ('text/plain', 'WARNING: item1,item2\nCRITICAL:item3\nOK:item5'),
+    '/html': ('text/html; charset=utf-8', html_response),
+    '/latin': ('text/plain', 'CRITICAL: čvor1'),
+}
+
+
+class BodyHandler(MockHandler):
+    def do_GET(self):
+        if self.path == '/redirect':
+            self.send_body(b'', status=302, headers={'Location': '/html'})
+            return
+
+        content_type, body = bodies[self.path]
+        self.send_body(body, content_type=content_type)
+
+
+class StdlibHttpParseTests(ServerTestCase):
+    handler = BodyHandler
+
+    def check(self, uri, **kwargs):
+        params = dict(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+            unknown_msg='', timeout=5, case_sensitive=False
+        )
+        params.update(kwargs)
+        return StdlibHttpParse(
+            hostname='127.0.0.1', port=self.port, uri=uri
+        ).check(**params)
+
+    def url(self, uri):
+        return 'http://127.0.0.1:{}{}'.format(self.port, uri)
+
+    def test_check_ok(self):
+        nagios = self.check('/ok')
+        self.assertEqual(nagios.get_code(), 0)
+        self.assertEqual(nagios.get_message(), 'OK - Everything is ok.')
+
+    def test_check_critical(self):
+        nagios = self.check('/mixed')
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - CRITICAL:item3\n'
+            'For more info check URL: {}'.format(self.url('/mixed'))
+        )
+
+    def test_check_stream_match_bytes(self):
+        nagios = self.check(
+            '/html', crit_search='ERROR', case_sensitive=True, stream=True,
+            chunk_size=16, match_bytes=True
+        )
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - ERROR [ last published 4726 days ago: 2010-04-12 ]\n'
+            'For more info check URL: {}'.format(self.url('/html'))
+        )
+
+    def test_check_follows_redirect(self):
+        nagios = self.check('/redirect', crit_search='error')
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertTrue(nagios.get_message().endswith(
+            'For more info check URL: {}'.format(self.url('/redirect'))
+        ))
+
+    def test_check_declared_encoding(self):
+        nagios = self.check('/latin', crit_search='čvor')
+        self.assertEqual(nagios.get_code(), 3)
+        nagios = self.check('/latin', crit_search='čvor', encoding='utf-8')
+        self.assertEqual(nagios.get_code(), 2)
+
+    def test_check_connection_refused(self):
+        server = MockServer(BodyHandler)
+        port = server.port
+        server.server_close()
+        nagios = StdlibHttpParse(
+            hostname='127.0.0.1', port=port, uri='/ok'
+        ).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=5,
+            case_sensitive=False
+        )
+        self.assertEqual(nagios.get_code(), 2)
+
+    def assertPerfdata(self, nagios, labels):
+        first = nagios.get_message().split('\n')[0]
+        text, perfdata = first.split(' | ')
+        values = dict(
+            re.match(r'^([^=]+)=([0-9.]+)', item).groups()
+            for item in perfdata.split()
+        )
+        self.assertEqual(list(values), labels)
+        return text, values
+
+    def test_check_perfdata(self):
+        nagios = self.check('/mixed', perfdata=True)
+        self.assertEqual(nagios.get_code(), 2)
+        text, values = self.assertPerfdata(nagios, [
+            'dns', 'connect', 'ttfb', 'download', 'decode', 'strip', 'match',
+            'time', 'size', 'lines'
+        ])
+        self.assertEqual(text, 'CRITICAL - CRITICAL:item3')
+        self.assertEqual(values['size'], str(len(bodies['/mixed'][1])))
+        self.assertEqual(values['lines'], '1')
+        self.assertTrue(
+            nagios.get_message().endswith(
+                '\nFor more info check URL: {}'.format(self.url('/mixed'))
+            )
+        )
+
+    def test_check_perfdata_stream(self):
+        nagios = self.check('/html', perfdata=True, stream=True)
+        self.assertPerfdata(nagios, [
+            'dns', 'connect', 'ttfb', 'download', 'strip', 'match', 'time',
+            'size', 'lines'
+        ])
+
+    def test_check_match_rules(self):
+        nagios = self.check('/mixed', match_bytes=True, match_rules=[
+            'CRITICAL: all ["critical", "item4"]',
+            'WARNING: any "item2" not "item9" => {count} warning: {lines}',
+            'OK: any "ok"'
+        ])
+        self.assertEqual(
+            nagios.get_message(),
+            'WARNING - 1 warning: WARNING: item1,item2\n'
+            'For more info check URL: {}'.format(self.url('/mixed'))
+        )
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = (
+    'requests', 'urllib3', 'brotli', 'mmap', 'tempfile', 'zlib',
+    'argo_probe_http_parser.base', 'argo_probe_http_parser.decision',
+    'argo_probe_http_parser.evaluate', 'argo_probe_http_parser.jsonrules',
+    'argo_probe_http_parser.regex', 'argo_probe_http_parser.spool'
+)
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable] + list(args), cwd=ROOT, stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE, universal_newlines=True
+    )
+
+
+def imports_requests(statement):
+    result = run_python(
+        '-c', "{}\nimport sys\nprint('requests' in sys.modules)".format(
+            statement
+        )
+    )
+    return result.stdout.strip().splitlines()[-1] == 'True'
+
+
+def imported(statement, modules):
+    result = run_python('-c', (
+        'import sys\n'
+        'loaded = set(sys.modules)\n'
+        '{}\n'
+        'print([m for m in {!r} if m in set(sys.modules) - loaded])'
+    ).format(statement, modules))
+    return result.stdout.strip().splitlines()[-1]
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_cli_does_not_import_requests(self):
+        self.assertFalse(imports_requests('import argo_probe_http_parser.cli'))
+
+    def test_cli_help_does_not_import_requests(self):
+        self.assertFalse(imports_requests(
+            'from argo_probe_http_parser.cli import main\n'
+            'try:\n'
+            '    main(["--help"])\n'
+            'except SystemExit:\n'
+            '    pass'
+        ))
+
+    def test_client_does_not_import_requests(self):
+        self.assertFalse(
+            imports_requests('import argo_probe_http_parser.client')
+        )
+
+    def test_http_client_transport_does_not_import_requests(self):
+        self.assertFalse(imports_requests(
+            'from argo_probe_http_parser.cli import build_parser, run\n'
+            'args = build_parser().parse_args(\n'
+            '    ["-H", "127.0.0.1", "-p", "9", "-t", "1",\n'
+            '     "--transport", "http.client"]\n'
+            ')\n'
+            'run(args)'
+        ))
+
+    def test_requests_transport_imports_requests(self):
+        self.assertTrue(imports_requests('import argo_probe_http_parser.parse'))
+
+    def test_cli_imports_no_heavy_modules(self):
+        for module in [
+            'argo_probe_http_parser.cli', 'argo_probe_http_parser.client'
+        ]:
+            self.assertEqual(
+                imported('import {}'.format(module), HEAVY_MODULES), '[]',
+                module
+            )
@@ -0,0 +1,209 @@
+import json
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.evaluate import CRITICAL, OK, WARNING
+from argo_probe_http_parser.jsonrules import (
+    WILDCARD, JsonEvaluation, JsonRule, format_path, json_levels, parse_path
+)
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.test_parse import MockStreamResponse
+from tests.test_strip import best_time
+
+document = json.dumps({
+    'status': 'WARNING',
+    'items': [
+        {'name': 'site "a"', 'state': 'up', 'days': 2},
+        {'name': 'site-b', 'state': 'down', 'days': 12.5e1},
+        {'name': 'site-c', 'nested': [1, [2, {'ok': True}]], 'days': None}
+    ],
+    'total': -3e-2
+}, indent=2)
+
+levels = (
+    ('$.items[*].state in ["down", "error"]',),
+    ('$.status == "warning"', '$.items[*].days > 100'),
+    ('$.items[2].nested[1][1].ok == true',)
+)
+
+
+def evaluate(text, levels, chunk_size=None, **kwargs):
+    evaluation = JsonEvaluation(levels, **kwargs)
+    chunk_size = chunk_size or len(text) or 1
+    for i in range(0, len(text), chunk_size):
+        evaluation.feed(text[i:i + chunk_size])
+        if evaluation.complete:
+            break
+
+    evaluation.close()
+    return evaluation
+
+
+class JsonRuleTests(unittest.TestCase):
+    def test_parse_path(self):
+        self.assertEqual(parse_path('$'), ())
+        self.assertEqual(
+            parse_path('$.items[*].state'), ('items', WILDCARD, 'state')
+        )
+        self.assertEqual(
+            parse_path('$["a b"][0].*[\'c\']'), ('a b', 0, WILDCARD, 'c')
+        )
+        self.assertRaises(ValueError, parse_path, 'items')
+        self.assertRaises(ValueError, parse_path, '$.items[')
+
+    def test_format_path(self):
+        self.assertEqual(
+            format_path(('items', 1, 'a b')), '$.items[1]["a b"]'
+        )
+
+    def test_rule(self):
+        rule = JsonRule('$.items[*].state not in ["up"]')
+        self.assertTrue(rule.matches(('items', 3, 'state'), 'Down'))
+        self.assertFalse(rule.matches(('items', 3, 'state'), 'UP'))
+        self.assertFalse(rule.matches(('items', 'state'), 'down'))
+        self.assertFalse(JsonRule('$.n > 1').matches(('n',), 'text'))
+        self.assertFalse(
+            JsonRule('$.s == "OK"', case_sensitive=True).matches(('s',), 'ok')
+        )
+
+    def test_invalid_rule(self):
+        for text in (
+                '$.status', '$.status == OK', '$.status in "OK"',
+                'status == "OK"'
+        ):
+            self.assertRaises(ValueError, JsonRule, text)
+
+    def test_json_levels(self):
+        self.assertIsNone(json_levels(None, None, None))
+        self.assertEqual(
+            json_levels('$ == 1', None, ['$ == 2', '$ == 3']),
+            (('$ == 1',), (), ('$ == 2', '$ == 3'))
+        )
+
+
+class JsonEvaluationTests(unittest.TestCase):
+    def test_same_for_chunks(self):
+        for chunk_size in (1, 2, 3, 7, 64, None):
+            evaluation = evaluate(document, levels, chunk_size, stop=0)
+            self.assertEqual(evaluation.match, CRITICAL, chunk_size)
+            self.assertEqual(
+                evaluation.matched_lines(CRITICAL),
+                ['$.items[1].state: "down"']
+            )
+            self.assertEqual(evaluation.matched_lines(WARNING), [
+                '$.status: "WARNING"', '$.items[1].days: 125.0'
+            ])
+            self.assertEqual(
+                evaluation.matched_lines(OK),
+                ['$.items[2].nested[1][1].ok: true']
+            )
+
+    def test_stops_when_critical_found(self):
+        evaluation = JsonEvaluation(levels)
+        evaluation.feed(document)
+        self.assertTrue(evaluation.complete)
+        self.assertLess(evaluation._offset, document.index('site-c'))
+
+    def test_stops_when_exact_paths_seen(self):
+        evaluation = JsonEvaluation(
+            (('$.status == "CRITICAL"',), (), ('$.status == "WARNING"',))
+        )
+        evaluation.feed('{"status": "WARNING", "items": [')
+        self.assertTrue(evaluation.complete)
+        self.assertEqual(evaluation.match, OK)
+
+    def test_scalar_document(self):
+        evaluation = evaluate('42', (('$ > 40',), (), ()), chunk_size=1)
+        self.assertEqual(evaluation.match, CRITICAL)
+
+    def test_long_strings_across_chunks(self):
+        text = json.dumps({
+            'log': 'a "quoted" \\ line\n' * 4, 'skip': {'x': ['b' * 50]},
+            'status': 'OK'
+        })
+        for chunk_size in (1, 2, 3, 7):
+            evaluation = evaluate(
+                text, (('$.status == "OK"', '$.log == "a"'), (), ()),
+                chunk_size
+            )
+            self.assertEqual(evaluation.match, CRITICAL, chunk_size)
+
+    def test_long_strings_scale_linearly(self):
+        def document(size):
+            return json.dumps({
+                'log': 'a"' * size, 'skip': {'x': ['b' * size]},
+                'status': 'OK'
+            })
+
+        def run(text):
+            evaluation = evaluate(
+                text, (('$.status == "OK"',), (), ()), 64 * 1024
+            )
+            self.assertEqual(evaluation.match, CRITICAL)
+
+        small, large = document(128 * 1024), document(1024 * 1024)
+        self.assertLess(best_time(run, large), best_time(run, small) * 24)
+
+    def test_invalid(self):
+        for text in (
+                '{"a": 1,]', '[1, 2', '{"a": tru}', '{"a": 1} x', '"abc',
+                '{"a": "b', '{"a": [{"b": "c'
+        ):
+            self.assertRaises(
+                ValueError, evaluate, text, (('$.b == 1',), (), ())
+            )
+
+
+class HttpParseJsonTests(unittest.TestCase):
+    def check(self, chunks, **kwargs):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            response = MockStreamResponse(chunks)
+            get.return_value = response
+            nagios = HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+                unknown_msg='', timeout=20, case_sensitive=False, **kwargs
+            )
+            get.assert_called_once_with(
+                'http://hostname.com:80/status', timeout=20, stream=True
+            )
+            return nagios, response
+
+    def test_critical(self):
+        chunks = [document[i:i + 16] for i in range(0, len(document), 16)]
+        nagios, response = self.check(
+            chunks, crit_json=list(levels[CRITICAL]),
+            warn_json=list(levels[WARNING]), ok_json=list(levels[OK])
+        )
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - $.items[1].state: "down"\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
+        self.assertLess(response.read, len(chunks))
+        self.assertTrue(response.closed)
+
+    def test_ok(self):
+        nagios, response = self.check(
+            [document], crit_json='$.status == "CRITICAL"',
+            ok_json='$.status == "WARNING"'
+        )
+        self.assertEqual(nagios.get_message(), 'OK - Everything is ok.')
+
+    def test_text_is_not_searched(self):
+        nagios, response = self.check(
+            ['{"message": "critical"}'], crit_json='$.status == "CRITICAL"'
+        )
+        self.assertEqual(nagios.get_code(), 3)
+
+    def test_invalid_json(self):
+        nagios, response = self.check(
+            ['<html>critical</html>'], crit_json='$.status == "CRITICAL"'
+        )
+        self.assertEqual(
+            nagios.get_message(),
+            'UNKNOWN - Invalid JSON in response at offset 0'
+        )
@@ -0,0 +1,132 @@
+import unittest
+
+from argo_probe_http_parser.base import ReadLimit
+from argo_probe_http_parser.httpclient import StdlibHttpParse
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.server import MockHandler, ServerTestCase
+
+body = b'OK: item1\n' * 1000 + b'CRITICAL: item2\n'
+
+
+class LimitHandler(MockHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.path == '/endless':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            line = b'OK: item\n' * 100
+            try:
+                while True:
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+
+            except OSError:
+                return
+
+        range_header = self.headers.get('Range')
+        if self.path == '/range' and range_header:
+            end = int(range_header.split('-')[1])
+            self.send_body(body[:end + 1], status=206, headers={
+                'Content-Range': 'bytes 0-{}/{}'.format(end, len(body))
+            })
+
+        else:
+            self.send_body(body)
+
+
+class ReadLimitTests(unittest.TestCase):
+    def read(self, chunks, **kwargs):
+        limit = ReadLimit(**kwargs)
+        return b''.join(limit.apply(chunks)), limit.reached
+
+    def test_max_bytes(self):
+        self.assertEqual(
+            self.read([b'abcdef', b'ghijkl'], max_bytes=10),
+            (b'abcdefghij', 'bytes')
+        )
+        self.assertEqual(
+            self.read([b'abcdef', b'ghijkl'], max_bytes=12),
+            (b'abcdefghijkl', None)
+        )
+        self.assertEqual(
+            self.read([b'abcdef', b'ghijkl', b'm'], max_bytes=12),
+            (b'abcdefghijkl', 'bytes')
+        )
+
+    def test_max_lines(self):
+        self.assertEqual(
+            self.read([b'a\nb', b'\nc\n'], max_lines=2), (b'a\nb\n', 'lines')
+        )
+        self.assertEqual(
+            self.read([b'a\nb', b'\n'], max_lines=2), (b'a\nb\n', None)
+        )
+        self.assertEqual(
+            self.read([b'a\nb\nc\nd'], max_lines=1, max_bytes=3),
+            (b'a\n', 'lines')
+        )
+
+    def test_content_range(self):
+        limit = ReadLimit(max_bytes=100)
+        self.assertEqual(limit.headers(), {'Range': 'bytes=0-99'})
+        limit.content_range('bytes 0-99/100')
+        self.assertIsNone(limit.reached)
+        limit.content_range('bytes 0-99/*')
+        self.assertIsNone(limit.reached)
+        limit.content_range('bytes 0-99/1000')
+        self.assertEqual(limit.reached, 'bytes')
+        self.assertEqual(limit.describe(), 'Response truncated to 100 bytes')
+
+
+class LimitedCheckTests(ServerTestCase):
+    handler = LimitHandler
+    http_parser = HttpParse
+
+    def check(self, uri, **kwargs):
+        return self.http_parser(
+            hostname='127.0.0.1', port=self.port, uri=uri
+        ).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+            unknown_msg='', timeout=5, case_sensitive=False, **kwargs
+        )
+
+    def test_not_reached(self):
+        nagios = self.check('/body', max_bytes=len(body))
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertNotIn('truncated', nagios.get_message())
+
+    def test_max_bytes(self):
+        nagios = self.check('/body', max_bytes=1000)
+        self.assertEqual(
+            nagios.get_message(),
+            'OK - Everything is ok.\nResponse truncated to 1000 bytes'
+        )
+        self.assertNotIn('Range', self.server.requests[-1])
+
+    def test_max_lines(self):
+        nagios = self.check('/body', max_lines=1000, stream=True)
+        self.assertEqual(
+            nagios.get_message(),
+            'OK - Everything is ok.\nResponse truncated to 1000 lines'
+        )
+
+    def test_endless(self):
+        nagios = self.check('/endless', max_bytes=100000)
+        self.assertEqual(
+            nagios.get_message(),
+            'OK - Everything is ok.\nResponse truncated to 100000 bytes'
+        )
+
+    def test_range(self):
+        nagios = self.check('/range', max_bytes=1000, range_request=True)
+        self.assertEqual(self.server.requests[-1]['Range'], 'bytes=0-999')
+        self.assertEqual(
+            nagios.get_message(),
+            'OK - Everything is ok.\nResponse truncated to 1000 bytes'
+        )
+
+
+class StdlibLimitedCheckTests(LimitedCheckTests):
+    http_parser = StdlibHttpParse
@@ -0,0 +1,139 @@
+import random
+import unittest
+
+from argo_probe_http_parser.matcher import (
+    LiteralMatcher, Matcher, compile_matcher
+)
+
+
+class MatcherTests(unittest.TestCase):
+    matcher_class = Matcher
+
+    def setUp(self):
+        self.matcher = self.matcher_class(['critical', 'warning', 'ok'])
+
+    def test_search_none_found(self):
+        self.assertEqual(self.matcher.search('Some strange text.'), 0)
+        self.assertIsNone(self.matcher.first(0))
+
+    def test_search_all_found(self):
+        found = self.matcher.search('ok: 1, warning: 2, critical: 3')
+        self.assertEqual(found, 0b111)
+        self.assertEqual(self.matcher.first(found), 0)
+
+    def test_search_lower_priority_found(self):
+        found = self.matcher.search('WARNING: item1\nOK: item2'.lower())
+        self.assertEqual(found, 0b110)
+        self.assertEqual(self.matcher.first(found), 1)
+
+    def test_search_overlapping_patterns(self):
+        matcher = self.matcher_class(['he', 'she', 'his', 'hers'])
+        self.assertEqual(matcher.search('ushers'), 0b1011)
+        self.assertEqual(matcher.search('ahishe'), 0b0111)
+
+    def test_search_pattern_within_pattern(self):
+        matcher = self.matcher_class(['error', 'rr', 'x'])
+        self.assertEqual(matcher.search('terror'), 0b011)
+
+    def test_search_empty_pattern(self):
+        matcher = self.matcher_class(['critical', ''])
+        self.assertEqual(matcher.search(''), 0b10)
+
+    def test_search_stop(self):
+        scanner = self.matcher.scanner(stop=1)
+        scanner.feed('critical ok')
+        self.assertTrue(scanner.done)
+        self.assertEqual(scanner.found, 0b001)
+
+    def test_search_across_chunks(self):
+        scanner = self.matcher.scanner()
+        for chunk in ['status: cri', 'ti', 'cal, wa', 'rning']:
+            scanner.feed(chunk)
+
+        self.assertEqual(scanner.found, 0b011)
+        self.assertFalse(scanner.done)
+
+    def test_search_many_patterns(self):
+        patterns = ['pattern{}'.format(i) for i in range(200)]
+        matcher = self.matcher_class(patterns)
+        found = matcher.search('pattern150 and pattern7')
+        self.assertEqual(found, (1 << 150) | (1 << 7) | (1 << 15) | (1 << 1))
+        self.assertEqual(matcher.first(found), 1)
+
+    def test_search_case_insensitive(self):
+        matcher = self.matcher_class(['Critical', 'Échec', 'ok'], case_sensitive=False)
+        self.assertEqual(matcher.search('CRITICAL'), 0b001)
+        self.assertEqual(matcher.search('statut: échec'), 0b010)
+        self.assertEqual(matcher.search('STATUT: ÉCHEC, Ok'), 0b110)
+        self.assertEqual(matcher.search('ECHEC'), 0)
+        self.assertEqual(self.matcher.search('CRITICAL'), 0)
+
+    def test_search_case_insensitive_bytes(self):
+        matcher = self.matcher_class([b'critical', b'ok'], case_sensitive=False)
+        self.assertEqual(matcher.search(b'CRITICAL, Ok'), 0b11)
+
+    def test_search_case_insensitive_special_folding(self):
+        matcher = self.matcher_class(['ok', '\u03c3\u03b1\u03c2'], case_sensitive=False)
+        self.assertEqual(matcher.search('O\u212a'), 0b01)
+        self.assertEqual(matcher.search('\u03a3\u0391\u03a3'), 0b10)
+        self.assertEqual(matcher.search('\u03c3\u03b1\u03c3'), 0b10)
+        self.assertEqual(self.matcher_class(['i'], False).search('\u0130'), 0b1)
+        self.assertEqual(
+            self.matcher_class(['x', 'i\u0307'], False).search('\u0130'), 0b10
+        )
+
+
+class LiteralMatcherTests(MatcherTests):
+    matcher_class = LiteralMatcher
+
+    def test_compile_matcher(self):
+        self.assertIsInstance(
+            compile_matcher(('critical', 'warning', 'ok')), LiteralMatcher
+        )
+        self.assertIsInstance(
+            compile_matcher(tuple('abcdefgh')), Matcher
+        )
+
+    def test_search_prefix_patterns(self):
+        matcher = LiteralMatcher(['crit', 'critical', 'cri', 'x'])
+        self.assertEqual(matcher.search('critical'), 0b0111)
+        self.assertEqual(matcher.search('crit'), 0b0101)
+
+    def test_search_across_chunks_overlapping(self):
+        scanner = LiteralMatcher(['abcab', 'cabd', 'b']).scanner()
+        found = []
+        for chunk in ['xxab', 'c', 'a', 'bd']:
+            scanner.feed(chunk)
+            found.append(scanner.last_found)
+
+        self.assertEqual(found, [0b100, 0, 0, 0b111])
+
+    def test_same_as_automaton(self):
+        rand = random.Random(5081)
+        for _ in range(300):
+            patterns = [
+                ''.join(rand.choice('abA') for _ in range(rand.randint(0, 4)))
+                for _ in range(rand.randint(1, 4))
+            ]
+            text = ''.join(rand.choice('abAB') for _ in range(40))
+            for case_sensitive in (True, False):
+                literals = sum(
+                    1 << index for index, pattern in enumerate(patterns)
+                    if pattern
+                )
+                automaton = Matcher(patterns, case_sensitive).scanner()
+                literal = LiteralMatcher(patterns, case_sensitive).scanner()
+                pos = 0
+                while pos < len(text):
+                    size = rand.randint(1, 6)
+                    chunk = text[pos:pos + size]
+                    pos += size
+                    self.assertEqual(
+                        literal.feed(chunk), automaton.feed(chunk),
+                        (patterns, text)
+                    )
+                    self.assertEqual(
+                        literal.last_found,
+                        automaton.last_found & literals,
+                        (patterns, text)
+                    )
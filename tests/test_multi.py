@@ -0,0 +1,112 @@
+import time
+import unittest
+
+from argo_probe_http_parser.cli import _http_parser, _targets, build_parser
+from argo_probe_http_parser.multi import MultiHttpParse, aggregate
+from argo_probe_http_parser.nagios import NagiosResponse
+from argo_probe_http_parser.parse import HttpParse
+
+from tests.server import MockHandler, ServerTestCase
+
+DELAY = 0.3
+bodies = {
+    '/ok': b'Status: OK',
+    '/warning': b'Status: WARNING',
+    '/critical': b'Status: CRITICAL'
+}
+
+
+class DelayedHandler(MockHandler):
+    def do_GET(self):
+        time.sleep(DELAY)
+        self.send_body(bodies.get(self.path, b'nothing'))
+
+
+class AggregateTests(unittest.TestCase):
+    def test_worst_status(self):
+        self.assertEqual(aggregate([0, 1, 0]), NagiosResponse.WARNING)
+        self.assertEqual(aggregate([0, 3, 1]), NagiosResponse.UNKNOWN)
+        self.assertEqual(aggregate([2, 3, 1]), NagiosResponse.CRITICAL)
+
+    def test_quorum(self):
+        self.assertEqual(aggregate([0, 2, 0], quorum=2), NagiosResponse.OK)
+        self.assertEqual(
+            aggregate([0, 2, 1], quorum=2), NagiosResponse.WARNING
+        )
+        self.assertEqual(
+            aggregate([0, 2, 1], quorum=1), NagiosResponse.CRITICAL
+        )
+        self.assertEqual(aggregate([0, 2, 1], quorum=3), NagiosResponse.OK)
+        self.assertEqual(
+            aggregate([1, 2, 1], quorum=3), NagiosResponse.WARNING
+        )
+        self.assertEqual(aggregate([0, 2], quorum=5), NagiosResponse.OK)
+
+
+class MultiHttpParseTests(ServerTestCase):
+    handler = DelayedHandler
+
+    def check(self, uris, quorum=None, **kwargs):
+        return MultiHttpParse([
+            HttpParse(hostname='127.0.0.1', port=self.port, uri=uri)
+            for uri in uris
+        ], quorum=quorum).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+            unknown_msg='Nothing found', timeout=5, case_sensitive=False,
+            **kwargs
+        )
+
+    def test_worst_status(self):
+        url = f'http://127.0.0.1:{self.port}'
+        start = time.monotonic()
+        nagios = self.check(['/ok', '/critical', '/warning', '/ok'])
+        self.assertLess(time.monotonic() - start, DELAY * 3)
+        self.assertEqual(nagios.get_code(), NagiosResponse.CRITICAL)
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - 4 URLs: 1 CRITICAL, 1 WARNING, 2 OK\n'
+            f'{url}/ok: OK - Everything is ok.\n'
+            f'{url}/critical: CRITICAL - Status: CRITICAL\n'
+            f'{url}/warning: WARNING - Status: WARNING\n'
+            f'{url}/ok: OK - Everything is ok.'
+        )
+
+    def test_quorum(self):
+        nagios = self.check(['/ok', '/unknown', '/ok'], quorum=2)
+        self.assertEqual(nagios.get_code(), NagiosResponse.OK)
+        self.assertTrue(nagios.get_message().startswith(
+            'OK - 3 URLs, quorum 2: 1 UNKNOWN, 2 OK\n'
+        ))
+
+    def test_perfdata(self):
+        nagios = self.check(['/ok', '/ok'], perfdata=True)
+        perfdata = nagios.get_perfdata().split()
+        self.assertEqual(
+            [item.partition('=')[0] for item in perfdata],
+            ['time_1', 'time_2', 'time']
+        )
+
+
+class TargetsTests(unittest.TestCase):
+    def parse(self, *argv):
+        return build_parser().parse_args(['-H', 'a', '-t', '5'] + list(argv))
+
+    def test_single(self):
+        args = self.parse('-u', '/status')
+        self.assertEqual(_targets(args), [('a', 80, '/status')])
+        self.assertIsInstance(_http_parser(args), HttpParse)
+
+    def test_mirrors_and_uris(self):
+        args = self.parse(
+            '-p', '8000', '-u', '/x', '-u', '/y', '--mirror', 'b',
+            '--mirror', 'c:8443', '--quorum', '2'
+        )
+        self.assertEqual(_targets(args), [
+            ('a', 8000, '/x'), ('a', 8000, '/y'), ('b', 8000, '/x'),
+            ('b', 8000, '/y'), ('c', 8443, '/x'), ('c', 8443, '/y')
+        ])
+        http_parser = _http_parser(args)
+        self.assertIsInstance(http_parser, MultiHttpParse)
+        self.assertEqual(http_parser.quorum, 2)
+        self.assertEqual(len(http_parser.http_parsers), 6)
@@ -52,3 +52,29 @@ class NagiosResponseTests(unittest.TestCase):
         self.nagios.set_unknown()
         self.assertEqual(self.nagios.get_code(), 3)
         self.assertEqual(self.nagios.get_message(), 'UNKNOWN')
+
+    def test_perfdata(self):
+        self.nagios.set_ok('Everything is ok.')
+        self.nagios.add_perfdata('time', 0.25, 's', minimum=0)
+        self.nagios.add_perfdata('size', 1024, 'B')
+        self.nagios.add_perfdata('matched lines', 3, warning=1, critical=5)
+        self.assertEqual(
+            self.nagios.get_perfdata(),
+            "time=0.25s;;;0 size=1024B 'matched lines'=3;1;5"
+        )
+        self.assertEqual(
+            self.nagios.get_message(),
+            "OK - Everything is ok. | time=0.25s;;;0 size=1024B "
+            "'matched lines'=3;1;5"
+        )
+        self.assertEqual(
+            self.nagios.get_message(perfdata=False), 'OK - Everything is ok.'
+        )
+
+    def test_perfdata_multiline_message(self):
+        self.nagios.set_critical('CRITICAL: item1\nFor more info check URL')
+        self.nagios.add_perfdata('time', 0.25, 's')
+        self.assertEqual(
+            self.nagios.get_message(),
+            'CRITICAL - CRITICAL: item1 | time=0.25s\nFor more info check URL'
+        )
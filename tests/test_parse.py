@@ -1,18 +1,55 @@
+import re
+import sys
+import tracemalloc
 import unittest
 from unittest import mock
 
 import requests.exceptions
 
+from argo_probe_http_parser.base import ASCII_FOLDING
+from argo_probe_http_parser.matcher import fold
 from argo_probe_http_parser.parse import HttpParse
 
+from tests.test_strip import best_time
+
 
 def mock_function(*args, **kwargs):
     pass
 
 
-class MockResponse:
+class MockStreamResponse:
+    def __init__(self, chunks, encoding='utf-8'):
+        self.chunks = chunks
+        self.encoding = encoding
+        self.status_code = 200
+        self.headers = {}
+        self.read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.read += 1
+            if isinstance(chunk, str):
+                chunk = chunk.encode(self.encoding or 'utf-8')
+
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class MockResponse(MockStreamResponse):
     def __init__(self, text):
-        self.text = text
+        super().__init__([text])
+
+
+class MockBytesResponse(MockStreamResponse):
+    def __init__(self, content, encoding=None):
+        super().__init__([content], encoding=encoding)
+
+    @property
+    def text(self):
+        raise AssertionError('Response should not be decoded')
 
 
 def mock_response_ok(*args, **kwargs):
@@ -88,7 +125,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with('OK - Everything is ok.')
         mock_sys.assert_called_with(0)
@@ -110,7 +147,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with('OK - Everything is ok.')
         mock_sys.assert_called_with(0)
@@ -134,7 +171,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             "UNKNOWN - Something unknown.\n"
@@ -159,7 +196,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'https://hostname.com:80/api/test.php', timeout=20
+            'https://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with('OK - Everything is ok.')
         mock_sys.assert_called_with(0)
@@ -181,7 +218,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             "WARNING - Not everything is ok.\n"
@@ -206,7 +243,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             "WARNING - Not everything is ok.\n"
@@ -233,7 +270,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             "UNKNOWN - Something unknown.\n"
@@ -258,7 +295,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - Nothing is ok.\n'
@@ -285,7 +322,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - Nothing is ok.\n'
@@ -312,7 +349,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - Something unknown.\n'
@@ -338,7 +375,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - A warning / error is raised if the site has not '
@@ -368,7 +405,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - ERROR [ last published 4726 days ago: 2010-04-12 ]\n'
@@ -393,7 +430,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - Nothing is ok.\n'
@@ -420,7 +457,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - Nothing is ok.\n'
@@ -447,7 +484,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - Something unknown.\n'
@@ -473,7 +510,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - CRITICAL: item1,item2,item3\n'
@@ -499,7 +536,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - CRITICAL: item1,item2,item3\n'
@@ -525,7 +562,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - '
@@ -550,7 +587,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'WARNING - Not everything is ok.\n'
@@ -577,7 +614,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'WARNING - Not everything is ok.\n'
@@ -604,7 +641,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - Something unknown.\n'
@@ -630,7 +667,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'WARNING - WARNING: item1,item2,item3\n'
@@ -656,7 +693,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'WARNING - WARNING: item1,item2,item3\n'
@@ -682,7 +719,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - '
@@ -707,7 +744,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - Nothing is ok.\n'
@@ -734,7 +771,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - Nothing is ok.\n'
@@ -761,7 +798,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - Something unknown.\n'
@@ -787,7 +824,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - CRITICAL:item3, item4\n'
@@ -813,7 +850,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'CRITICAL - CRITICAL:item3, item4\n'
@@ -839,7 +876,7 @@ class HttpParseTests(unittest.TestCase):
             case_sensitive=True
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - '
@@ -864,7 +901,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with(
             'UNKNOWN - Something unknown.\n'
@@ -889,7 +926,7 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with('CRITICAL - Error')
         mock_sys.assert_called_with(2)
@@ -911,11 +948,395 @@ class HttpParseTests(unittest.TestCase):
             timeout=20, case_sensitive=False
         )
         mock_get.assert_called_with(
-            'http://hostname.com:80/api/test.php', timeout=20
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
         )
         mock_print.assert_called_with('UNKNOWN - Unknown exception')
         mock_sys.assert_called_with(3)
 
 
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_stream_ok(self, mock_get, mock_print, mock_sys):
+        response = MockStreamResponse(['Everything is O', 'K\n', 'done'])
+        mock_get.return_value = response
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='Not everything is ok.',
+            crit_msg='Nothing is ok.', unknown_msg='Something unknown.',
+            timeout=20, case_sensitive=False, stream=True
+        )
+        mock_get.assert_called_with(
+            'http://hostname.com:80/api/test.php', timeout=20, stream=True
+        )
+        mock_print.assert_called_with('OK - Everything is ok.')
+        mock_sys.assert_called_with(0)
+        self.assertEqual(response.read, 3)
+        self.assertTrue(response.closed)
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_stream_critical_early_exit(
+            self, mock_get, mock_print, mock_sys
+    ):
+        response = MockStreamResponse([
+            'WARNING: item1\nCRIT', 'ICAL: item2\n', 'OK: item3\n',
+            'CRITICAL: item4\n'
+        ])
+        mock_get.return_value = response
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='Not everything is ok.',
+            crit_msg='Nothing is ok.', unknown_msg='Something unknown.',
+            timeout=20, case_sensitive=False, stream=True
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - Nothing is ok.\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+        self.assertEqual(response.read, 2)
+        self.assertTrue(response.closed)
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_stream_critical_without_message_finishes_line(
+            self, mock_get, mock_print, mock_sys
+    ):
+        response = MockStreamResponse([
+            'OK: item1\nCRITICAL: it', 'em2,', 'item3\nCRITICAL: item4\n',
+            'OK: item5\n'
+        ])
+        mock_get.return_value = response
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=False, stream=True
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - CRITICAL: item2,item3\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+        self.assertEqual(response.read, 3)
+        self.assertTrue(response.closed)
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_stream_html_tag_across_chunks(
+            self, mock_get, mock_print, mock_sys
+    ):
+        chunks = [
+            html_response[i:i + 7] for i in range(0, len(html_response), 7)
+        ]
+        mock_get.return_value = MockStreamResponse(chunks, encoding=None)
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname="hostname.com", port=80, uri="/api/test.php"
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='ERROR',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+            timeout=20, case_sensitive=True, stream=True
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - ERROR [ last published 4726 days ago: 2010-04-12 ]\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_match_bytes_html(self, mock_get, mock_print, mock_sys):
+        mock_get.return_value = MockBytesResponse(
+            html_response.encode('iso-8859-1'), encoding='ISO-8859-1'
+        )
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname="hostname.com", port=80, uri="/api/test.php"
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='error',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+            timeout=20, case_sensitive=False, match_bytes=True
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - A warning / error is raised if the site has not '
+            'published accounting data for 7 / 31 days, if a site has not '
+            'published data for 31 days, which usually signifies a problem '
+            'with APEL or RGMA services.\n'
+            'ERROR [ last published 4726 days ago: 2010-04-12 ]\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_match_bytes_decodes_only_message_lines(
+            self, mock_get, mock_print, mock_sys
+    ):
+        mock_get.return_value = MockBytesResponse(
+            'OK: čvor1\nWARNING: čvor2, čvor3\n'.encode('utf-8')
+        )
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='OK', warn_search='WARNING', crit_search='CRITICAL',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=True, match_bytes=True
+        )
+        mock_print.assert_called_with(
+            'WARNING - WARNING: čvor2, čvor3\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(1)
+
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_match_bytes_folds_like_text(self, mock_get):
+        for encoding in ['utf-8', 'cp1254']:
+            for match_bytes in [False, True]:
+                mock_get.return_value = MockBytesResponse(
+                    'OK: \u0130\n'.encode(encoding), encoding=encoding
+                )
+                nagios = HttpParse(
+                    hostname='hostname.com', port=80, uri='/api/test.php'
+                ).check(
+                    ok_search='ok', warn_search='i', crit_search='critical',
+                    ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+                    timeout=20, case_sensitive=False, match_bytes=match_bytes
+                )
+                self.assertEqual(
+                    nagios.get_message(),
+                    'WARNING - OK: \u0130\n'
+                    'For more info check URL: '
+                    'http://hostname.com:80/api/test.php'
+                )
+
+    def test_bytes_safe(self):
+        for encoding, case_sensitive, safe in [
+            ('utf-8', True, True),
+            ('utf-8', False, False),
+            ('iso-8859-1', False, True),
+            ('cp1254', False, False),
+            ('cp1254', True, True)
+        ]:
+            self.assertEqual(
+                HttpParse._bytes_safe(
+                    encoding, ['critical', 'warning', 'ok'], case_sensitive
+                ), safe, (encoding, case_sensitive)
+            )
+
+    def test_ascii_folding(self):
+        self.assertEqual(
+            tuple(
+                chr(i) for i in range(128, sys.maxunicode + 1)
+                if any(ord(char) < 128 for char in fold(chr(i)))
+            ),
+            ASCII_FOLDING
+        )
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_match_bytes_with_encoding(
+            self, mock_get, mock_print, mock_sys
+    ):
+        mock_get.return_value = MockBytesResponse(
+            'CRITICAL: čvor1\n'.encode('cp1250'), encoding='utf-8'
+        )
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='Čvor',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=False, encoding='cp1250', match_bytes=True
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - CRITICAL: čvor1\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_match_bytes_stream(self, mock_get, mock_print, mock_sys):
+        response = MockStreamResponse(
+            ['WARNING: item1\nCRIT', 'ICAL: item2\n', 'OK: item3\n']
+        )
+        mock_get.return_value = response
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='CRITICAL',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=True, stream=True, match_bytes=True
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - CRITICAL: item2\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+        self.assertEqual(response.read, 2)
+
+    @mock.patch('argo_probe_http_parser.parse.sys.exit')
+    @mock.patch('argo_probe_http_parser.parse.print')
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_parse_message_lines(self, mock_get, mock_print, mock_sys):
+        mock_get.return_value = MockResponse(
+            'CRITICAL: item1\nCRITICAL: item2\nCRITICAL: čvor3\nOK: item4'
+        )
+        mock_print.side_effect = mock_function
+        mock_sys.side_effect = mock_function
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=False, msg_lines=2
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - CRITICAL: item1\nCRITICAL: item2\n'
+            '... and at least 1 more\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        parse.parse(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=False, msg_bytes=43
+        )
+        mock_print.assert_called_with(
+            'CRITICAL - CRITICAL: item1\nCRITICAL: item2\n... and 1 more'
+            '\nFor more info check URL: http://hostname.com:80/api/test.php'
+        )
+        mock_sys.assert_called_with(2)
+
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_check_message_summary(self, mock_get):
+        mock_get.return_value = MockResponse('\n'.join(
+            [f'CRITICAL: item{i}' for i in range(500)] + ['OK']
+        ))
+        parse = HttpParse(
+            hostname='hostname.com', port=80, uri='/api/test.php'
+        )
+        params = dict(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='', warn_msg='', crit_msg='', unknown_msg='', timeout=20,
+            case_sensitive=False, msg_lines=3, msg_bytes=40
+        )
+        self.assertEqual(
+            parse.check(**params).get_message(),
+            'CRITICAL - CRITICAL: item0\nCRITICAL: item1\n'
+            '... and at least 2 more\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+        params.update(msg_bytes=None)
+        self.assertEqual(
+            parse.check(**params).get_message(),
+            'CRITICAL - CRITICAL: item0\nCRITICAL: item1\nCRITICAL: item2\n'
+            '... and at least 1 more\n'
+            'For more info check URL: http://hostname.com:80/api/test.php'
+        )
+
+
+def plain_scans(text):
+    stripped = re.compile(r'<[^>]+>').sub('|', text)
+    html = stripped != text
+    stripped = stripped.lower()
+    return [search in stripped for search in ('critical', 'warning', 'ok')], \
+        html
+
+
+class DefaultPathSpeedTests(unittest.TestCase):
+    def test_no_slower_than_plain_scans(self):
+        text = '<tr><td class="site">GSI-LCG2</td><td>up</td></tr>\n' * 40000
+
+        def check(text):
+            with mock.patch(
+                    'argo_probe_http_parser.parse.requests.get'
+            ) as get:
+                get.return_value = MockResponse(text)
+                return HttpParse(
+                    hostname='hostname.com', port=80, uri='/status'
+                ).check(
+                    ok_search='ok', warn_search='warning',
+                    crit_search='critical', ok_msg='', warn_msg='',
+                    crit_msg='', unknown_msg='Nothing found', timeout=20,
+                    case_sensitive=False
+                )
+
+        self.assertEqual(check(text).get_code(), 3)
+        times = {check: [], plain_scans: []}
+        for _ in range(3):
+            for func in times:
+                times[func].append(best_time(func, text))
+
+        self.assertLess(min(times[check]), min(times[plain_scans]) * 2)
+
+
+class DefaultPathMemoryTests(unittest.TestCase):
+    def peak(self, body):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            get.return_value = MockBytesResponse(body, encoding='utf-8')
+            tracemalloc.start()
+            try:
+                nagios = HttpParse(
+                    hostname='hostname.com', port=80, uri='/status'
+                ).check(
+                    ok_search='ok', warn_search='warning',
+                    crit_search='critical', ok_msg='', warn_msg='',
+                    crit_msg='', unknown_msg='', timeout=20,
+                    case_sensitive=False, msg_lines=3
+                )
+                peak = tracemalloc.get_traced_memory()[1]
+
+            finally:
+                tracemalloc.stop()
+
+        self.assertEqual(nagios.get_code(), 1)
+        return peak
+
+    def test_peak_below_three_copies(self):
+        for page in (
+                b'site-a: up\nsite-b: warning\n',
+                b'<tr><td>site-b</td><td>warning</td></tr>\n'
+        ):
+            body = page * (1024 * 1024 // len(page))
+            self.assertLess(self.peak(body), len(body) * 2.5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.evaluate import CRITICAL, OK, WARNING
+from argo_probe_http_parser.parse import HttpParse
+from argo_probe_http_parser.regex import (
+    RegexEvaluation, compile_regex, search_patterns
+)
+
+from tests.test_parse import MockResponse, html_response
+
+DAYS_AGO = r'last published ([89]|[1-9]\d+) days ago'
+
+
+def evaluate(text, patterns, chunk_size=None, **kwargs):
+    evaluation = RegexEvaluation(patterns, **kwargs)
+    chunk_size = chunk_size or len(text) or 1
+    for i in range(0, len(text), chunk_size):
+        evaluation.feed(text[i:i + chunk_size])
+        if evaluation.complete:
+            break
+
+    evaluation.close()
+    return evaluation
+
+
+class CompileRegexTests(unittest.TestCase):
+    def test_cached(self):
+        self.assertIs(
+            compile_regex(('a+', 'b', 'c')), compile_regex(('a+', 'b', 'c'))
+        )
+
+    def test_named_groups(self):
+        self.assertEqual(
+            sorted(compile_regex(('a', 'b', 'c')).groupindex),
+            ['critical', 'ok', 'warning']
+        )
+
+    def test_nested_repetition(self):
+        for pattern in (r'(a+)+b', r'(\w*\s?)*$', r'(?:x|(y+))*'):
+            self.assertRaises(
+                ValueError, compile_regex, (pattern, 'b', 'c')
+            )
+
+        compile_regex((r'(ab)+\d{1,3}', r'(a|b)+', r'x{2}(y+)?'))
+
+    def test_ambiguous_repetition(self):
+        for pattern in (
+                r'(a|a)*b', r'(a|)*b', r'(a?)*', r'(a{1,2})*b', r'(.|a)*',
+                r'(?:\d|x\w|\w)+!'
+        ):
+            self.assertRaises(
+                ValueError, compile_regex, (pattern, 'b', 'c')
+            )
+
+        compile_regex((r'(ab|cd)*e', r'(ab?)*', r'(a\d{1,3},)*'))
+        compile_regex((r'(a|ab)*c', r'(?:\s?a)*', r'(?:ERROR|FATAL).*'))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, compile_regex, ('(', 'b', 'c'))
+        self.assertRaises(ValueError, compile_regex, ('(?P<ok>a)', 'b', 'c'))
+
+    def test_search_patterns(self):
+        self.assertIsNone(search_patterns(['a', 'b', 'c'], [None] * 3))
+        self.assertEqual(
+            search_patterns(['a.b', 'w', 'ok'], [None, r'w\d', None]),
+            [r'a\.b', r'w\d', 'ok']
+        )
+
+
+class RegexEvaluationTests(unittest.TestCase):
+    def assertSameForChunks(self, text, patterns, **kwargs):
+        expected = evaluate(text, patterns, **kwargs)
+        for chunk_size in (1, 2, 7, 64):
+            evaluation = evaluate(text, patterns, chunk_size, **kwargs)
+            self.assertEqual(evaluation.match, expected.match, chunk_size)
+            for index in range(len(patterns)):
+                self.assertEqual(
+                    evaluation.matched_lines(index),
+                    expected.matched_lines(index), chunk_size
+                )
+
+        return expected
+
+    def test_days_ago(self):
+        evaluation = self.assertSameForChunks(
+            'item1: last published 3 days ago\n'
+            'item2: last published 12 days ago\n'
+            'item3: last published 8 days ago',
+            [DAYS_AGO, r'last published [4-7] days ago', 'published']
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertEqual(evaluation.matched_lines(CRITICAL), [
+            'item2: last published 12 days ago',
+            'item3: last published 8 days ago'
+        ])
+        self.assertEqual(evaluation.matched_count(WARNING), 0)
+        self.assertEqual(evaluation.matched_count(OK), 3)
+
+    def test_html(self):
+        evaluation = self.assertSameForChunks(
+            html_response, [DAYS_AGO, 'warn', 'ok']
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertEqual(
+            evaluation.matched_lines(CRITICAL),
+            ['ERROR [ last published 4726 days ago: 2010-04-12 ]']
+        )
+
+    def test_not_masked_by_overlapping_match(self):
+        evaluation = evaluate(
+            'status: ERROR', ['error', 'warn', r'status: \w+']
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertEqual(evaluation.matched_count(OK), 1)
+
+    def test_case_sensitive(self):
+        evaluation = evaluate(
+            'Error\nERROR', ['ERROR', 'warn', 'ok'], case_sensitive=True
+        )
+        self.assertEqual(evaluation.matched_lines(CRITICAL), ['ERROR'])
+        evaluation = evaluate('Error\nERROR', ['ERROR', 'warn', 'ok'])
+        self.assertEqual(
+            evaluation.matched_lines(CRITICAL), ['Error', 'ERROR']
+        )
+
+    def test_early_exit(self):
+        evaluation = evaluate(
+            'ok\nerror 1\nerror 2\n', ['error', 'warn', 'ok'], chunk_size=4,
+            early_exit=True
+        )
+        self.assertEqual(evaluation.match, CRITICAL)
+        self.assertEqual(evaluation.matched_lines(CRITICAL), ['error 1'])
+
+    def test_max_lines(self):
+        evaluation = evaluate(
+            'error 1\nerror 2\nerror 3', ['error', 'warn', 'ok'], max_lines=2
+        )
+        self.assertEqual(
+            evaluation.matched_lines(CRITICAL), ['error 1', 'error 2']
+        )
+        self.assertEqual(evaluation.matched_count(CRITICAL), 3)
+
+    def test_timeout(self):
+        with self.assertRaises(ValueError) as context:
+            evaluate('a' * 10000, ['a', 'b', 'c'], timeout=1e-9)
+
+        self.assertEqual(
+            str(context.exception),
+            'Regular expression matching exceeded 1e-09 seconds'
+        )
+
+
+class HttpParseRegexTests(unittest.TestCase):
+    def check(self, text, **kwargs):
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            get.return_value = MockResponse(text)
+            return HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+                unknown_msg='', timeout=20, case_sensitive=False, **kwargs
+            )
+
+    def test_critical(self):
+        nagios = self.check(html_response, crit_regex=DAYS_AGO)
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - ERROR [ last published 4726 days ago: 2010-04-12 ]\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
+
+    def test_ok(self):
+        nagios = self.check(
+            'Status: OK [ last published 3 days ago ]', crit_regex=DAYS_AGO
+        )
+        self.assertEqual(nagios.get_message(), 'OK - Everything is ok.')
+
+    def test_invalid_regex(self):
+        nagios = self.check('Status: OK', warn_regex='(a*)*')
+        self.assertEqual(nagios.get_code(), 3)
+        self.assertTrue(nagios.get_message().startswith(
+            "UNKNOWN - Regular expression '(a*)*' nests unbounded repetitions"
+        ))
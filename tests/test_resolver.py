@@ -0,0 +1,158 @@
+import socket
+import threading
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.batch import BatchCheck, run_checks
+from argo_probe_http_parser.parse import HttpParse
+from argo_probe_http_parser.resolver import DnsCache
+from argo_probe_http_parser.session import PooledSession
+
+from tests.server import MockHandler, ServerTestCase
+
+ADDRESSES = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', 80))]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class StatusHandler(MockHandler):
+    def do_GET(self):
+        self.send_body('Status: OK')
+
+
+@mock.patch('argo_probe_http_parser.resolver.socket.getaddrinfo')
+class DnsCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.resolver = DnsCache(ttl=60, negative_ttl=10, clock=self.clock)
+
+    def test_cached_until_ttl(self, getaddrinfo):
+        getaddrinfo.return_value = ADDRESSES
+        for _ in range(3):
+            self.assertEqual(
+                self.resolver.getaddrinfo('host.com', 80), ADDRESSES
+            )
+
+        self.assertEqual(getaddrinfo.call_count, 1)
+        self.clock.now = 61
+        self.resolver.getaddrinfo('host.com', 80)
+        self.assertEqual(getaddrinfo.call_count, 2)
+        self.assertEqual(self.resolver.stats(), {'hits': 2, 'misses': 2})
+
+    def test_negative_cache(self, getaddrinfo):
+        getaddrinfo.side_effect = socket.gaierror(-2, 'Name not known')
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror) as context:
+                self.resolver.getaddrinfo('missing.invalid', 80)
+
+            self.assertEqual(context.exception.args, (-2, 'Name not known'))
+
+        self.assertEqual(getaddrinfo.call_count, 1)
+        self.clock.now = 11
+        getaddrinfo.side_effect = None
+        getaddrinfo.return_value = ADDRESSES
+        self.assertEqual(
+            self.resolver.getaddrinfo('missing.invalid', 80), ADDRESSES
+        )
+
+    def test_elapsed_per_thread(self, getaddrinfo):
+        getaddrinfo.return_value = ADDRESSES
+        self.resolver.getaddrinfo('host.com', 80)
+        self.assertGreater(self.resolver.elapsed(), 0)
+        thread = threading.Thread(
+            target=self.resolver.getaddrinfo, args=('other.com', 80)
+        )
+        thread.start()
+        thread.join()
+        seconds = self.resolver.elapsed()
+        self.assertEqual(self.resolver.take_elapsed(), seconds)
+        self.assertEqual(self.resolver.elapsed(), 0)
+
+    def test_prefetch(self, getaddrinfo):
+        getaddrinfo.side_effect = lambda host, *args: ADDRESSES \
+            if host != 'missing.invalid' else socket.gaierror(-2, 'x')
+        self.resolver.prefetch([
+            ('a.com', 80), ('b.com', 443), ('a.com', 80),
+            ('missing.invalid', 80)
+        ])
+        self.assertEqual(
+            sorted(call.args[:2] for call in getaddrinfo.call_args_list),
+            [('a.com', 80), ('b.com', 443), ('missing.invalid', 80)]
+        )
+        self.resolver.getaddrinfo('b.com', 443)
+        self.assertEqual(getaddrinfo.call_count, 3)
+
+
+class ResolvingSessionTests(ServerTestCase):
+    handler = StatusHandler
+
+    def setUp(self):
+        self.resolver = DnsCache()
+        self.session = PooledSession(resolver=self.resolver)
+
+    def tearDown(self):
+        self.session.close()
+
+    def check(self, hostname, **kwargs):
+        return HttpParse(
+            hostname=hostname, port=self.port, uri='/', session=self.session
+        ).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+            unknown_msg='', timeout=5, case_sensitive=False, **kwargs
+        )
+
+    def test_connections_use_cache(self):
+        with mock.patch.object(
+                self.resolver, 'getaddrinfo', wraps=self.resolver.getaddrinfo
+        ) as getaddrinfo:
+            self.session.get(f'http://127.0.0.1:{self.port}/a').close()
+            self.session.close()
+            self.session.get(f'http://127.0.0.1:{self.port}/b').close()
+
+        self.assertEqual(getaddrinfo.call_count, 2)
+        self.assertEqual(self.resolver.stats(), {'hits': 1, 'misses': 1})
+
+    def test_dns_perfdata(self):
+        nagios = self.check('127.0.0.1', perfdata=True)
+        self.assertEqual(nagios.get_code(), 0)
+        labels = [
+            item.partition('=')[0] for item in nagios.get_perfdata().split()
+        ]
+        self.assertEqual(labels[:3], ['dns', 'connect', 'ttfb'])
+
+    @mock.patch('argo_probe_http_parser.resolver.socket.getaddrinfo')
+    def test_resolution_error(self, getaddrinfo):
+        getaddrinfo.side_effect = socket.gaierror(-2, 'Name not known')
+        for _ in range(2):
+            nagios = self.check('missing.invalid')
+            self.assertEqual(nagios.get_code(), 2)
+            self.assertIn('Name not known', nagios.get_message())
+
+        self.assertEqual(getaddrinfo.call_count, 1)
+
+    def test_batch_prefetch(self):
+        checks = [
+            BatchCheck(
+                name=f'check{index}', host_name='host', hostname=hostname,
+                port=self.port, uri='/', ssl=False, ok_search='ok',
+                warn_search='warning', crit_search='critical', ok_msg='',
+                warn_msg='', crit_msg='', unknown_msg='', timeout=5,
+                case_sensitive=False
+            ) for index, hostname in enumerate(
+                ['127.0.0.1', 'http://127.0.0.1/', '127.0.0.1']
+            )
+        ]
+        results = list(run_checks(
+            checks, workers=2, session=self.session, prefetch=True
+        ))
+        self.assertEqual(
+            [nagios.get_code() for _, nagios in results], [0, 0, 0]
+        )
+        self.assertEqual(self.resolver.misses, 1)
@@ -0,0 +1,196 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests.exceptions
+
+from argo_probe_http_parser.cli import main
+from argo_probe_http_parser.parse import HttpParse
+from argo_probe_http_parser.rules import RuleSet, load_rule_sets, rule_searches
+
+from tests.test_parse import MockResponse
+
+config = """
+[DEFAULT]
+unknown_message = Nothing found.
+
+[APEL-Pub]
+critical_search = error
+critical_message = Publication failed.
+
+[APEL-Sync]
+ok_search = synced
+warning_search = delayed
+critical_search = missing
+"""
+
+response = 'Publication: ERROR\nSync: delayed for item1\nStatus: OK'
+
+
+def mock_response(*args, **kwargs):
+    return MockResponse(response)
+
+
+class RuleSetTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as f:
+            f.write(config)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_load_rule_sets(self):
+        rule_sets = load_rule_sets(self.path, ok_msg='Everything is ok.')
+        self.assertEqual(
+            [rule_set.name for rule_set in rule_sets], ['APEL-Pub', 'APEL-Sync']
+        )
+        self.assertEqual(
+            rule_sets[0].searches, ['error', 'warning', 'ok']
+        )
+        self.assertEqual(rule_sets[0].crit_msg, 'Publication failed.')
+        self.assertEqual(rule_sets[0].ok_msg, 'Everything is ok.')
+        self.assertEqual(rule_sets[1].unknown_msg, 'Nothing found.')
+        self.assertEqual(rule_searches(rule_sets), [
+            'error', 'warning', 'ok', 'missing', 'delayed', 'synced'
+        ])
+
+    def test_load_rule_sets_empty(self):
+        with open(self.path, 'w') as f:
+            f.write('')
+
+        self.assertRaises(ValueError, load_rule_sets, self.path)
+
+
+class CheckRulesTests(unittest.TestCase):
+    def setUp(self):
+        self.http_parser = HttpParse(
+            hostname='hostname.com', port=80, uri='/status'
+        )
+        self.rule_sets = [
+            RuleSet('APEL-Pub', crit_search='error'),
+            RuleSet(
+                'APEL-Sync', ok_search='synced', warn_search='delayed',
+                crit_search='missing'
+            ),
+            RuleSet(
+                'Status', ok_search='OK', warn_search='WARN',
+                crit_search='CRIT', ok_msg='Everything is ok.'
+            ),
+            RuleSet('Other', ok_search='foo', warn_search='bar',
+                    crit_search='baz', unknown_msg='')
+        ]
+
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_check_rules(self, mock_get):
+        mock_get.side_effect = mock_response
+        results = self.http_parser.check_rules(
+            self.rule_sets, timeout=20, case_sensitive=False
+        )
+        mock_get.assert_called_once_with(
+            'http://hostname.com:80/status', timeout=20, stream=True
+        )
+        self.assertEqual(
+            [(rule_set.name, nagios.get_code(), nagios.get_message())
+             for rule_set, nagios in results],
+            [
+                ('APEL-Pub', 2,
+                 'CRITICAL - Publication: ERROR\nFor more info check URL: '
+                 'http://hostname.com:80/status'),
+                ('APEL-Sync', 1,
+                 'WARNING - Sync: delayed for item1\nFor more info check URL: '
+                 'http://hostname.com:80/status'),
+                ('Status', 0, 'OK - Everything is ok.'),
+                ('Other', 3,
+                 'UNKNOWN - For more info check URL: '
+                 'http://hostname.com:80/status')
+            ]
+        )
+
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_check_rules_same_as_check(self, mock_get):
+        mock_get.side_effect = mock_response
+        results = self.http_parser.check_rules(
+            self.rule_sets, timeout=20, case_sensitive=True
+        )
+        for rule_set, nagios in results:
+            expected = HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search=rule_set.ok_search,
+                warn_search=rule_set.warn_search,
+                crit_search=rule_set.crit_search,
+                ok_msg=rule_set.ok_msg,
+                warn_msg=rule_set.warn_msg,
+                crit_msg=rule_set.crit_msg,
+                unknown_msg=rule_set.unknown_msg,
+                timeout=20,
+                case_sensitive=True
+            )
+            self.assertEqual(nagios.get_code(), expected.get_code())
+            self.assertEqual(nagios.get_message(), expected.get_message())
+
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_check_rules_connection_error(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ConnectionError(
+            'Connection refused'
+        )
+        results = self.http_parser.check_rules(
+            self.rule_sets, timeout=20, case_sensitive=False
+        )
+        self.assertEqual(len(results), 4)
+        for rule_set, nagios in results:
+            self.assertEqual(nagios.get_code(), 2)
+            self.assertEqual(
+                nagios.get_message(), 'CRITICAL - Connection refused'
+            )
+
+
+class RulesCliTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as f:
+            f.write(config)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    @mock.patch('argo_probe_http_parser.nagios.time.time')
+    @mock.patch('argo_probe_http_parser.cli.sys.exit')
+    @mock.patch('argo_probe_http_parser.cli.sys.stdout', new_callable=io.StringIO)
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_main(self, mock_get, mock_stdout, mock_exit, mock_time):
+        mock_get.side_effect = mock_response
+        mock_time.return_value = 1679415290
+        main([
+            '-H', 'hostname.com', '-t', '20', '-u', '/status',
+            '--rules', self.path, '--host-name', 'apel.hostname.com'
+        ])
+        mock_get.assert_called_once()
+        mock_exit.assert_called_once_with(0)
+        self.assertEqual(
+            mock_stdout.getvalue(),
+            '[1679415290] PROCESS_SERVICE_CHECK_RESULT;apel.hostname.com;'
+            'APEL-Pub;2;CRITICAL - Publication failed.\\nFor more info check '
+            'URL: http://hostname.com:80/status\n'
+            '[1679415290] PROCESS_SERVICE_CHECK_RESULT;apel.hostname.com;'
+            'APEL-Sync;1;WARNING - Sync: delayed for item1\\nFor more info '
+            'check URL: http://hostname.com:80/status\n'
+        )
+
+    @mock.patch('argo_probe_http_parser.cli.sys.exit')
+    @mock.patch('argo_probe_http_parser.cli.sys.stdout', new_callable=io.StringIO)
+    @mock.patch('argo_probe_http_parser.parse.requests.get')
+    def test_main_missing_rules(self, mock_get, mock_stdout, mock_exit):
+        main([
+            '-H', 'hostname.com', '-t', '20', '--rules', self.path + '.missing'
+        ])
+        mock_get.assert_not_called()
+        mock_exit.assert_called_once_with(3)
+        self.assertTrue(
+            mock_stdout.getvalue().startswith(
+                'UNKNOWN - Unable to load rule sets:'
+            )
+        )
@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from argo_probe_http_parser.scheduler import DurationHistory, schedule
+
+
+class Recorder:
+    def __init__(self, durations=None):
+        self.durations = durations or {}
+        self.started = []
+        self.running = {}
+        self.max_running = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, item):
+        host, name = item
+        with self.lock:
+            self.started.append((name, time.monotonic()))
+            self.running[host] = self.running.get(host, 0) + 1
+            self.max_running[host] = max(
+                self.max_running.get(host, 0), self.running[host]
+            )
+
+        time.sleep(self.durations.get(name, 0.02))
+        with self.lock:
+            self.running[host] -= 1
+
+        return name
+
+
+def run(items, recorder, **kwargs):
+    return list(schedule(
+        items, run=recorder, host=lambda item: item[0],
+        name=lambda item: item[1], **kwargs
+    ))
+
+
+class DurationHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'history.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_estimate(self):
+        history = DurationHistory(size=3)
+        self.assertIsNone(history.estimate('a'))
+        for seconds in (9, 1, 2, 3):
+            history.record('a', seconds)
+
+        self.assertEqual(history.estimate('a'), 2)
+
+    def test_save_and_load(self):
+        history = DurationHistory(self.path)
+        history.record('a', 1.5)
+        history.record('b', 2)
+        history.retain(['a'])
+        history.save()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {'a': [1.5]})
+
+        self.assertEqual(DurationHistory(self.path).estimate('a'), 1.5)
+        self.assertIsNone(DurationHistory(self.path).estimate('b'))
+
+    def test_invalid_file(self):
+        for content in ('not json', '[1, 2]', '{"a": ["slow"], "b": [1]}'):
+            with open(self.path, 'w') as f:
+                f.write(content)
+
+            history = DurationHistory(self.path)
+            self.assertIsNone(history.estimate('a'))
+
+        self.assertEqual(history.estimate('b'), 1)
+        history = DurationHistory(os.path.join(self.directory, 'missing'))
+        self.assertIsNone(history.estimate('a'))
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_longest_first(self):
+        history = DurationHistory()
+        for name, seconds in (('fast', 0.1), ('slow', 5), ('medium', 1)):
+            history.record(name, seconds)
+
+        recorder = Recorder()
+        items = [('a', 'fast'), ('b', 'medium'), ('a', 'new'), ('c', 'slow')]
+        results = run(items, recorder, workers=1, history=history)
+        self.assertEqual(
+            [name for name, _ in recorder.started],
+            ['new', 'slow', 'medium', 'fast']
+        )
+        self.assertEqual(sorted(results), sorted(zip(items, [
+            'fast', 'medium', 'new', 'slow'
+        ])))
+        self.assertLess(history.estimate('slow'), 5)
+
+    def test_per_host(self):
+        recorder = Recorder()
+        items = [(host, f'{host}{i}') for host in 'ab' for i in range(6)]
+        results = run(items, recorder, workers=8, per_host=2)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(recorder.max_running, {'a': 2, 'b': 2})
+
+    def test_rate(self):
+        recorder = Recorder({'a0': 0, 'a1': 0, 'a2': 0, 'b0': 0})
+        items = [('a', 'a0'), ('a', 'a1'), ('a', 'a2'), ('b', 'b0')]
+        run(items, recorder, workers=4, rate=20)
+        started = dict(recorder.started)
+        self.assertGreaterEqual(started['a1'] - started['a0'], 0.045)
+        self.assertGreaterEqual(started['a2'] - started['a1'], 0.045)
+        self.assertLess(started['b0'] - started['a0'], 0.04)
+
+    def test_errors_propagate(self):
+        def fail(item):
+            raise ValueError('broken')
+
+        with self.assertRaises(ValueError):
+            list(schedule(
+                [('a', 'a0')], run=fail, host=lambda item: item[0],
+                name=lambda item: item[1], workers=1
+            ))
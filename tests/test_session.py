@@ -0,0 +1,76 @@
+import unittest
+
+from argo_probe_http_parser.parse import HttpParse
+from argo_probe_http_parser.session import PooledSession
+
+from tests.server import MockHandler, MockServer
+
+
+class PathHandler(MockHandler):
+    def do_GET(self):
+        self.send_body('OK: {}'.format(self.path))
+
+
+class PooledSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer(PathHandler).start()
+        self.port = self.server.port
+        self.session = PooledSession(pool_connections=2, pool_maxsize=2)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+
+    def check(self, uri, **kwargs):
+        return HttpParse(
+            hostname='127.0.0.1', port=self.port, uri=uri,
+            session=self.session
+        ).check(
+            ok_search='ok', warn_search='warning', crit_search='critical',
+            ok_msg='Everything is ok.', warn_msg='', crit_msg='',
+            unknown_msg='', timeout=5, case_sensitive=False, **kwargs
+        )
+
+    def test_pool_stats_empty(self):
+        self.assertEqual(
+            self.session.pool_stats(), {'requests': 0, 'hits': 0, 'misses': 0}
+        )
+
+    def test_connection_reused_across_checks(self):
+        for uri in ['/api/1', '/api/2', '/api/3']:
+            nagios = self.check(uri)
+            self.assertEqual(nagios.get_message(), 'OK - Everything is ok.')
+
+        self.assertEqual(
+            self.session.pool_stats(), {'requests': 3, 'hits': 2, 'misses': 1}
+        )
+
+    def test_connection_reused_in_stream_mode(self):
+        for uri in ['/api/1', '/api/2']:
+            nagios = self.check(uri, stream=True)
+            self.assertEqual(nagios.get_code(), 0)
+
+        self.assertEqual(
+            self.session.pool_stats(), {'requests': 2, 'hits': 1, 'misses': 1}
+        )
+
+    def test_check_perfdata(self):
+        nagios = self.check('/perfdata', perfdata=True)
+        self.assertEqual(nagios.get_code(), 0)
+        text, perfdata = nagios.get_message().split(' | ')
+        self.assertEqual(text, 'OK - Everything is ok.')
+        self.assertEqual(
+            [item.split('=')[0] for item in perfdata.split()],
+            ['dns', 'connect', 'ttfb', 'download', 'decode', 'strip', 'match',
+             'time', 'size', 'lines']
+        )
+        self.assertIn('size=13B;;;0', perfdata)
+        self.assertIn('lines=1;;;0', perfdata)
+
+    def test_reused_connection_perfdata(self):
+        self.check('/api/1')
+        nagios = self.check('/api/2', perfdata=True)
+        labels = [
+            item.partition('=')[0] for item in nagios.get_perfdata().split()
+        ]
+        self.assertEqual(labels[:2], ['ttfb', 'download'])
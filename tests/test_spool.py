@@ -0,0 +1,178 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from argo_probe_http_parser.evaluate import Evaluation
+from argo_probe_http_parser.parse import HttpParse
+from argo_probe_http_parser.spool import MappedText, SpooledText
+
+from tests.test_parse import MockStreamResponse, html_response
+
+chunks = ['zeile 1: ok €\n', 'ünd 2: warn', 'ing\n', '', 'é 3: critical\n4']
+
+
+def spooled(chunks, threshold=0, empty=''):
+    text = SpooledText(empty, threshold)
+    for chunk in chunks:
+        text.append(chunk)
+
+    return text
+
+
+def evaluate(text, searches, chunk_size, **kwargs):
+    evaluation = Evaluation(searches, collect=True, **kwargs)
+    for i in range(0, len(text), chunk_size):
+        evaluation.feed(text[i:i + chunk_size])
+
+    evaluation.close()
+    return evaluation
+
+
+class SpooledTextTests(unittest.TestCase):
+    def spooled(self, chunks, threshold=0, empty=''):
+        text = spooled(chunks, threshold=threshold, empty=empty)
+        self.addCleanup(text.close)
+        return text
+
+    def test_in_memory_below_threshold(self):
+        text = self.spooled(chunks, threshold=100)
+        self.assertFalse(text.spooled)
+        self.assertEqual(text.text, ''.join(chunks))
+
+    def test_spooled_above_threshold(self):
+        text = self.spooled(chunks, threshold=20)
+        self.assertTrue(text.spooled)
+        self.assertEqual(len(text), len(''.join(chunks)))
+        self.assertEqual(list(text.chunks()), chunks)
+        self.assertEqual(list(text.chunks(last=False)), chunks[:-1])
+
+    def test_mapped_text(self):
+        expected = ''.join(chunks)
+        mapped = self.spooled(chunks).text
+        self.assertEqual(len(mapped), len(expected))
+        for start in range(len(expected) + 1):
+            for end in range(start, len(expected) + 1):
+                self.assertEqual(mapped[start:end], expected[start:end])
+
+            self.assertEqual(mapped[start:], expected[start:])
+            for sub in ('\n', 'warning', ': ', 'x'):
+                self.assertEqual(
+                    mapped.find(sub, start), expected.find(sub, start)
+                )
+
+        self.assertEqual(mapped.split('\n'), expected.split('\n'))
+
+    def test_replace_last(self):
+        text = self.spooled(chunks)
+        text.replace_last('4 5')
+        self.assertEqual(text.text[:], ''.join(chunks[:-1]) + '4 5')
+        self.assertEqual(len(text), len(''.join(chunks[:-1])) + 3)
+
+    def test_bytes(self):
+        data = [chunk.encode('utf-8') for chunk in chunks]
+        mapped = self.spooled(data, empty=b'').text
+        self.assertEqual(mapped[:], b''.join(data))
+        self.assertEqual(
+            mapped.find(b'critical'), b''.join(data).find(b'critical')
+        )
+
+
+class SpooledEvaluationTests(unittest.TestCase):
+    def assertSameAsInMemory(self, text, searches, **kwargs):
+        for chunk_size in (1, 3, 64):
+            expected = evaluate(text, searches, chunk_size, **kwargs)
+            evaluation = evaluate(
+                text, searches, chunk_size, spool_threshold=8, **kwargs
+            )
+            self.addCleanup(evaluation.release)
+            self.assertTrue(evaluation._stripped.spooled)
+            self.assertEqual(evaluation.match, expected.match)
+            self.assertEqual(evaluation.lines, expected.lines)
+            for index in range(len(searches)):
+                self.assertEqual(
+                    evaluation.matched_lines(index),
+                    expected.matched_lines(index), (index, chunk_size)
+                )
+
+    def test_plain(self):
+        self.assertSameAsInMemory(
+            ''.join(chunks), ['critical', 'warning', 'ok']
+        )
+
+    def test_html(self):
+        self.assertSameAsInMemory(html_response, ['fail', 'warn', 'ok'])
+
+    def test_early_exit(self):
+        self.assertSameAsInMemory(
+            ''.join(chunks), ['critical', 'warning', 'ok'], early_exit=True
+        )
+
+
+class HttpParseSpoolTests(unittest.TestCase):
+    def test_check(self):
+        lines = [f'line {i}: warning\n' for i in range(1000)]
+        with mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            get.return_value = MockStreamResponse(lines + ['critical: x\n'])
+            nagios = HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+                timeout=20, case_sensitive=False, spool_threshold=1024
+            )
+            get.assert_called_once_with(
+                'http://hostname.com:80/status', timeout=20, stream=True
+            )
+
+        self.assertEqual(nagios.get_code(), 2)
+        self.assertEqual(
+            nagios.get_message(),
+            'CRITICAL - critical: x\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
+
+    def check(self, lines, **kwargs):
+        files = []
+        temporary = tempfile.TemporaryFile
+
+        def temporary_file():
+            files.append(temporary())
+            return files[-1]
+
+        with mock.patch(
+                'argo_probe_http_parser.spool.tempfile.TemporaryFile',
+                temporary_file
+        ), mock.patch('argo_probe_http_parser.parse.requests.get') as get:
+            get.return_value = MockStreamResponse(lines)
+            nagios = HttpParse(
+                hostname='hostname.com', port=80, uri='/status'
+            ).check(
+                ok_search='ok', warn_search='warning', crit_search='critical',
+                ok_msg='', warn_msg='', crit_msg='', unknown_msg='',
+                timeout=20, case_sensitive=False, spool_threshold=1024,
+                **kwargs
+            )
+
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].closed)
+        return nagios
+
+    def test_check_closes_spool(self):
+        for kwargs in ({}, {'match_rules': ['WARNING: any "warning"']}):
+            nagios = self.check(
+                [f'line {i}: warning\n' for i in range(1000)], **kwargs
+            )
+            self.assertEqual(nagios.get_code(), 1)
+
+    def test_check_folded_lines_not_loaded(self):
+        lines = [f'İ line {i}: ok\n' for i in range(1000)]
+        with mock.patch.object(
+                MappedText, 'split', side_effect=AssertionError
+        ):
+            nagios = self.check(lines + ['İ: warning\n'], msg_lines=1)
+
+        self.assertEqual(
+            nagios.get_message(),
+            'WARNING - İ: warning\n'
+            'For more info check URL: http://hostname.com:80/status'
+        )
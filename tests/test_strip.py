@@ -0,0 +1,78 @@
+import random
+import re
+import time
+import unittest
+
+from argo_probe_http_parser.strip import TagStripper, strip_tags
+
+html_tag = re.compile(r'<[^>]+>')
+
+
+def strip_in_chunks(text, size):
+    stripper = TagStripper()
+    stripped = ''.join(
+        stripper.feed(text[i:i + size]) for i in range(0, len(text), size)
+    )
+    return stripped + stripper.close(), stripper.html
+
+
+def best_time(func, arg):
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+class TagStripperTests(unittest.TestCase):
+    def test_strip_tags(self):
+        self.assertEqual(
+            strip_tags('<tr><td>GSI-LCG2</td><td>OK</td></tr>'),
+            ('||GSI-LCG2||OK||', True)
+        )
+
+    def test_strip_tags_plain_text(self):
+        self.assertEqual(
+            strip_tags('OK: item1\nWARNING: item2'),
+            ('OK: item1\nWARNING: item2', False)
+        )
+
+    def test_strip_tags_edge_cases(self):
+        for text in [
+            '', '<', '>', '<>', '<<>', '<><b>', 'a<b<c>d', 'a < b and c > d',
+            'x <', 'x <a', '<a><', '<>>', 'a<>b<', '<<<<', '>>>>', '<a>>b'
+        ]:
+            stripped, n = html_tag.subn('|', text)
+            self.assertEqual(strip_tags(text), (stripped, bool(n)), text)
+
+    def test_strip_tags_same_as_regex(self):
+        rand = random.Random(4726)
+        for _ in range(500):
+            text = ''.join(
+                rand.choice('<>ab \n') for _ in range(rand.randint(0, 40))
+            )
+            stripped, n = html_tag.subn('|', text)
+            self.assertEqual(strip_tags(text), (stripped, bool(n)), text)
+            for size in (1, 2, 3, 7):
+                self.assertEqual(
+                    strip_in_chunks(text, size), (stripped, bool(n)), text
+                )
+
+    def test_strip_tags_linear_time(self):
+        for pattern in ['<', '<a', 'a<b ', '<>', '<a>']:
+            small = best_time(strip_tags, pattern * 50000)
+            large = best_time(strip_tags, pattern * 400000)
+            self.assertLess(large, max(small, 1e-3) * 24, pattern)
+
+    def test_strip_tags_linear_time_in_chunks(self):
+        text = '<' * 400000
+        small = best_time(lambda t: strip_in_chunks(t, 1024), text[:50000])
+        large = best_time(lambda t: strip_in_chunks(t, 1024), text)
+        self.assertLess(large, max(small, 1e-3) * 24)
+
+    def test_strip_tags_as_fast_as_regex(self):
+        text = '<tr><td class="site">GSI-LCG2</td><td>OK</td></tr>\n' * 20000
+        regex = best_time(lambda t: html_tag.sub('|', t), text)
+        self.assertLess(best_time(strip_tags, text), max(regex, 1e-3) * 4)